@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import replace
+
+from benchmarks.runner import SCALES, build_report, compare_reports, run_scale
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Run branchctx scale benchmarks")
+    parser.add_argument("--scale", action="append", choices=sorted(SCALES), help="scale preset (repeatable)")
+    parser.add_argument("--branches", type=int, help="override branch count")
+    parser.add_argument("--changed-files", type=int, help="override changed file count on the hot branch")
+    parser.add_argument("--depth", type=int, help="override commit depth of the hot branch")
+    parser.add_argument("--rename-rate", type=float, help="override fraction of changed files that are renames")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per operation")
+    parser.add_argument("--workdir", help="directory for generated repositories")
+    parser.add_argument("--output", help="write JSON report to this file")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    return parser.parse_args(argv)
+
+
+def _overrides(args: argparse.Namespace) -> dict:
+    fields = {
+        "branches": args.branches,
+        "changed_files": args.changed_files,
+        "depth": args.depth,
+        "rename_rate": args.rename_rate,
+    }
+    return {key: value for key, value in fields.items() if value is not None}
+
+
+def _print_scale(scale: dict):
+    spec = scale["spec"]
+    print(
+        f"{scale['name']}: {spec['branches']} branches, {spec['changed_files']} changed files "
+        f"(setup {scale['setup_seconds']:.2f}s)"
+    )
+    for operation, summary in scale["operations"].items():
+        print(f"  {operation:<16} median {summary['median'] * 1000:9.1f} ms  min {summary['min'] * 1000:9.1f} ms")
+
+
+def _print_comparison(rows: list[dict]):
+    print("comparison (median):")
+    for row in rows:
+        ratio = f"{row['ratio']:.2f}x" if row["ratio"] is not None else "n/a"
+        print(
+            f"  {row['scale']:<8} {row['operation']:<16} "
+            f"{row['baseline'] * 1000:9.1f} ms -> {row['current'] * 1000:9.1f} ms  {ratio}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    overrides = _overrides(args)
+
+    scales = []
+    for name in args.scale or ["small"]:
+        spec = replace(SCALES[name], **overrides)
+        scale = run_scale(name, spec, repeat=args.repeat, workdir=args.workdir)
+        _print_scale(scale)
+        scales.append(scale)
+
+    report = build_report(scales)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report: {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        _print_comparison(compare_reports(baseline, report))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
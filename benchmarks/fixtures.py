@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import random
+import subprocess
+from dataclasses import dataclass
+from typing import BinaryIO
+
+BASE_BRANCH = "main"
+HOT_BRANCH = "feature/bench-hot"
+BRANCH_PREFIX = "feature/bench-"
+AUTHOR = b"Bench User <bench@example.com>"
+START_TIME = 1_700_000_000
+
+
+@dataclass
+class RepoSpec:
+    branches: int = 10
+    changed_files: int = 10
+    depth: int = 5
+    rename_rate: float = 0.1
+    base_files: int = 0
+    seed: int = 0
+
+    def total_base_files(self) -> int:
+        return max(self.base_files, self.changed_files + 10)
+
+
+def branch_name(index: int) -> str:
+    return f"{BRANCH_PREFIX}{index:05d}"
+
+
+def base_file_path(index: int) -> str:
+    return f"src/mod{index // 500:03d}/file{index:06d}.txt"
+
+
+def renamed_file_path(index: int) -> str:
+    return f"src/renamed/file{index:06d}.txt"
+
+
+def _file_content(index: int, revision: int) -> bytes:
+    lines = [f"file {index} line {n}" for n in range(8)]
+    if revision:
+        lines.append(f"revision {revision}")
+    return ("\n".join(lines) + "\n").encode()
+
+
+class _Stream:
+    def __init__(self, out: BinaryIO):
+        self.out = out
+        self.mark = 0
+        self.time = START_TIME
+
+    def next_mark(self) -> int:
+        self.mark += 1
+        return self.mark
+
+    def write(self, data: bytes):
+        self.out.write(data)
+
+    def data(self, payload: bytes):
+        self.write(b"data %d\n" % len(payload) + payload + b"\n")
+
+    def commit(self, ref: str, message: str, parent: int | None, changes: list[bytes]) -> int:
+        mark = self.next_mark()
+        self.time += 60
+        self.write(b"commit refs/heads/%s\nmark :%d\n" % (ref.encode(), mark))
+        self.write(b"committer %s %d +0000\n" % (AUTHOR, self.time))
+        self.data(message.encode())
+        if parent is not None:
+            self.write(b"from :%d\n" % parent)
+        for change in changes:
+            self.write(change)
+        self.write(b"\n")
+        return mark
+
+    def inline(self, path: str, content: bytes) -> bytes:
+        return b"M 100644 inline %s\ndata %d\n%s\n" % (path.encode(), len(content), content)
+
+
+def _chunks(items: list, count: int) -> list[list]:
+    count = max(1, min(count, len(items))) if items else 1
+    size, extra = divmod(len(items), count)
+    chunks = []
+    start = 0
+    for n in range(count):
+        end = start + size + (1 if n < extra else 0)
+        chunks.append(items[start:end])
+        start = end
+    return chunks
+
+
+def write_fast_import_stream(out: BinaryIO, spec: RepoSpec):
+    rng = random.Random(spec.seed)
+    stream = _Stream(out)
+
+    base_changes = [stream.inline(base_file_path(n), _file_content(n, 0)) for n in range(spec.total_base_files())]
+    base = stream.commit(BASE_BRANCH, "chore: seed benchmark repository", None, base_changes)
+
+    changed = rng.sample(range(spec.total_base_files()), spec.changed_files)
+    renames = set(rng.sample(changed, int(len(changed) * spec.rename_rate)))
+
+    parent = base
+    for depth, chunk in enumerate(_chunks(changed, spec.depth), start=1):
+        changes = []
+        for index in chunk:
+            if index in renames:
+                changes.append(b"R %s %s\n" % (base_file_path(index).encode(), renamed_file_path(index).encode()))
+            else:
+                changes.append(stream.inline(base_file_path(index), _file_content(index, depth)))
+        parent = stream.commit(HOT_BRANCH, f"feat: hot branch step {depth}", parent, changes)
+
+    for n in range(spec.branches - 1):
+        index = rng.randrange(spec.total_base_files())
+        change = stream.inline(base_file_path(index), _file_content(index, n + 1))
+        stream.commit(branch_name(n), f"feat: branch {n}", base, [change])
+
+    stream.write(b"done\n")
+
+
+def generate_repo(path: str, spec: RepoSpec):
+    subprocess.run(["git", "init", "-q", "-b", BASE_BRANCH, path], check=True)
+    for key, value in (("user.name", "Bench User"), ("user.email", "bench@example.com")):
+        subprocess.run(["git", "config", key, value], cwd=path, check=True)
+
+    proc = subprocess.Popen(
+        ["git", "fast-import", "--quiet", "--done"],
+        cwd=path,
+        stdin=subprocess.PIPE,
+    )
+    assert proc.stdin is not None
+    write_fast_import_stream(proc.stdin, spec)
+    proc.stdin.close()
+    if proc.wait() != 0:
+        raise RuntimeError("git fast-import failed")
+
+    subprocess.run(["git", "pack-refs", "--all"], cwd=path, check=True)
+    subprocess.run(["git", "checkout", "-q", "-f", BASE_BRANCH], cwd=path, check=True)
+
+
+def fixture_branches(spec: RepoSpec) -> list[str]:
+    return [HOT_BRANCH] + [branch_name(n) for n in range(spec.branches - 1)]
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime, timezone
+
+from benchmarks.fixtures import BASE_BRANCH, HOT_BRANCH, RepoSpec, branch_name, fixture_branches, generate_repo
+from branchctx import __version__
+from branchctx.constants import CONFIG_DIR, CONFIG_FILE
+from branchctx.core.sync import create_branch_context
+
+REPORT_SCHEMA = 1
+PRUNE_FRACTION = 0.1
+
+SCALES: dict[str, RepoSpec] = {
+    "small": RepoSpec(branches=10, changed_files=10, depth=5),
+    "medium": RepoSpec(branches=1_000, changed_files=1_000, depth=20),
+    "large": RepoSpec(branches=10_000, changed_files=50_000, depth=50),
+}
+
+OPERATIONS = ("on-checkout", "on-commit", "sync", "status", "branches list", "branches prune")
+
+
+def _git(repo: str, *args: str):
+    subprocess.run(["git", "-c", f"core.hooksPath={os.devnull}", *args], cwd=repo, check=True, capture_output=True)
+
+
+def _bctx(repo: str, *args: str) -> float:
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-m", "branchctx.cli", *args], cwd=repo, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"bctx {' '.join(args)} failed: {result.stdout}{result.stderr}")
+    return elapsed
+
+
+def _summary(runs: list[float]) -> dict:
+    return {
+        "runs": runs,
+        "min": min(runs),
+        "median": statistics.median(runs),
+        "mean": statistics.fmean(runs),
+    }
+
+
+def setup_workspace(repo: str, spec: RepoSpec):
+    generate_repo(repo, spec)
+    _bctx(repo, "init")
+    config_path = os.path.join(repo, CONFIG_DIR, CONFIG_FILE)
+    with open(config_path) as f:
+        config = json.load(f)
+    config["default_base_branch"] = BASE_BRANCH
+    with open(config_path, "w") as f:
+        json.dump(config, f, indent=2)
+    _git(repo, "add", ".gitignore")
+    _git(repo, "commit", "-q", "-m", "chore: ignore branch contexts")
+    for branch in fixture_branches(spec):
+        create_branch_context(repo, branch)
+    _git(repo, "checkout", "-q", HOT_BRANCH)
+
+
+def _commit_change(repo: str, n: int):
+    path = os.path.join(repo, "bench", f"commit{n:04d}.txt")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(f"bench commit {n}\n")
+    _git(repo, "add", path)
+    _git(repo, "commit", "-q", "-m", f"feat: bench commit {n}")
+
+
+def _delete_branches(repo: str, branches: list[str]):
+    commands = "".join(f"delete refs/heads/{branch}\n" for branch in branches)
+    subprocess.run(["git", "update-ref", "--stdin"], cwd=repo, input=commands, text=True, check=True)
+
+
+def run_operations(repo: str, spec: RepoSpec, repeat: int) -> dict:
+    results: dict[str, list[float]] = {name: [] for name in OPERATIONS}
+
+    for _ in range(repeat):
+        results["on-checkout"].append(_bctx(repo, "on-checkout", BASE_BRANCH, HOT_BRANCH))
+
+    for n in range(repeat):
+        _commit_change(repo, n)
+        results["on-commit"].append(_bctx(repo, "on-commit"))
+
+    for _ in range(repeat):
+        results["sync"].append(_bctx(repo, "sync"))
+        results["status"].append(_bctx(repo, "status"))
+        results["branches list"].append(_bctx(repo, "branches", "list"))
+
+    orphans = [branch_name(n) for n in range(spec.branches - 1)]
+    per_run = max(1, int(len(orphans) * PRUNE_FRACTION) // repeat)
+    for n in range(repeat):
+        batch = orphans[n * per_run : (n + 1) * per_run]
+        if batch:
+            _delete_branches(repo, batch)
+        results["branches prune"].append(_bctx(repo, "branches", "prune"))
+
+    return {name: _summary(runs) for name, runs in results.items()}
+
+
+def run_scale(name: str, spec: RepoSpec, repeat: int = 3, workdir: str | None = None) -> dict:
+    with tempfile.TemporaryDirectory(dir=workdir) as tmpdir:
+        repo = os.path.join(tmpdir, "repo")
+        start = time.perf_counter()
+        setup_workspace(repo, spec)
+        setup_seconds = time.perf_counter() - start
+        operations = run_operations(repo, spec, repeat)
+
+    return {
+        "name": name,
+        "spec": asdict(spec),
+        "repeat": repeat,
+        "setup_seconds": setup_seconds,
+        "operations": operations,
+    }
+
+
+def _git_version() -> str:
+    result = subprocess.run(["git", "--version"], capture_output=True, text=True)
+    return result.stdout.strip()
+
+
+def build_report(scales: list[dict]) -> dict:
+    return {
+        "schema": REPORT_SCHEMA,
+        "version": __version__,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": sys.platform,
+        "git": _git_version(),
+        "scales": scales,
+    }
+
+
+def compare_reports(baseline: dict, current: dict) -> list[dict]:
+    rows = []
+    previous = {scale["name"]: scale["operations"] for scale in baseline.get("scales", [])}
+    for scale in current.get("scales", []):
+        old_operations = previous.get(scale["name"], {})
+        for operation, summary in scale["operations"].items():
+            old = old_operations.get(operation)
+            if not old:
+                continue
+            rows.append(
+                {
+                    "scale": scale["name"],
+                    "operation": operation,
+                    "baseline": old["median"],
+                    "current": summary["median"],
+                    "ratio": summary["median"] / old["median"] if old["median"] else None,
+                }
+            )
+    return rows
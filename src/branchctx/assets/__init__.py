@@ -28,6 +28,14 @@ def get_post_commit_hook_template() -> str:
     return get_init_asset("hook_post_commit.sh")
 
 
+def get_post_rewrite_hook_template() -> str:
+    return get_init_asset("hook_post_rewrite.sh")
+
+
+def get_daemon_client_template() -> str:
+    return get_init_asset("hook_daemon_client.sh")
+
+
 def get_init_templates_dir() -> Path:
     return INIT_DIR / "templates"
 
@@ -0,0 +1,19 @@
+bctx_hook() {{
+    local bctx="$1" hook="$2" socket="$PWD/{socket}" response="" code
+    shift 2
+    if [ -S "$socket" ]; then
+        if command -v socat >/dev/null 2>&1; then
+            response=$({{ printf '%s\t' "$hook" "$PWD" "$@"; printf '\n'; }} | socat -t {timeout} - "UNIX-CONNECT:$socket" 2>/dev/null)
+        elif command -v nc >/dev/null 2>&1; then
+            response=$({{ printf '%s\t' "$hook" "$PWD" "$@"; printf '\n'; }} | nc -U "$socket" 2>/dev/null)
+        fi
+        code=${{response%%$'\n'*}}
+        if [ -n "$code" ] && [ -z "${{code//[0-9]/}}" ]; then
+            if [ "$code" != "$response" ]; then
+                printf '%s\n' "${{response#*$'\n'}}"
+            fi
+            return "$code"
+        fi
+    fi
+    "$bctx" "$hook" "$@"
+}}
@@ -1,6 +1,8 @@
 #!/bin/bash
 {marker}
 
+{client}
+
 PREV_HEAD="$1"
 NEW_HEAD="$2"
 CHECKOUT_TYPE="$3"
@@ -1,4 +1,6 @@
 #!/bin/bash
 {marker}
 
+{client}
+
 {callback}
@@ -0,0 +1,6 @@
+#!/bin/bash
+{marker}
+
+{client}
+
+{callback} "$1"
@@ -1,8 +1,8 @@
 import sys
-from importlib.metadata import version as pkg_version
 
+from branchctx import __version__
 from branchctx.cmd_registry import COMMANDS, get_all_command_names, get_command_handler
-from branchctx.constants import CLI_NAME, DIST_NAME
+from branchctx.constants import CLI_NAME, DAEMON_COMMANDS
 
 
 def print_help():
@@ -31,6 +31,7 @@ Examples:
   {CLI_NAME} template                         # select template interactively
   {CLI_NAME} template feature                 # apply feature template
   {CLI_NAME} completion zsh                   # generate zsh completion
+  {CLI_NAME} daemon start                     # keep hook handler warm in background
 
 Exit codes:
   0 - success
@@ -45,12 +46,19 @@ def main():
         sys.exit(0)
 
     if "--version" in args or "-v" in args:
-        print(pkg_version(DIST_NAME))
+        print(__version__)
         sys.exit(0)
 
     cmd = args[0]
     cmd_args = args[1:]
 
+    if cmd in DAEMON_COMMANDS:
+        from branchctx.core.daemon import forward_hook_event
+
+        forwarded = forward_hook_event(cmd, cmd_args)
+        if forwarded is not None:
+            sys.exit(forwarded)
+
     if cmd in get_all_command_names():
         handler = get_command_handler(cmd)
         sys.exit(handler(cmd_args))
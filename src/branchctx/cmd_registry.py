@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from importlib import import_module
 from typing import Callable, TypedDict
 
 
@@ -16,44 +17,37 @@ COMMANDS: dict[str, CommandInfo] = {
     "status": {"desc": "Show status and health", "args": ""},
     "template": {"desc": "Apply template to current branch", "args": "[name]"},
     "completion": {"desc": "Generate shell completion", "args": "<shell>"},
+    "daemon": {"desc": "Manage background hook daemon", "args": "<start|stop|status>"},
 }
 
-INTERNAL_COMMANDS: set[str] = {"on-checkout", "on-commit"}
+INTERNAL_COMMANDS: set[str] = {"on-checkout", "on-commit", "on-rewrite", "refresh"}
 
 _ALL_COMMANDS: set[str] = set(COMMANDS.keys()) | INTERNAL_COMMANDS
 
+HANDLERS: dict[str, tuple[str, str]] = {
+    "init": ("branchctx.commands.init", "cmd_init"),
+    "uninstall": ("branchctx.commands.uninstall", "cmd_uninstall"),
+    "sync": ("branchctx.commands.sync", "cmd_sync"),
+    "branches": ("branchctx.commands.branches", "cmd_branches"),
+    "status": ("branchctx.commands.status", "cmd_status"),
+    "on-checkout": ("branchctx.commands.on_checkout", "cmd_on_checkout"),
+    "on-commit": ("branchctx.commands.on_commit", "cmd_on_commit"),
+    "on-rewrite": ("branchctx.commands.on_rewrite", "cmd_on_rewrite"),
+    "refresh": ("branchctx.commands.refresh", "cmd_refresh"),
+    "template": ("branchctx.commands.template", "cmd_template"),
+    "completion": ("branchctx.commands.completion", "cmd_completion"),
+    "daemon": ("branchctx.commands.daemon", "cmd_daemon"),
+}
+
 
 def get_command_handler(name: str) -> Callable[[list[str]], int]:
-    from branchctx.commands import (
-        cmd_branches,
-        cmd_completion,
-        cmd_init,
-        cmd_on_checkout,
-        cmd_on_commit,
-        cmd_status,
-        cmd_sync,
-        cmd_template,
-        cmd_uninstall,
-    )
-
-    handlers: dict[str, Callable[[list[str]], int]] = {
-        "init": cmd_init,
-        "uninstall": cmd_uninstall,
-        "sync": cmd_sync,
-        "branches": cmd_branches,
-        "status": cmd_status,
-        "on-checkout": cmd_on_checkout,
-        "on-commit": cmd_on_commit,
-        "template": cmd_template,
-        "completion": cmd_completion,
-    }
-
-    assert set(handlers.keys()) == _ALL_COMMANDS, "COMMANDS and handlers are out of sync"
-
-    if name not in handlers:
+    assert set(HANDLERS.keys()) == _ALL_COMMANDS, "COMMANDS and handlers are out of sync"
+
+    if name not in HANDLERS:
         raise ValueError(f"Unknown command: {name}")
 
-    return handlers[name]
+    module_name, attr = HANDLERS[name]
+    return getattr(import_module(module_name), attr)
 
 
 def get_all_command_names() -> set[str]:
@@ -1,12 +1,11 @@
-from branchctx.commands.branches import cmd_branches
-from branchctx.commands.completion import cmd_completion
-from branchctx.commands.init import cmd_init
-from branchctx.commands.on_checkout import cmd_on_checkout
-from branchctx.commands.on_commit import cmd_on_commit
-from branchctx.commands.status import cmd_status
-from branchctx.commands.sync import cmd_sync
-from branchctx.commands.template import cmd_template
-from branchctx.commands.uninstall import cmd_uninstall
+from __future__ import annotations
+
+from importlib import import_module
+from typing import Any
+
+from branchctx.cmd_registry import HANDLERS
+
+_EXPORTS = {attr: module_name for module_name, attr in HANDLERS.values()}
 
 __all__ = [
     "cmd_init",
@@ -16,6 +15,15 @@ __all__ = [
     "cmd_status",
     "cmd_on_checkout",
     "cmd_on_commit",
+    "cmd_on_rewrite",
+    "cmd_refresh",
     "cmd_template",
     "cmd_completion",
+    "cmd_daemon",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_EXPORTS[name]), name)
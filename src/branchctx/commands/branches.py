@@ -4,14 +4,16 @@ import os
 
 from branchctx.constants import CLI_NAME
 from branchctx.core.hooks import get_current_branch, get_git_root
+from branchctx.core.overlap import get_branch_overlaps
 from branchctx.core.sync import (
-    archive_branch,
+    archive_branches,
     get_branch_dir,
     list_archived_branches,
     list_branches,
     sanitize_branch_name,
 )
 from branchctx.data.config import config_exists
+from branchctx.data.meta import find_branches_touching, select_branch_keys
 from branchctx.utils.git import git_list_branches
 
 
@@ -19,8 +21,14 @@ def _print_help():
     print("""usage: bctx branches <command>
 
 Commands:
-  list    List all branch contexts
-  prune   Archive orphan contexts""")
+  list                      List all branch contexts
+  prune                     Archive orphan contexts
+  touching <path|glob>      List contexts whose branch changes a path
+  overlap [--limit <n>]     Rank context pairs by shared changed files
+
+List options:
+  --recent         Sort by last meta update, newest first
+  --author <name>  Only contexts created by author""")
 
 
 def cmd_branches(args: list[str]) -> int:
@@ -44,16 +52,55 @@ def cmd_branches(args: list[str]) -> int:
         return 1
 
     if subcommand == "list":
-        return _cmd_list(git_root)
+        return _cmd_list(git_root, args[1:])
     elif subcommand == "prune":
         return _cmd_prune(git_root)
+    elif subcommand == "touching":
+        return _cmd_touching(git_root, args[1:])
+    elif subcommand == "overlap":
+        return _cmd_overlap(git_root, args[1:])
     else:
         print(f"error: unknown subcommand '{subcommand}'")
         _print_help()
         return 1
 
 
-def _cmd_list(git_root: str) -> int:
+def _parse_list_args(args: list[str]) -> tuple[str | None, bool] | None:
+    author = None
+    newest_first = False
+    i = 0
+    while i < len(args):
+        if args[i] == "--recent":
+            newest_first = True
+        elif args[i] == "--author" and i + 1 < len(args):
+            author = args[i + 1]
+            i += 1
+        else:
+            return None
+        i += 1
+    return author, newest_first
+
+
+def _select_branches(git_root: str, branches: list[str], author: str | None, newest_first: bool) -> list[str]:
+    if author is None and not newest_first:
+        return sorted(branches)
+
+    existing = set(branches)
+    selected = [key for key in select_branch_keys(git_root, author, newest_first) if key in existing]
+    if author is None:
+        seen = set(selected)
+        selected += sorted(b for b in branches if b not in seen)
+    return selected
+
+
+def _cmd_list(git_root: str, args: list[str]) -> int:
+    parsed = _parse_list_args(args)
+    if parsed is None:
+        print(f"error: invalid list options '{' '.join(args)}'")
+        _print_help()
+        return 1
+    author, newest_first = parsed
+
     branches = list_branches(git_root)
     current = get_current_branch(git_root)
 
@@ -61,8 +108,13 @@ def _cmd_list(git_root: str) -> int:
         print("No branch contexts yet")
         return 0
 
-    print(f"Branch contexts ({len(branches)}):\n")
-    for b in sorted(branches):
+    selected = _select_branches(git_root, branches, author, newest_first)
+    if not selected:
+        print(f"No branch contexts by {author}")
+        return 0
+
+    print(f"Branch contexts ({len(selected)}):\n")
+    for b in selected:
         branch_dir = get_branch_dir(git_root, b)
         files = os.listdir(branch_dir) if os.path.exists(branch_dir) else []
         files = [f for f in files if not f.startswith(".")]
@@ -88,9 +140,52 @@ def _cmd_prune(git_root: str) -> int:
         return 0
 
     print(f"Archiving {len(orphans)} orphan contexts:\n")
-    for orphan in sorted(orphans):
-        if archive_branch(git_root, orphan):
-            print(f"  {orphan}")
+    for orphan in archive_branches(git_root, sorted(orphans)):
+        print(f"  {orphan}")
 
     print(f"\nDone. Use '{CLI_NAME} branches list' to see current contexts.")
     return 0
+
+
+def _cmd_touching(git_root: str, args: list[str]) -> int:
+    if len(args) != 1:
+        print(f"usage: {CLI_NAME} branches touching <path|glob>")
+        return 1
+    pattern = args[0]
+
+    matches = find_branches_touching(git_root, pattern)
+    if not matches:
+        print(f"No branch contexts touch '{pattern}'")
+        return 0
+
+    width = max(len(key) for key, _, _, _ in matches)
+    print(f"Branch contexts touching '{pattern}' ({len({key for key, _, _, _ in matches})}):\n")
+    for key, path, added, removed in matches:
+        print(f"  {key.ljust(width)}  {path}  (+{added} -{removed})")
+    return 0
+
+
+def _cmd_overlap(git_root: str, args: list[str]) -> int:
+    limit = None
+    if args:
+        if len(args) != 2 or args[0] != "--limit" or not args[1].isdigit():
+            print(f"usage: {CLI_NAME} branches overlap [--limit <n>]")
+            return 1
+        limit = int(args[1])
+
+    overlaps = get_branch_overlaps(git_root)
+    if not overlaps:
+        print("No overlapping branch contexts")
+        return 0
+
+    shown = overlaps[:limit] if limit is not None else overlaps
+    first_width = max((len(overlap.first) for overlap in shown), default=0)
+    second_width = max((len(overlap.second) for overlap in shown), default=0)
+    print(f"Overlapping branch contexts ({len(overlaps)} pairs):\n")
+    for overlap in shown:
+        files = "file" if overlap.shared == 1 else "files"
+        print(
+            f"  {overlap.first.ljust(first_width)}  {overlap.second.ljust(second_width)}  "
+            f"{overlap.shared} {files}  ({overlap.weight} lines)"
+        )
+    return 0
@@ -42,7 +42,12 @@ _{CLI_NAME}() {{
             ;;
         branches)
             if (( CURRENT == 3 )); then
-                _values 'subcommand' 'list' 'prune'
+                _values 'subcommand' 'list' 'prune' 'touching' 'overlap'
+            fi
+            ;;
+        daemon)
+            if (( CURRENT == 3 )); then
+                _values 'subcommand' 'start' 'stop' 'status'
             fi
             ;;
         *)
@@ -86,7 +91,11 @@ def _get_bash_completion() -> str:
             return 0
             ;;
         branches)
-            COMPREPLY=( $(compgen -W "list prune" -- "$cur") )
+            COMPREPLY=( $(compgen -W "list prune touching overlap" -- "$cur") )
+            return 0
+            ;;
+        daemon)
+            COMPREPLY=( $(compgen -W "start stop status" -- "$cur") )
             return 0
             ;;
         {case_aliases})
@@ -116,7 +125,11 @@ def _get_fish_completion() -> str:
         f'complete -c {a} -n "__fish_seen_subcommand_from template" -a "(__branchctx_templates)"' for a in CLI_ALIASES
     )
     branches_lines = "\n".join(
-        f'complete -c {a} -n "__fish_seen_subcommand_from branches" -a "list prune"' for a in CLI_ALIASES
+        f'complete -c {a} -n "__fish_seen_subcommand_from branches" -a "list prune touching overlap"'
+        for a in CLI_ALIASES
+    )
+    daemon_lines = "\n".join(
+        f'complete -c {a} -n "__fish_seen_subcommand_from daemon" -a "start stop status"' for a in CLI_ALIASES
     )
 
     return f"""{init_lines}
@@ -127,6 +140,8 @@ def _get_fish_completion() -> str:
 
 {branches_lines}
 
+{daemon_lines}
+
 function __branchctx_templates
     set -l git_root (git rev-parse --show-toplevel 2>/dev/null)
     if test -n "$git_root"
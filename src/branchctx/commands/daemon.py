@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from branchctx.constants import CLI_NAME
+from branchctx.core.daemon import DaemonServer, is_daemon_running, is_daemon_supported, start_daemon, stop_daemon
+from branchctx.core.hooks import get_git_root
+from branchctx.data.config import config_exists
+
+
+def _print_help():
+    print("""usage: bctx daemon <command>
+
+Commands:
+  start   Start background daemon for this repo
+  stop    Stop running daemon
+  status  Show whether daemon is running
+  run     Run daemon in foreground""")
+
+
+def cmd_daemon(args: list[str]) -> int:
+    if not args:
+        _print_help()
+        return 1
+
+    subcommand = args[0]
+
+    if subcommand in ("-h", "--help"):
+        _print_help()
+        return 0
+
+    if not is_daemon_supported():
+        print("error: daemon requires unix domain sockets")
+        return 1
+
+    git_root = get_git_root()
+    if not git_root:
+        print("error: not a git repository")
+        return 1
+
+    if not config_exists(git_root):
+        print(f"error: not initialized. Run '{CLI_NAME} init' first")
+        return 1
+
+    if subcommand == "start":
+        return _cmd_start(git_root)
+    elif subcommand == "stop":
+        return _cmd_stop(git_root)
+    elif subcommand == "status":
+        return _cmd_status(git_root)
+    elif subcommand == "run":
+        DaemonServer(git_root).serve()
+        return 0
+    else:
+        print(f"error: unknown subcommand '{subcommand}'")
+        _print_help()
+        return 1
+
+
+def _cmd_start(git_root: str) -> int:
+    if is_daemon_running(git_root):
+        print("Daemon already running")
+        return 0
+
+    if not start_daemon(git_root):
+        print("error: daemon did not start")
+        return 1
+
+    print("Daemon started")
+    return 0
+
+
+def _cmd_stop(git_root: str) -> int:
+    if not stop_daemon(git_root):
+        print("Daemon not running")
+        return 0
+
+    print("Daemon stopped")
+    return 0
+
+
+def _cmd_status(git_root: str) -> int:
+    if is_daemon_running(git_root):
+        print("Daemon: running")
+    else:
+        print("Daemon: not running")
+    return 0
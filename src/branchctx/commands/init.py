@@ -4,7 +4,14 @@ import os
 from pathlib import Path
 
 from branchctx.assets import copy_init_templates
-from branchctx.constants import CLI_NAME, CONFIG_FILE, DEFAULT_SYMLINK, HOOK_POST_CHECKOUT, HOOK_POST_COMMIT
+from branchctx.constants import (
+    CLI_NAME,
+    CONFIG_FILE,
+    DEFAULT_SYMLINK,
+    HOOK_POST_CHECKOUT,
+    HOOK_POST_COMMIT,
+    HOOK_POST_REWRITE,
+)
 from branchctx.core.hooks import get_current_branch, get_git_root, install_hook
 from branchctx.core.sync import sync_branch
 from branchctx.data.config import (
@@ -61,6 +68,14 @@ def cmd_init(_args: list[str]) -> int:
     elif commit_result == "hook_exists":
         print(f"warning: {HOOK_POST_COMMIT} hook exists but not managed by {CLI_NAME}")
 
+    rewrite_result = install_hook(git_root, HOOK_POST_REWRITE)
+    if rewrite_result == "installed":
+        print(f"Hook installed: {HOOK_POST_REWRITE}")
+    elif rewrite_result == "appended":
+        print(f"Hook appended: {HOOK_POST_REWRITE}")
+    elif rewrite_result == "hook_exists":
+        print(f"warning: {HOOK_POST_REWRITE} hook exists but not managed by {CLI_NAME}")
+
     _add_to_gitignore(git_root, DEFAULT_SYMLINK)
     _add_to_gitignore(git_root, ".bctx/branches/")
 
@@ -3,9 +3,11 @@ from __future__ import annotations
 from branchctx.constants import CLI_NAME
 from branchctx.core.context_tags import update_context_tags
 from branchctx.core.hooks import get_git_root
+from branchctx.core.refresh import consume_dirty, defer_during_sequencer, schedule_refresh
 from branchctx.core.sync import sanitize_branch_name, sync_branch
+from branchctx.core.tag_providers import needs_changed_files
 from branchctx.data.branch_base import get_base_branch
-from branchctx.data.config import config_exists
+from branchctx.data.config import Config, config_exists
 from branchctx.data.meta import update_branch_meta
 
 
@@ -25,15 +27,19 @@ def cmd_on_checkout(args: list[str]) -> int:
         print(f"Branch: {old_branch} -> {new_branch}")
         return 0
 
+    if defer_during_sequencer(git_root):
+        return 0
+    consume_dirty(git_root)
+
     result = sync_branch(git_root, new_branch)
 
     branch_key = sanitize_branch_name(new_branch)
     context_dir = result["branch_dir"]
     base_branch = get_base_branch(git_root, context_dir)
 
-    update_branch_meta(git_root, branch_key, base_branch)
-
-    update_context_tags(git_root, context_dir, branch_key, base_branch)
+    if not (Config.load(git_root).background_refresh and schedule_refresh(git_root)):
+        update_branch_meta(git_root, branch_key, base_branch, needs_changed_files(git_root, branch_key))
+        update_context_tags(git_root, context_dir, branch_key, base_branch)
 
     status = "new" if result["create_result"] != "exists" else "synced"
     print(f"Branch: {old_branch} -> {new_branch} ({status})")
@@ -5,10 +5,12 @@ import os
 from branchctx.constants import DEFAULT_SYMLINK
 from branchctx.core.context_tags import update_context_tags
 from branchctx.core.hooks import get_current_branch, get_git_root
+from branchctx.core.refresh import consume_dirty, defer_during_sequencer, schedule_refresh
 from branchctx.core.sync import sanitize_branch_name
+from branchctx.core.tag_providers import needs_changed_files
 from branchctx.data.branch_base import get_base_branch
-from branchctx.data.config import config_exists
-from branchctx.data.meta import update_branch_meta
+from branchctx.data.config import Config, config_exists
+from branchctx.data.meta import advance_branch_meta
 
 
 def cmd_on_commit(_args: list[str]) -> int:
@@ -19,6 +21,10 @@ def cmd_on_commit(_args: list[str]) -> int:
     if not config_exists(git_root):
         return 0
 
+    if defer_during_sequencer(git_root):
+        return 0
+    consume_dirty(git_root)
+
     branch = get_current_branch(git_root)
     if not branch:
         return 0
@@ -28,8 +34,11 @@ def cmd_on_commit(_args: list[str]) -> int:
     if not os.path.exists(context_dir):
         return 0
 
+    if Config.load(git_root).background_refresh and schedule_refresh(git_root):
+        return 0
+
     base_branch = get_base_branch(git_root, context_dir)
-    update_branch_meta(git_root, branch_key, base_branch)
+    advance_branch_meta(git_root, branch_key, base_branch, needs_changed_files(git_root, branch_key))
 
     updates = update_context_tags(
         workspace=git_root,
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import os
+
+from branchctx.core.hooks import get_current_branch, get_git_root
+from branchctx.core.refresh import consume_dirty, refresh_current_branch, schedule_refresh
+from branchctx.core.sync import update_symlink
+from branchctx.data.config import Config, config_exists
+
+
+def cmd_on_rewrite(args: list[str]) -> int:
+    git_root = get_git_root()
+    if not git_root:
+        return 1
+
+    if not config_exists(git_root):
+        return 0
+
+    rewrite_type = args[0] if args else "amend"
+    if not consume_dirty(git_root) and rewrite_type != "rebase":
+        return 0
+
+    branch = get_current_branch(git_root)
+    if not branch:
+        return 0
+
+    update_symlink(git_root, branch)
+
+    if Config.load(git_root).background_refresh and schedule_refresh(git_root):
+        return 0
+
+    updates = refresh_current_branch(git_root)
+    if updates:
+        print(f"Updated {len(updates)} tag(s) in context files:")
+        for update in updates:
+            rel_path = os.path.relpath(update.file, git_root)
+            print(f"  {rel_path}: <{update.tag}>")
+
+    return 0
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from branchctx.core.hooks import get_git_root
+from branchctx.core.refresh import run_refresh_worker
+from branchctx.data.config import config_exists
+
+
+def cmd_refresh(_args: list[str]) -> int:
+    git_root = get_git_root()
+    if not git_root:
+        return 1
+
+    if not config_exists(git_root):
+        return 0
+
+    run_refresh_worker(git_root)
+    return 0
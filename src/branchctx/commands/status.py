@@ -2,7 +2,14 @@ from __future__ import annotations
 
 import os
 
-from branchctx.constants import CLI_NAME, DEFAULT_SYMLINK, DEFAULT_TEMPLATE, HOOK_POST_CHECKOUT, HOOK_POST_COMMIT
+from branchctx.constants import (
+    CLI_NAME,
+    DEFAULT_SYMLINK,
+    DEFAULT_TEMPLATE,
+    HOOK_POST_CHECKOUT,
+    HOOK_POST_COMMIT,
+    HOOK_POST_REWRITE,
+)
 from branchctx.core.hooks import get_current_branch, get_git_root, is_hook_installed
 from branchctx.core.sync import get_branch_dir, list_branches, sanitize_branch_name
 from branchctx.data.branch_base import get_base_branch
@@ -44,6 +51,8 @@ def cmd_status(_args: list[str]) -> int:
         hooks.append(HOOK_POST_CHECKOUT)
     if is_hook_installed(git_root, HOOK_POST_COMMIT):
         hooks.append(HOOK_POST_COMMIT)
+    if is_hook_installed(git_root, HOOK_POST_REWRITE):
+        hooks.append(HOOK_POST_REWRITE)
     print(f"Hooks:       {', '.join(hooks) if hooks else 'none'}")
 
     templates = list_templates(git_root)
@@ -76,6 +85,12 @@ def cmd_status(_args: list[str]) -> int:
         issues.append(f"{HOOK_POST_COMMIT} hook not installed")
         print(f"  {STATUS_ERROR} {HOOK_POST_COMMIT} hook not installed")
 
+    if is_hook_installed(git_root, HOOK_POST_REWRITE):
+        print(f"  {STATUS_OK} {HOOK_POST_REWRITE} hook installed")
+    else:
+        warnings.append(f"{HOOK_POST_REWRITE} hook not installed (run '{CLI_NAME} init')")
+        print(f"  {STATUS_WARN} {HOOK_POST_REWRITE} hook not installed")
+
     templates_dir = get_templates_dir(git_root)
     if os.path.exists(templates_dir):
         print(f"  {STATUS_OK} templates/ exists")
@@ -32,7 +32,7 @@ def cmd_sync(_args: list[str]) -> int:
 
     update_branch_meta(git_root, branch_key, base_branch)
 
-    updates = update_context_tags(git_root, context_dir, branch_key, base_branch)
+    updates = update_context_tags(git_root, context_dir, branch_key, base_branch, force=True)
 
     print(f"Branch:  {result['branch']}")
     print(f"Context: {result['branch_dir']}")
@@ -78,7 +78,7 @@ def cmd_template(args: list[str]) -> int:
 
     branch_key = sanitize_branch_name(branch)
     context_dir = get_branch_dir(git_root, branch)
-    update_context_tags(git_root, context_dir, branch_key, get_base_branch(git_root, context_dir))
+    update_context_tags(git_root, context_dir, branch_key, get_base_branch(git_root, context_dir), force=True)
 
     print(f"Applied template '{template}' to '{branch}'")
     return 0
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from branchctx.constants import CLI_NAME, HOOK_POST_CHECKOUT, HOOK_POST_COMMIT
+from branchctx.constants import CLI_NAME, HOOK_POST_CHECKOUT, HOOK_POST_COMMIT, HOOK_POST_REWRITE
 from branchctx.core.hooks import get_git_root, uninstall_hook
 from branchctx.utils.git import git_config_unset
 
@@ -18,6 +18,7 @@ def cmd_uninstall(args: list[str]) -> int:
 
     checkout_result = uninstall_hook(git_root, HOOK_POST_CHECKOUT)
     commit_result = uninstall_hook(git_root, HOOK_POST_COMMIT)
+    rewrite_result = uninstall_hook(git_root, HOOK_POST_REWRITE)
 
     if checkout_result == "uninstalled":
         print(f"Hook removed: {HOOK_POST_CHECKOUT}")
@@ -29,7 +30,12 @@ def cmd_uninstall(args: list[str]) -> int:
     elif commit_result == "not_managed":
         print(f"warning: {HOOK_POST_COMMIT} hook exists but not managed by {CLI_NAME}")
 
-    if checkout_result == "not_installed" and commit_result == "not_installed":
+    if rewrite_result == "uninstalled":
+        print(f"Hook removed: {HOOK_POST_REWRITE}")
+    elif rewrite_result == "not_managed":
+        print(f"warning: {HOOK_POST_REWRITE} hook exists but not managed by {CLI_NAME}")
+
+    if checkout_result == "not_installed" and commit_result == "not_installed" and rewrite_result == "not_installed":
         print("No hooks installed")
 
     return 0
@@ -7,11 +7,22 @@ GIT_DIR = ".git"
 HOOK_MARKER = "# branch-ctx-managed"
 HOOK_POST_CHECKOUT = "post-checkout"
 HOOK_POST_COMMIT = "post-commit"
+HOOK_POST_REWRITE = "post-rewrite"
 DEFAULT_SOUND_FILE = "notification.oga"
 
 CONFIG_DIR = ".bctx"
 CONFIG_FILE = "config.json"
 META_FILE = "meta.json"
+META_SHARDS_DIR = ".meta"
+META_DB_FILE = "meta.db"
+META_INDEX_FILE = "meta.idx"
+META_PATHS_DIR = ".paths"
+META_PATH_BUCKETS_DIR = ".buckets"
+META_PATHS_STALE_FILE = ".stale"
+META_LOCK_FILE = ".meta.lock"
+META_OVERFLOW_DIR = ".overflow"
+META_INLINE_COMMITS = 200
+META_INLINE_FILES = 1000
 TEMPLATES_DIR = "templates"
 BRANCHES_DIR = "branches"
 ARCHIVED_DIR = "_archived"
@@ -23,3 +34,24 @@ BASE_BRANCH_FILE = "base_branch"
 
 TEMPLATE_FILE_EXTENSIONS = (".md", ".txt", ".json", ".yaml", ".yml", ".toml")
 CONTEXT_FILE_EXTENSIONS = (".md", ".txt")
+CONTEXT_MMAP_THRESHOLD = 1024 * 1024
+
+DAEMON_SOCKET_FILE = ".daemon.sock"
+DAEMON_COMMANDS = ("on-checkout", "on-commit", "on-rewrite")
+DAEMON_IDLE_TIMEOUT = 3600
+DAEMON_CLIENT_TIMEOUT = 30
+
+COMMIT_CACHE_FILE = ".commits.jsonl"
+COMMIT_CACHE_MAX_ENTRIES = 5000
+COMMIT_CACHE_MAX_BYTES = 2 * 1024 * 1024
+
+TAG_MANIFEST_DIR = ".tags"
+
+REFRESH_LOCK_FILE = ".refresh.lock"
+REFRESH_PENDING_FILE = ".refresh-pending"
+REFRESH_DIRTY_FILE = ".refresh-dirty"
+
+META_STORAGE_SHARDED = "sharded"
+META_STORAGE_JSON = "json"
+META_STORAGE_SQLITE = "sqlite"
+META_STORAGES = (META_STORAGE_SHARDED, META_STORAGE_JSON, META_STORAGE_SQLITE)
@@ -1,16 +1,35 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import mmap
 import os
 import re
+import shutil
 from dataclasses import dataclass
+from typing import Mapping
 
-from branchctx.constants import CONTEXT_FILE_EXTENSIONS
+from branchctx.constants import CONTEXT_FILE_EXTENSIONS, CONTEXT_MMAP_THRESHOLD
+from branchctx.core.tag_providers import TagContext, TagValues
 from branchctx.data.meta import get_branch_meta
+from branchctx.data.tag_manifest import TagManifest
 
-TAG_COMMITS = "bctx:commits"
-TAG_FILES = "bctx:files"
-TAG_PATTERN = re.compile(r"<(bctx:(?:commits|files))>(.*?)</\1>", re.DOTALL)
+TAG_PATTERN = re.compile(r"<(bctx:[a-z][a-z-]*)>(.*?)</\1>", re.DOTALL)
+TAG_PATTERN_BYTES = re.compile(rb"<(bctx:[a-z][a-z-]*)>(.*?)</\1>", re.DOTALL)
+COPY_CHUNK_SIZE = 1024 * 1024
+CONTEXT_ENCODING = "utf-8"
+CONTEXT_ERRORS = "surrogateescape"
 SYNC_MESSAGE_TEMPLATE = "N/A - in sync with {base_branch}"
+DIGEST_FIELDS = (
+    "head",
+    "base_head",
+    "merge_base",
+    "commits",
+    "commits_total",
+    "files",
+    "files_total",
+    "changed_files",
+)
 
 
 @dataclass
@@ -33,19 +52,124 @@ def find_context_files(context_dir: str) -> list[str]:
     return files
 
 
+def _open_context_file(filepath: str, mode: str):
+    return open(filepath, mode, encoding=CONTEXT_ENCODING, errors=CONTEXT_ERRORS, newline="")
+
+
+def _encode(text: str) -> bytes:
+    return text.encode(CONTEXT_ENCODING, CONTEXT_ERRORS)
+
+
+def _decode(data: bytes) -> str:
+    return data.decode(CONTEXT_ENCODING, CONTEXT_ERRORS)
+
+
+def find_tags(content: str) -> list[tuple[str, str]]:
+    return [(match.group(1), match.group(2)) for match in TAG_PATTERN.finditer(content)]
+
+
 def find_tags_in_file(filepath: str) -> list[tuple[str, str]]:
     try:
-        with open(filepath, "r") as f:
+        with _open_context_file(filepath, "r") as f:
             content = f.read()
     except (OSError, IOError):
         return []
 
-    return [(match.group(1), match.group(2)) for match in TAG_PATTERN.finditer(content)]
+    return find_tags(content)
+
+
+def render_tags(content: str, values: Mapping[str, str]) -> tuple[str, list[tuple[str, str]]]:
+    parts = []
+    replaced = []
+    position = 0
+    for match in TAG_PATTERN.finditer(content):
+        tag = match.group(1)
+        if tag not in values:
+            continue
+        parts.append(content[position : match.start()])
+        parts.append(f"<{tag}>{values[tag]}</{tag}>")
+        replaced.append((tag, match.group(2)))
+        position = match.end()
+
+    if not replaced:
+        return content, replaced
+    parts.append(content[position:])
+    return "".join(parts), replaced
 
 
 def update_tag_content(content: str, tag: str, new_value: str) -> str:
-    pattern = re.compile(rf"<({re.escape(tag)})>(.*?)</\1>", re.DOTALL)
-    return pattern.sub(rf"<\1>{new_value}</\1>", content)
+    return render_tags(content, {tag: new_value})[0]
+
+
+def _copy_range(view: mmap.mmap, out, start: int, end: int):
+    for offset in range(start, end, COPY_CHUNK_SIZE):
+        out.write(view[offset : min(end, offset + COPY_CHUNK_SIZE)])
+
+
+def _stream_rewrite(filepath: str, view: mmap.mmap, edits: list[tuple[int, int, bytes]]):
+    tmp_path = f"{filepath}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as out:
+            position = 0
+            for start, end, new in edits:
+                _copy_range(view, out, position, start)
+                out.write(new)
+                position = end
+            _copy_range(view, out, position, len(view))
+        shutil.copymode(filepath, tmp_path)
+        os.replace(tmp_path, filepath)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def update_large_file_tags(filepath: str, values: Mapping[str, str]) -> tuple[list[tuple[str, str]], bool]:
+    replaced = []
+    edits = []
+    with open(filepath, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        for match in TAG_PATTERN_BYTES.finditer(view):
+            tag = _decode(match.group(1))
+            if tag not in values:
+                continue
+            old = match.group(2)
+            new = _encode(values[tag])
+            replaced.append((tag, _decode(old)))
+            if new != old:
+                edits.append((match.start(2), match.end(2), new))
+
+        if not edits:
+            return replaced, False
+        if any(len(new) != end - start for start, end, new in edits):
+            _stream_rewrite(filepath, view, edits)
+            return replaced, True
+
+    with open(filepath, "r+b") as f:
+        for start, _, new in edits:
+            f.seek(start)
+            f.write(new)
+    return replaced, True
+
+
+def update_file_tags(filepath: str, size: int, values: Mapping[str, str]) -> tuple[list[tuple[str, str]], bool]:
+    if size >= CONTEXT_MMAP_THRESHOLD:
+        return update_large_file_tags(filepath, values)
+
+    with _open_context_file(filepath, "r") as f:
+        original_content = f.read()
+
+    new_content, replaced = render_tags(original_content, values)
+    if new_content == original_content:
+        return replaced, False
+
+    with _open_context_file(filepath, "w") as f:
+        f.write(new_content)
+    return replaced, True
+
+
+def meta_digest(meta: dict | None, base_branch: str) -> str:
+    payload = {field: meta.get(field) for field in DIGEST_FIELDS} if meta else {}
+    payload["base_branch"] = base_branch
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()
 
 
 def update_context_tags(
@@ -53,59 +177,46 @@ def update_context_tags(
     context_dir: str,
     branch_key: str,
     base_branch: str,
+    force: bool = False,
 ) -> list[TagUpdate]:
     updates: list[TagUpdate] = []
 
     meta = get_branch_meta(workspace, branch_key)
-    sync_message = SYNC_MESSAGE_TEMPLATE.format(base_branch=base_branch)
-
-    if meta:
-        commits_content = meta.get("commits") or sync_message
-        files_content = meta.get("changed_files") or sync_message
-    else:
-        commits_content = sync_message
-        files_content = sync_message
+    manifest = TagManifest(workspace, branch_key)
+    digest = meta_digest(meta, base_branch)
+    if not force and manifest.is_current(context_dir, digest):
+        return updates
 
-    context_files = find_context_files(context_dir)
+    context = TagContext(workspace, branch_key, base_branch, meta)
+    values = TagValues(context, SYNC_MESSAGE_TEMPLATE.format(base_branch=base_branch))
 
-    for filepath in context_files:
+    for rel_path in manifest.list_files(context_dir):
+        filepath = os.path.join(context_dir, rel_path)
         try:
-            with open(filepath, "r") as f:
-                original_content = f.read()
-        except (OSError, IOError):
+            stat = os.stat(filepath)
+        except OSError:
             continue
-
-        tags = find_tags_in_file(filepath)
-        if not tags:
+        if not manifest.needs_scan(rel_path, stat):
             continue
 
-        new_content = original_content
-        file_updates = []
-
-        tag_content_map = {
-            TAG_COMMITS: commits_content,
-            TAG_FILES: files_content,
-        }
-
-        for tag, old_value in tags:
-            if tag not in tag_content_map:
-                continue
+        try:
+            replaced, changed = update_file_tags(filepath, stat.st_size, values)
+        except (OSError, IOError):
+            continue
 
-            content_value = tag_content_map[tag]
-            new_value = f"\n{content_value}\n"
-            new_content = update_tag_content(new_content, tag, new_value)
-            file_updates.append(
+        if changed:
+            stat = os.stat(filepath)
+            updates.extend(
                 TagUpdate(
                     file=filepath,
                     tag=tag,
                     old_content=old_value.strip(),
-                    new_content=content_value,
+                    new_content=values.content(tag),
                 )
+                for tag, old_value in replaced
             )
+        manifest.record(rel_path, stat, sorted({tag for tag, _ in replaced}))
 
-        if new_content != original_content:
-            with open(filepath, "w") as f:
-                f.write(new_content)
-            updates.extend(file_updates)
-
+    manifest.set_digest(meta_digest(context.meta, base_branch))
+    manifest.save()
     return updates
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import time
+
+from branchctx.cmd_registry import get_command_handler
+from branchctx.constants import (
+    BRANCHES_DIR,
+    CONFIG_DIR,
+    DAEMON_CLIENT_TIMEOUT,
+    DAEMON_COMMANDS,
+    DAEMON_IDLE_TIMEOUT,
+    DAEMON_SOCKET_FILE,
+)
+
+REQUEST_TIMEOUT = 5.0
+START_TIMEOUT = 5.0
+
+
+def is_daemon_supported() -> bool:
+    return hasattr(socket, "AF_UNIX")
+
+
+def get_socket_path(workspace: str) -> str:
+    return os.path.join(workspace, CONFIG_DIR, BRANCHES_DIR, DAEMON_SOCKET_FILE)
+
+
+def send_request(workspace: str, payload: dict, timeout: float = DAEMON_CLIENT_TIMEOUT) -> dict | None:
+    if not is_daemon_supported():
+        return None
+
+    socket_path = get_socket_path(workspace)
+    if not os.path.exists(socket_path):
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path)
+            sock.sendall(json.dumps(payload).encode() + b"\n")
+            with sock.makefile("rb") as reader:
+                line = reader.readline()
+    except OSError:
+        return None
+
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+def forward_hook_event(command: str, args: list[str], cwd: str | None = None) -> int | None:
+    if command not in DAEMON_COMMANDS:
+        return None
+
+    cwd = cwd or os.getcwd()
+    response = send_request(cwd, {"command": command, "args": args, "cwd": cwd})
+    if response is None:
+        return None
+
+    sys.stdout.write(response.get("output", ""))
+    sys.stdout.flush()
+    return int(response.get("code", 1))
+
+
+def is_daemon_running(workspace: str) -> bool:
+    return send_request(workspace, {"command": "ping"}, timeout=1.0) is not None
+
+
+def start_daemon(workspace: str) -> bool:
+    subprocess.Popen(
+        [sys.executable, "-m", "branchctx.cli", "daemon", "run"],
+        cwd=workspace,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        if is_daemon_running(workspace):
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def stop_daemon(workspace: str) -> bool:
+    return send_request(workspace, {"command": "shutdown"}, timeout=5.0) is not None
+
+
+def _run_command(command: str, args: list[str], cwd: str) -> dict:
+    from branchctx.utils.git import clear_abbrevs
+
+    clear_abbrevs()
+    output = io.StringIO()
+    previous_cwd = os.getcwd()
+    try:
+        os.chdir(cwd)
+        with contextlib.redirect_stdout(output):
+            code = get_command_handler(command)(args)
+    except Exception as e:
+        output.write(f"error: {e}\n")
+        code = 1
+    finally:
+        os.chdir(previous_cwd)
+
+    return {"code": code, "output": output.getvalue()}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: DaemonServer
+    timeout = REQUEST_TIMEOUT
+
+    def handle(self):
+        try:
+            line = self.rfile.readline()
+            if line.startswith(b"{"):
+                request = json.loads(line)
+                respond = self._respond_json
+            else:
+                command, cwd, *args = line.decode().rstrip("\n").split("\t")[:-1]
+                request = {"command": command, "args": args, "cwd": cwd}
+                respond = self._respond_text
+        except (OSError, ValueError):
+            return
+
+        command = request.get("command")
+        if command == "ping":
+            response = {"code": 0, "output": ""}
+        elif command == "shutdown":
+            self.server.stopped = True
+            response = {"code": 0, "output": ""}
+        elif command in DAEMON_COMMANDS:
+            response = _run_command(command, list(request.get("args", [])), request.get("cwd") or self.server.workspace)
+        else:
+            response = {"code": 1, "output": f"error: unsupported daemon command '{command}'\n"}
+
+        try:
+            respond(response)
+        except OSError:
+            pass
+
+    def _respond_json(self, response: dict):
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+    def _respond_text(self, response: dict):
+        self.wfile.write(f"{response['code']}\n{response['output']}".encode())
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    def __init__(self, workspace: str, idle_timeout: float = DAEMON_IDLE_TIMEOUT):
+        self.workspace = workspace
+        self.socket_path = get_socket_path(workspace)
+        self.stopped = False
+
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        os.makedirs(os.path.dirname(self.socket_path), exist_ok=True)
+
+        super().__init__(self.socket_path, _RequestHandler)
+        self.timeout = idle_timeout
+
+    def handle_timeout(self):
+        self.stopped = True
+
+    def serve(self):
+        for command in DAEMON_COMMANDS:
+            get_command_handler(command)
+
+        try:
+            while not self.stopped:
+                self.handle_request()
+        finally:
+            self.server_close()
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
@@ -7,11 +7,26 @@ import stat
 import sys
 from typing import Literal
 
-from branchctx.assets import get_post_checkout_hook_template, get_post_commit_hook_template
-from branchctx.constants import CLI_NAME, GIT_DIR, HOOK_MARKER, HOOK_POST_CHECKOUT
+from branchctx.assets import (
+    get_daemon_client_template,
+    get_post_checkout_hook_template,
+    get_post_commit_hook_template,
+    get_post_rewrite_hook_template,
+)
+from branchctx.constants import (
+    BRANCHES_DIR,
+    CLI_NAME,
+    CONFIG_DIR,
+    DAEMON_CLIENT_TIMEOUT,
+    DAEMON_SOCKET_FILE,
+    GIT_DIR,
+    HOOK_MARKER,
+    HOOK_POST_CHECKOUT,
+    HOOK_POST_REWRITE,
+)
 from branchctx.utils.git import git_current_branch, git_hooks_path, git_info_exclude_add, git_root
 
-HookType = Literal["post-checkout", "post-commit"]
+HookType = Literal["post-checkout", "post-commit", "post-rewrite"]
 HookInstallResult = Literal["installed", "already_installed", "hook_exists", "appended", "skipped"]
 HookUninstallResult = Literal["uninstalled", "not_installed", "not_managed"]
 
@@ -45,10 +60,24 @@ def get_branchctx_path() -> str:
 
 
 def get_callback(hook_type: HookType) -> str:
-    branchctx_path = get_branchctx_path()
+    return f'"{get_branchctx_path()}" {get_hook_command(hook_type)}'
+
+
+def get_hook_command(hook_type: HookType) -> str:
     if hook_type == HOOK_POST_CHECKOUT:
-        return f'"{branchctx_path}" on-checkout'
-    return f'"{branchctx_path}" on-commit'
+        return "on-checkout"
+    if hook_type == HOOK_POST_REWRITE:
+        return "on-rewrite"
+    return "on-commit"
+
+
+def get_daemon_callback(hook_type: HookType) -> str:
+    return f'bctx_hook "{get_branchctx_path()}" {get_hook_command(hook_type)}'
+
+
+def get_daemon_client() -> str:
+    socket_path = "/".join((CONFIG_DIR, BRANCHES_DIR, DAEMON_SOCKET_FILE))
+    return get_daemon_client_template().format(socket=socket_path, timeout=DAEMON_CLIENT_TIMEOUT)
 
 
 def get_git_root(path: str | None = None) -> str | None:
@@ -122,6 +151,8 @@ def is_hook_installed(git_root: str, hook_type: HookType = HOOK_POST_CHECKOUT) -
 def _get_hook_template(hook_type: HookType) -> str:
     if hook_type == HOOK_POST_CHECKOUT:
         return get_post_checkout_hook_template()
+    if hook_type == HOOK_POST_REWRITE:
+        return get_post_rewrite_hook_template()
     return get_post_commit_hook_template()
 
 
@@ -137,6 +168,12 @@ OLD_BRANCH=$(git rev-parse --abbrev-ref @{{-1}} 2>/dev/null || echo "unknown")
 NEW_BRANCH=$(git rev-parse --abbrev-ref HEAD)
 {callback} "$OLD_BRANCH" "$NEW_BRANCH"
 {SNIPPET_END_MARKER}
+"""
+    if hook_type == HOOK_POST_REWRITE:
+        return f"""
+{HOOK_MARKER}
+{callback} "$1"
+{SNIPPET_END_MARKER}
 """
     return f"""
 {HOOK_MARKER}
@@ -193,7 +230,7 @@ def install_hook(git_root: str, hook_type: HookType = HOOK_POST_CHECKOUT) -> Hoo
         return "appended"
 
     template = _get_hook_template(hook_type)
-    content = template.format(marker=HOOK_MARKER, callback=get_callback(hook_type))
+    content = template.format(marker=HOOK_MARKER, client=get_daemon_client(), callback=get_daemon_callback(hook_type))
 
     with open(hook_path, "w") as f:
         f.write(content)
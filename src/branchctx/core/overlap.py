@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from branchctx.data.meta import load_path_index
+
+
+@dataclass
+class BranchOverlap:
+    first: str
+    second: str
+    shared: int
+    weight: int
+
+
+def _lines_changed(counts: list[str]) -> int:
+    return sum(int(value) for value in counts if value.isdigit())
+
+
+def _iter_bits(bits: int):
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+def _shared_path_ids(branches: dict[str, dict[str, list[str]]]) -> dict[str, int]:
+    frequency: dict[str, int] = {}
+    for paths in branches.values():
+        for path in paths:
+            frequency[path] = frequency.get(path, 0) + 1
+    shared = sorted((path for path, count in frequency.items() if count > 1), key=lambda path: -frequency[path])
+    return {path: path_id for path_id, path in enumerate(shared)}
+
+
+def compute_overlaps(branches: dict[str, dict[str, list[str]]]) -> list[BranchOverlap]:
+    path_ids = _shared_path_ids(branches)
+    keys = []
+    bitsets = []
+    weights = []
+    for key in sorted(branches):
+        bits = 0
+        lines = {}
+        for path, counts in branches[key].items():
+            path_id = path_ids.get(path)
+            if path_id is None:
+                continue
+            bits |= 1 << path_id
+            lines[path_id] = _lines_changed(counts)
+        if bits:
+            keys.append(key)
+            bitsets.append(bits)
+            weights.append(lines)
+
+    holders = [0] * len(path_ids)
+    for index, bits in enumerate(bitsets):
+        for path_id in _iter_bits(bits):
+            holders[path_id] |= 1 << index
+
+    overlaps = []
+    for i, first in enumerate(bitsets):
+        candidates = 0
+        for path_id in weights[i]:
+            candidates |= holders[path_id]
+        for j in _iter_bits(candidates >> (i + 1)):
+            j += i + 1
+            ids = list(_iter_bits(first & bitsets[j]))
+            weight = sum(weights[i][path_id] + weights[j][path_id] for path_id in ids)
+            overlaps.append(BranchOverlap(keys[i], keys[j], len(ids), weight))
+
+    overlaps.sort(key=lambda overlap: (-overlap.weight, -overlap.shared, overlap.first, overlap.second))
+    return overlaps
+
+
+def get_branch_overlaps(workspace: str) -> list[BranchOverlap]:
+    return compute_overlaps(load_path_index(workspace).branches())
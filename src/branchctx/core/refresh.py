@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+from branchctx.constants import REFRESH_DIRTY_FILE, REFRESH_LOCK_FILE, REFRESH_PENDING_FILE
+from branchctx.core.context_tags import TagUpdate, update_context_tags
+from branchctx.core.hooks import get_current_branch
+from branchctx.core.sync import get_branch_dir, sanitize_branch_name
+from branchctx.core.tag_providers import needs_changed_files
+from branchctx.data.branch_base import get_base_branch
+from branchctx.data.config import get_branches_dir
+from branchctx.data.meta import advance_branch_meta
+from branchctx.utils.git import git_sequencer_in_progress
+from branchctx.utils.lock import FileLock, is_locking_supported
+
+
+def get_refresh_lock_path(workspace: str) -> str:
+    return os.path.join(get_branches_dir(workspace), REFRESH_LOCK_FILE)
+
+
+def get_refresh_pending_path(workspace: str) -> str:
+    return os.path.join(get_branches_dir(workspace), REFRESH_PENDING_FILE)
+
+
+def get_refresh_dirty_path(workspace: str) -> str:
+    return os.path.join(get_branches_dir(workspace), REFRESH_DIRTY_FILE)
+
+
+def refresh_current_branch(workspace: str) -> list[TagUpdate]:
+    branch = get_current_branch(workspace)
+    if not branch:
+        return []
+
+    context_dir = get_branch_dir(workspace, branch)
+    if not os.path.isdir(context_dir):
+        return []
+
+    branch_key = sanitize_branch_name(branch)
+    base_branch = get_base_branch(workspace, context_dir)
+    advance_branch_meta(workspace, branch_key, base_branch, needs_changed_files(workspace, branch_key))
+    return update_context_tags(workspace, context_dir, branch_key, base_branch)
+
+
+def _touch(path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w"):
+        pass
+
+
+def _consume(path: str) -> bool:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _mark_pending(workspace: str):
+    _touch(get_refresh_pending_path(workspace))
+
+
+def _consume_pending(workspace: str) -> bool:
+    return _consume(get_refresh_pending_path(workspace))
+
+
+def mark_dirty(workspace: str):
+    _touch(get_refresh_dirty_path(workspace))
+
+
+def consume_dirty(workspace: str) -> bool:
+    return _consume(get_refresh_dirty_path(workspace))
+
+
+def defer_during_sequencer(workspace: str) -> bool:
+    if not git_sequencer_in_progress(workspace):
+        return False
+    mark_dirty(workspace)
+    return True
+
+
+def _spawn_worker(workspace: str):
+    subprocess.Popen(
+        [sys.executable, "-m", "branchctx.cli", "refresh"],
+        cwd=workspace,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def schedule_refresh(workspace: str) -> bool:
+    if not is_locking_supported():
+        return False
+
+    _mark_pending(workspace)
+
+    lock = FileLock(get_refresh_lock_path(workspace))
+    if not lock.acquire(blocking=False):
+        return True
+    lock.release()
+
+    _spawn_worker(workspace)
+    return True
+
+
+def run_refresh_worker(workspace: str) -> int:
+    lock = FileLock(get_refresh_lock_path(workspace))
+    refreshes = 0
+
+    while lock.acquire(blocking=False):
+        try:
+            while _consume_pending(workspace):
+                refresh_current_branch(workspace)
+                refreshes += 1
+        finally:
+            lock.release()
+
+        if not os.path.exists(get_refresh_pending_path(workspace)):
+            break
+
+    return refreshes
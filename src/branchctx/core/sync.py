@@ -1,11 +1,10 @@
 from __future__ import annotations
 
 import os
-import platform
 import re
 import shutil
 import subprocess
-from importlib import resources
+import sys
 from typing import Literal
 
 from branchctx.constants import (
@@ -19,11 +18,13 @@ from branchctx.constants import (
 )
 from branchctx.data.branch_base import init_base_branch
 from branchctx.data.config import Config, get_branches_dir, get_default_template, get_template_dir
-from branchctx.data.meta import archive_branch_meta, create_branch_meta
+from branchctx.data.meta import archive_branch_metas, create_branch_meta
 from branchctx.utils.template import get_template_variables, render_template_content
 
 
 def get_default_sound_file() -> str | None:
+    from importlib import resources
+
     try:
         return str(resources.files(f"{PACKAGE_NAME}.assets").joinpath(DEFAULT_SOUND_FILE))
     except Exception:
@@ -38,12 +39,11 @@ def play_sound(sound_file: str | None):
         return
 
     try:
-        system = platform.system()
-        if system == "Darwin":
+        if sys.platform == "darwin":
             subprocess.Popen(["afplay", sound_file], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        elif system == "Linux":
+        elif sys.platform.startswith("linux"):
             subprocess.Popen(["paplay", sound_file], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        elif system == "Windows":
+        elif sys.platform == "win32":
             cmd = f"(New-Object Media.SoundPlayer '{sound_file}').Play()"
             subprocess.Popen(["powershell", "-c", cmd], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
     except FileNotFoundError:
@@ -162,11 +162,14 @@ def update_symlink(workspace: str, branch: str) -> Literal["unchanged", "error_n
         current_target = os.readlink(symlink_path)
         if current_target == rel_path:
             return "unchanged"
-        os.remove(symlink_path)
+        if sys.platform == "win32":
+            os.remove(symlink_path)
     elif os.path.exists(symlink_path):
         return "error_not_symlink"
 
-    os.symlink(rel_path, symlink_path)
+    tmp_path = f"{symlink_path}.{os.getpid()}.tmp"
+    os.symlink(rel_path, tmp_path)
+    os.replace(tmp_path, symlink_path)
     return "updated"
 
 
@@ -209,19 +212,28 @@ def list_archived_branches(workspace: str) -> list[str]:
     if not os.path.exists(archived_dir):
         return []
 
-    return [d for d in os.listdir(archived_dir) if os.path.isdir(os.path.join(archived_dir, d))]
+    return [
+        d for d in os.listdir(archived_dir) if os.path.isdir(os.path.join(archived_dir, d)) and not d.startswith(".")
+    ]
 
 
-def archive_branch(workspace: str, branch_name: str) -> bool:
+def archive_branches(workspace: str, branch_names: list[str]) -> list[str]:
     branches_dir = get_branches_dir(workspace)
     archived_dir = get_archived_dir(workspace)
-    src = os.path.join(branches_dir, branch_name)
-    dst = os.path.join(archived_dir, branch_name)
 
-    if not os.path.exists(src):
-        return False
+    archived = []
+    for branch_name in branch_names:
+        src = os.path.join(branches_dir, branch_name)
+        if not os.path.exists(src):
+            continue
+        os.makedirs(archived_dir, exist_ok=True)
+        shutil.move(src, os.path.join(archived_dir, branch_name))
+        archived.append(branch_name)
 
-    os.makedirs(archived_dir, exist_ok=True)
-    shutil.move(src, dst)
-    archive_branch_meta(workspace, branch_name)
-    return True
+    if archived:
+        archive_branch_metas(workspace, archived)
+    return archived
+
+
+def archive_branch(workspace: str, branch_name: str) -> bool:
+    return bool(archive_branches(workspace, [branch_name]))
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Iterator, Mapping
+
+from branchctx.data.meta import (
+    get_branch_meta,
+    iter_branch_files,
+    render_changed_files,
+    render_commits,
+    update_branch_meta,
+)
+from branchctx.data.tag_manifest import TagManifest
+from branchctx.utils.git import git_ahead_behind, git_log_authors
+
+TAG_COMMITS = "bctx:commits"
+TAG_FILES = "bctx:files"
+TAG_DIFFSTAT = "bctx:diffstat"
+TAG_AUTHORS = "bctx:authors"
+TAG_AHEAD_BEHIND = "bctx:ahead-behind"
+
+META_COMMITS = "commits"
+META_FILES = "files"
+
+GIT_COST_NONE = "none"
+GIT_COST_LOG = "log"
+GIT_COST_REV_LIST = "rev-list"
+
+
+@dataclass
+class TagContext:
+    workspace: str
+    branch_key: str
+    base_branch: str
+    meta: dict | None
+
+
+@dataclass(frozen=True)
+class TagProvider:
+    meta: frozenset[str]
+    git_cost: str
+    render: Callable[[TagContext], str]
+
+
+def _render_commits(context: TagContext) -> str:
+    return render_commits(context.workspace, context.branch_key, context.meta)
+
+
+def _render_files(context: TagContext) -> str:
+    return render_changed_files(context.workspace, context.branch_key, context.meta)
+
+
+def _count_lines(value: str) -> int:
+    return int(value) if value.isdigit() else 0
+
+
+def _render_diffstat(context: TagContext) -> str:
+    count = added = removed = 0
+    for entry in iter_branch_files(context.workspace, context.branch_key, context.meta):
+        count += 1
+        if entry["status"] != "R":
+            added += _count_lines(entry["added"])
+            removed += _count_lines(entry["removed"])
+    if not count:
+        return ""
+    files = "file" if count == 1 else "files"
+    return f"{count} {files} changed, +{added} -{removed}"
+
+
+def _render_authors(context: TagContext) -> str:
+    authors = Counter(git_log_authors(context.workspace, context.base_branch))
+    ranked = sorted(authors.items(), key=lambda item: (-item[1], item[0]))
+    return "\n".join(f"{name} ({count})" for name, count in ranked)
+
+
+def _render_ahead_behind(context: TagContext) -> str:
+    counts = git_ahead_behind(context.workspace, context.base_branch)
+    if counts is None:
+        return ""
+    ahead, behind = counts
+    return f"ahead {ahead}, behind {behind}"
+
+
+TAG_PROVIDERS: dict[str, TagProvider] = {
+    TAG_COMMITS: TagProvider(frozenset({META_COMMITS}), GIT_COST_NONE, _render_commits),
+    TAG_FILES: TagProvider(frozenset({META_FILES}), GIT_COST_NONE, _render_files),
+    TAG_DIFFSTAT: TagProvider(frozenset({META_FILES}), GIT_COST_NONE, _render_diffstat),
+    TAG_AUTHORS: TagProvider(frozenset(), GIT_COST_LOG, _render_authors),
+    TAG_AHEAD_BEHIND: TagProvider(frozenset(), GIT_COST_REV_LIST, _render_ahead_behind),
+}
+
+
+def _has_meta_part(meta: dict, part: str) -> bool:
+    if part == META_FILES:
+        return meta.get("files") is not None or meta.get("changed_files") is not None
+    return meta.get(part) is not None
+
+
+def needs_changed_files(workspace: str, branch_key: str) -> bool:
+    used = TagManifest(workspace, branch_key).used_tags()
+    if used is None:
+        return True
+    return any(META_FILES in TAG_PROVIDERS[tag].meta for tag in used if tag in TAG_PROVIDERS)
+
+
+class TagValues(Mapping[str, str]):
+    def __init__(self, context: TagContext, fallback: str):
+        self.context = context
+        self.fallback = fallback
+        self.contents: dict[str, str] = {}
+
+    def __contains__(self, tag: object) -> bool:
+        return tag in TAG_PROVIDERS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(TAG_PROVIDERS)
+
+    def __len__(self) -> int:
+        return len(TAG_PROVIDERS)
+
+    def __getitem__(self, tag: str) -> str:
+        return f"\n{self.content(tag)}\n"
+
+    def content(self, tag: str) -> str:
+        if tag not in self.contents:
+            self.contents[tag] = self._render(TAG_PROVIDERS[tag]) or self.fallback
+        return self.contents[tag]
+
+    def _render(self, provider: TagProvider) -> str:
+        context = self.context
+        if context.meta is None:
+            return ""
+        if not all(_has_meta_part(context.meta, part) for part in provider.meta):
+            update_branch_meta(context.workspace, context.branch_key, context.base_branch)
+            context.meta = get_branch_meta(context.workspace, context.branch_key)
+            if context.meta is None:
+                return ""
+        return provider.render(context)
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict
+
+from branchctx.constants import COMMIT_CACHE_FILE, COMMIT_CACHE_MAX_BYTES, COMMIT_CACHE_MAX_ENTRIES
+from branchctx.data.config import get_branches_dir
+from branchctx.utils.git import CommitInfo, DiffEntry
+
+
+def get_commit_cache_path(workspace: str) -> str:
+    return os.path.join(get_branches_dir(workspace), COMMIT_CACHE_FILE)
+
+
+class CommitCache:
+    def __init__(
+        self,
+        workspace: str,
+        max_entries: int = COMMIT_CACHE_MAX_ENTRIES,
+        max_bytes: int = COMMIT_CACHE_MAX_BYTES,
+    ):
+        self.path = get_commit_cache_path(workspace)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: dict[str, dict] | None = None
+        self._pending: dict[str, None] = {}
+        self._lines = 0
+        self._size = 0
+
+    def _load(self) -> dict[str, dict]:
+        if self._entries is None:
+            self._entries = {}
+            try:
+                with open(self.path, "rb") as f:
+                    for line in f:
+                        self._lines += 1
+                        self._size += len(line)
+                        try:
+                            sha, entry = json.loads(line)
+                        except ValueError:
+                            continue
+                        if isinstance(sha, str) and isinstance(entry, dict):
+                            self._entries.pop(sha, None)
+                            self._entries[sha] = entry
+            except OSError:
+                pass
+        return self._entries
+
+    def _touch(self, sha: str) -> dict | None:
+        entries = self._load()
+        entry = entries.pop(sha, None)
+        if entry is not None:
+            entries[sha] = entry
+        return entry
+
+    def get(self, sha: str) -> CommitInfo | None:
+        entry = self._touch(sha)
+        if entry is None:
+            return None
+        try:
+            return CommitInfo(
+                sha=sha,
+                parents=entry["parents"],
+                commit_time=entry["commit_time"],
+                author=entry["author"],
+                author_date=entry["author_date"],
+                subject=entry["subject"],
+            )
+        except KeyError:
+            return None
+
+    def put(self, commit: CommitInfo):
+        entries = self._load()
+        entry = asdict(commit)
+        del entry["sha"]
+        previous = entries.pop(commit.sha, None)
+        if previous and "files" in previous:
+            entry["files"] = previous["files"]
+        entries[commit.sha] = entry
+        self._pending[commit.sha] = None
+
+    def get_files(self, sha: str) -> list[DiffEntry] | None:
+        entry = self._touch(sha)
+        if entry is None or "files" not in entry:
+            return None
+        return [DiffEntry(*fields) for fields in entry["files"]]
+
+    def put_files(self, sha: str, files: list[DiffEntry]):
+        entry = self._load().get(sha)
+        if entry is None:
+            return
+        entry["files"] = [[f.status, f.path, f.old_path, f.added, f.removed] for f in files]
+        self._pending[sha] = None
+
+    def _encode(self, sha: str) -> bytes:
+        return json.dumps([sha, self._entries[sha]], separators=(",", ":")).encode() + b"\n"
+
+    def save(self):
+        if not self._pending or self._entries is None:
+            return
+
+        lines = [self._encode(sha) for sha in self._pending if sha in self._entries]
+        size = sum(len(line) for line in lines)
+        if self._lines + len(lines) > self.max_entries or self._size + size > self.max_bytes:
+            self._compact()
+            return
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        try:
+            with open(self.path, "ab") as f:
+                f.write(b"".join(lines))
+        except OSError:
+            return
+        self._lines += len(lines)
+        self._size += size
+        self._pending.clear()
+
+    def _compact(self):
+        assert self._entries is not None
+        kept: dict[str, bytes] = {}
+        size = 0
+        for sha in reversed(self._entries):
+            if len(kept) >= self.max_entries // 2:
+                break
+            line = self._encode(sha)
+            if size + len(line) > self.max_bytes // 2:
+                continue
+            kept[sha] = line
+            size += len(line)
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(b"".join(reversed(kept.values())))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        self._entries = {sha: self._entries[sha] for sha in reversed(kept)}
+        self._lines = len(kept)
+        self._size = size
+        self._pending.clear()
+
+
+_commit_caches: dict[str, CommitCache] = {}
+
+
+def get_commit_cache(workspace: str) -> CommitCache:
+    if workspace not in _commit_caches:
+        _commit_caches[workspace] = CommitCache(workspace)
+    return _commit_caches[workspace]
@@ -10,6 +10,10 @@ from branchctx.constants import (
     CONFIG_DIR,
     CONFIG_FILE,
     DEFAULT_TEMPLATE,
+    META_INLINE_COMMITS,
+    META_INLINE_FILES,
+    META_STORAGE_SHARDED,
+    META_STORAGES,
     TEMPLATES_DIR,
 )
 
@@ -23,6 +27,12 @@ def _get_defaults() -> dict:
     return _DEFAULTS
 
 
+def _inline_limit(value: object, default: int) -> int:
+    if isinstance(value, int) and not isinstance(value, bool) and value >= 0:
+        return value
+    return default
+
+
 @dataclass
 class TemplateRule:
     prefix: str
@@ -41,6 +51,10 @@ def get_default_template() -> str:
 class Config:
     sound: bool = field(default_factory=lambda: _get_defaults()["sound"])
     sound_file: str | None = None
+    background_refresh: bool = False
+    meta_storage: str = META_STORAGE_SHARDED
+    meta_inline_commits: int = META_INLINE_COMMITS
+    meta_inline_files: int = META_INLINE_FILES
     template_rules: list[TemplateRule] = field(default_factory=_get_default_template_rules)
 
     @classmethod
@@ -62,9 +76,15 @@ class Config:
             TemplateRule(prefix=r["prefix"], template=r["template"]) for r in data.get("template_rules", [])
         ]
 
+        meta_storage = data.get("meta_storage", META_STORAGE_SHARDED)
+
         return cls(
             sound=data.get("sound", defaults["sound"]),
             sound_file=data.get("sound_file"),
+            background_refresh=data.get("background_refresh", False),
+            meta_storage=meta_storage if meta_storage in META_STORAGES else META_STORAGE_SHARDED,
+            meta_inline_commits=_inline_limit(data.get("meta_inline_commits"), META_INLINE_COMMITS),
+            meta_inline_files=_inline_limit(data.get("meta_inline_files"), META_INLINE_FILES),
             template_rules=template_rules,
         )
 
@@ -78,6 +98,14 @@ class Config:
 
         if self.sound_file:
             data["sound_file"] = self.sound_file
+        if self.background_refresh:
+            data["background_refresh"] = True
+        if self.meta_storage != META_STORAGE_SHARDED:
+            data["meta_storage"] = self.meta_storage
+        if self.meta_inline_commits != META_INLINE_COMMITS:
+            data["meta_inline_commits"] = self.meta_inline_commits
+        if self.meta_inline_files != META_INLINE_FILES:
+            data["meta_inline_files"] = self.meta_inline_files
 
         with open(config_path, "w") as f:
             json.dump(data, f, indent=2)
@@ -1,203 +1,524 @@
 from __future__ import annotations
 
-import json
 import os
 import subprocess
+import threading
+from dataclasses import asdict
 from datetime import datetime
+from typing import Iterator
 
-from branchctx.constants import ARCHIVED_DIR, META_FILE
-from branchctx.data.config import get_branches_dir
-from branchctx.utils.git import git_user_name
+from branchctx.constants import ARCHIVED_DIR, CONFIG_DIR, CONFIG_FILE, META_LOCK_FILE
+from branchctx.data.commit_cache import get_commit_cache
+from branchctx.data.config import Config, get_branches_dir
+from branchctx.data.meta_store import MetaStore, OverflowStore, PathIndex, open_meta_store, path_sort_key
+from branchctx.data.tag_manifest import delete_tag_manifests
+from branchctx.utils.git import (
+    CommitInfo,
+    DiffEntry,
+    GitObjectService,
+    get_object_service,
+    git_abbrev_length,
+    git_diff_entries,
+    git_log_range,
+    git_merge_base,
+    git_quote_path,
+    git_quote_path_enabled,
+    git_resolve_commit,
+    git_user_name,
+)
+from branchctx.utils.lock import FileLock
 
+INCREMENTAL_PATH_LIMIT = 1000
 
-def _get_meta_path(workspace: str) -> str:
-    return os.path.join(get_branches_dir(workspace), META_FILE)
+_meta_configs: dict[str, tuple[tuple[int, int, int] | None, Config]] = {}
+_meta_stores = threading.local()
 
 
-def _get_archived_meta_path(workspace: str) -> str:
-    return os.path.join(get_branches_dir(workspace), ARCHIVED_DIR, META_FILE)
+def meta_lock(workspace: str) -> FileLock:
+    return FileLock(os.path.join(get_branches_dir(workspace), META_LOCK_FILE), reentrant=True)
 
 
-def _load_meta(path: str) -> dict:
-    if not os.path.exists(path):
-        return {}
+def _meta_root(workspace: str, archived: bool = False) -> str:
+    root = get_branches_dir(workspace)
+    return os.path.join(root, ARCHIVED_DIR) if archived else root
+
+
+def _meta_config(workspace: str) -> Config:
     try:
-        with open(path) as f:
-            return json.load(f)
-    except (json.JSONDecodeError, OSError):
-        return {}
+        stat = os.stat(os.path.join(workspace, CONFIG_DIR, CONFIG_FILE))
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    except OSError:
+        signature = None
+
+    cached = _meta_configs.get(workspace)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    config = Config.load(workspace)
+    _meta_configs[workspace] = (signature, config)
+    return config
+
+
+def get_meta_store(workspace: str, archived: bool = False) -> MetaStore:
+    root = _meta_root(workspace, archived)
+    storage = _meta_config(workspace).meta_storage
+    stores = _meta_stores.__dict__.setdefault("stores", {})
+    store = stores.get((root, storage))
+    if store is None or not store.exists():
+        store = open_meta_store(root, storage, meta_lock(workspace))
+        stores[(root, storage)] = store
+    return store
+
+
+def get_overflow_store(workspace: str, archived: bool = False) -> OverflowStore:
+    return OverflowStore(_meta_root(workspace, archived))
+
+
+def get_path_index(workspace: str) -> PathIndex:
+    return PathIndex(get_branches_dir(workspace))
+
 
+def _get_object_service(workspace: str) -> GitObjectService:
+    return get_object_service(workspace, get_commit_cache(workspace))
 
-def _save_meta(path: str, data: dict):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
+
+def _format_last_commit(sha: str, message: str, datetime_iso: str) -> dict:
+    return {"hash": sha[:7], "message": message, "datetime": datetime_iso}
 
 
 def _get_last_commit(workspace: str) -> dict | None:
-    try:
-        result = subprocess.run(
-            ["git", "log", "-1", "--format=%H|%s|%aI"],
-            cwd=workspace,
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        parts = result.stdout.strip().split("|", 2)
-        if len(parts) == 3:
-            return {"hash": parts[0][:7], "message": parts[1], "datetime": parts[2]}
-    except subprocess.CalledProcessError:
-        pass
-    return None
+    head = git_resolve_commit(workspace, "HEAD")
+    if not head:
+        return None
 
+    commit = _get_object_service(workspace).read_commit(head)
+    if commit is None:
+        return None
+    return _format_last_commit(commit.sha, commit.subject, commit.author_date)
 
-def _get_commits_since_base(workspace: str, base_branch: str) -> str:
+
+def _commit_record(sha: str, subject: str, author_date: str) -> dict:
+    return {"sha": sha, "subject": subject, "date": author_date}
+
+
+def _collect_commits(workspace: str, base_branch: str) -> tuple[list[dict], dict | None]:
+    commits = git_log_range(workspace, base_branch)
+    if commits is None:
+        return _collect_commits_from_log(workspace, base_branch)
+
+    records = [_commit_record(c.sha, c.subject, c.author_date) for c in commits]
+    return records, _get_last_commit(workspace)
+
+
+def _collect_commits_from_log(workspace: str, base_branch: str) -> tuple[list[dict], dict | None]:
     try:
         result = subprocess.run(
-            ["git", "log", f"{base_branch}..HEAD", "--oneline"],
+            ["git", "log", "-z", "--format=%H%x1f%s%x1f%aI", f"{base_branch}..HEAD"],
             cwd=workspace,
             capture_output=True,
             text=True,
             check=True,
         )
-        return result.stdout.strip()
     except subprocess.CalledProcessError:
+        return [], _get_last_commit(workspace)
+
+    records = [_commit_record(*record.split("\x1f")) for record in result.stdout.split("\0") if record]
+    if not records:
+        return [], _get_last_commit(workspace)
+
+    first = records[0]
+    return records, _format_last_commit(first["sha"], first["subject"], first["date"])
+
+
+def _format_commits(workspace: str, commits: list[dict]) -> str:
+    if not commits:
         return ""
 
+    abbrev = git_abbrev_length(workspace)
+    if abbrev is None:
+        return "\n".join(f"{c['sha'][:7]} {c['subject']}" for c in commits)
 
-def _get_changed_files(workspace: str, base_branch: str) -> str:
-    try:
-        status_result = subprocess.run(
-            ["git", "diff", "--name-status", "-M100", f"{base_branch}...HEAD"],
-            cwd=workspace,
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        numstat_result = subprocess.run(
-            ["git", "diff", "--numstat", "-M100", f"{base_branch}...HEAD"],
-            cwd=workspace,
-            capture_output=True,
-            text=True,
-            check=True,
-        )
+    service = _get_object_service(workspace)
+    return "\n".join(f"{service.abbreviate(c['sha'], abbrev)} {c['subject']}" for c in commits)
 
-        status_lines = status_result.stdout.strip().split("\n")
-        numstat_lines = numstat_result.stdout.strip().split("\n")
-
-        if not status_lines or status_lines == [""]:
-            return ""
-
-        file_stats: dict[str, tuple[str, str]] = {}
-        for line in numstat_lines:
-            if not line:
-                continue
-            parts = line.split("\t")
-            if len(parts) >= 3:
-                added, removed = parts[0], parts[1]
-                filepath = parts[2] if len(parts) == 3 else parts[3]
-                file_stats[filepath] = (added, removed)
-
-        files: list[tuple[str, str, str, str, str]] = []
-        for line in status_lines:
-            if not line:
-                continue
-            parts = line.split("\t")
-            if len(parts) >= 2:
-                status = parts[0][0]
-                if status == "R" and len(parts) >= 3:
-                    old_path, new_path = parts[1], parts[2]
-                    added, removed = file_stats.get(new_path, ("0", "0"))
-                    files.append((status, new_path, old_path, added, removed))
-                else:
-                    filepath = parts[-1]
-                    added, removed = file_stats.get(filepath, ("0", "0"))
-                    files.append((status, filepath, "", added, removed))
-
-        if not files:
-            return ""
-
-        def get_display_path(f: tuple) -> str:
-            status, filepath, old_path = f[0], f[1], f[2]
-            if status == "R" and old_path:
-                return f"{filepath}  <-  {old_path}"
-            return filepath
-
-        max_display_len = max(len(get_display_path(f)) for f in files)
-        result_lines = []
-        for status, filepath, old_path, added, removed in files:
-            display_path = get_display_path((status, filepath, old_path, added, removed))
-            padded_display = display_path.ljust(max_display_len)
-            result_lines.append(f"{status}  {padded_display}  (+{added} -{removed})")
-
-        return "\n".join(result_lines)
-    except subprocess.CalledProcessError:
+
+def _format_changed_files(workspace: str, entries: list[DiffEntry]) -> str:
+    if not entries:
         return ""
 
+    quote_high = git_quote_path_enabled(workspace)
+
+    def get_display_path(entry: DiffEntry) -> str:
+        filepath = git_quote_path(entry.path, quote_high)
+        if entry.status == "R" and entry.old_path:
+            return f"{filepath}  <-  {git_quote_path(entry.old_path, quote_high)}"
+        return filepath
+
+    display_paths = [get_display_path(entry) for entry in entries]
+    max_display_len = max(len(display) for display in display_paths)
+    result_lines = []
+    for entry, display_path in zip(entries, display_paths):
+        padded_display = display_path.ljust(max_display_len)
+        added, removed = ("0", "0") if entry.status == "R" else (entry.added, entry.removed)
+        result_lines.append(f"{entry.status}  {padded_display}  (+{added} -{removed})")
+
+    return "\n".join(result_lines)
+
+
+def iter_branch_commits(workspace: str, branch_key: str, meta: dict) -> Iterator[dict]:
+    if "commits_total" in meta:
+        yield from get_overflow_store(workspace).stream(branch_key, "commit")
+    else:
+        yield from meta.get("commits") or []
+
+
+def iter_branch_files(workspace: str, branch_key: str, meta: dict) -> Iterator[dict]:
+    if "files_total" in meta:
+        yield from get_overflow_store(workspace).stream(branch_key, "file")
+    else:
+        yield from meta.get("files") or []
+
+
+def render_commits(workspace: str, branch_key: str, meta: dict) -> str:
+    if isinstance(meta.get("commits"), str):
+        return meta["commits"]
+    return _format_commits(workspace, list(iter_branch_commits(workspace, branch_key, meta)))
+
+
+def render_changed_files(workspace: str, branch_key: str, meta: dict) -> str:
+    if meta.get("files") is None:
+        return meta.get("changed_files") or ""
+    entries = [DiffEntry(**entry) for entry in iter_branch_files(workspace, branch_key, meta)]
+    return _format_changed_files(workspace, entries)
+
+
+def _expand_overflow(workspace: str, branch_key: str, data: dict) -> dict:
+    if "commits_total" in data:
+        data["commits"] = list(iter_branch_commits(workspace, branch_key, data))
+        del data["commits_total"]
+    if "files_total" in data:
+        data["files"] = list(iter_branch_files(workspace, branch_key, data))
+        del data["files_total"]
+    return data
+
+
+def _spill_overflow(workspace: str, branch_key: str, data: dict, config: Config):
+    commits = data.get("commits")
+    files = data.get("files")
+    spill_commits = isinstance(commits, list) and len(commits) > config.meta_inline_commits
+    spill_files = files is not None and len(files) > config.meta_inline_files
+    data.pop("commits_total", None)
+    data.pop("files_total", None)
+    data.pop("overflow_stale", None)
+
+    overflow = get_overflow_store(workspace)
+    if not spill_commits and not spill_files:
+        overflow.delete(branch_key)
+        return
+
+    overflow.write(branch_key, commits if spill_commits else [], files if spill_files else [])
+    if spill_commits:
+        data["commits_total"] = len(commits)
+        data["commits"] = commits[: config.meta_inline_commits]
+    if spill_files:
+        data["files_total"] = len(files)
+        data["files"] = files[: config.meta_inline_files]
+
+
+def _advance_overflow(
+    workspace: str, branch_key: str, data: dict, base_branch: str, config: Config
+) -> list[dict] | None:
+    previous = list(iter_branch_files(workspace, branch_key, data))
+    state = dict(data, files=previous)
+    if not _advance_branch_state(workspace, state, base_branch):
+        return None
+
+    spill_commits = "commits_total" in data
+    spill_files = "files_total" in data
+    new_commits = state["commits"][: len(state["commits"]) - len(data["commits"])]
+    commits_total = data.get("commits_total", len(data["commits"])) + len(new_commits)
+    files = state["files"]
+    if (
+        spill_commits != (commits_total > config.meta_inline_commits)
+        or spill_files != (len(files) > config.meta_inline_files)
+        or data.get("overflow_stale", 0) > len(files)
+    ):
+        return None
+
+    before = {entry["path"]: entry for entry in previous}
+    after = {entry["path"]: entry for entry in files}
+    changed = [entry for path, entry in after.items() if before.get(path) != entry] if spill_files else []
+    dropped = [path for path in before if path not in after] if spill_files else []
+    get_overflow_store(workspace).append(branch_key, new_commits if spill_commits else [], changed, dropped)
+
+    data.update(state)
+    if spill_commits:
+        data["commits"] = state["commits"][: config.meta_inline_commits]
+        data["commits_total"] = commits_total
+    if spill_files:
+        data["files"] = files[: config.meta_inline_files]
+        data["files_total"] = len(files)
+        data["overflow_stale"] = data.get("overflow_stale", 0) + len(changed) + len(dropped)
+    return files
+
+
+def _rebuild_path_index(workspace: str, store: MetaStore, index: PathIndex):
+    metas = store.load_all()
+    records = {key: list(iter_branch_files(workspace, key, meta)) for key, meta in metas.items() if _has_files(meta)}
+    index.rebuild(records, [key for key, meta in metas.items() if meta.get("head") and not _has_files(meta)])
+
+
+def _index_branch_files(workspace: str, store: MetaStore, branch_key: str, files: list[dict] | None):
+    index = get_path_index(workspace)
+    if not index.exists():
+        _rebuild_path_index(workspace, store, index)
+    if files is None:
+        index.mark_stale(branch_key)
+    else:
+        index.update(branch_key, files)
+
+
+def _complete_branch_files(workspace: str, store: MetaStore, branch_key: str):
+    data = store.get(branch_key)
+    if data is None:
+        get_path_index(workspace).remove_many([branch_key])
+        return
+    if _has_files(data):
+        _index_branch_files(workspace, store, branch_key, list(iter_branch_files(workspace, branch_key, data)))
+        return
+
+    _expand_overflow(workspace, branch_key, data)
+    if not _compute_branch_files(workspace, data):
+        data["files"] = []
+    files = data["files"]
+    _spill_overflow(workspace, branch_key, data, _meta_config(workspace))
+    _index_branch_files(workspace, store, branch_key, files)
+    store.put(branch_key, data)
+
+
+def load_path_index(workspace: str) -> PathIndex:
+    index = get_path_index(workspace)
+    if not index.exists() or index.stale():
+        with meta_lock(workspace):
+            store = get_meta_store(workspace)
+            if not index.exists():
+                _rebuild_path_index(workspace, store, index)
+            for branch_key in index.stale():
+                _complete_branch_files(workspace, store, branch_key)
+    return index
+
+
+def find_branches_touching(workspace: str, pattern: str) -> list[tuple[str, str, str, str]]:
+    return load_path_index(workspace).lookup(pattern)
+
 
 def load_branch_meta(workspace: str) -> dict:
-    return _load_meta(_get_meta_path(workspace))
+    return get_meta_store(workspace).load_all()
 
 
 def load_archived_meta(workspace: str) -> dict:
-    return _load_meta(_get_archived_meta_path(workspace))
+    return get_meta_store(workspace, archived=True).load_all()
+
+
+def select_branch_keys(workspace: str, author: str | None = None, newest_first: bool = False) -> list[str]:
+    return get_meta_store(workspace).select(author, newest_first)
 
 
 def get_branch_meta(workspace: str, branch_key: str) -> dict | None:
-    meta = load_branch_meta(workspace)
-    return meta.get(branch_key)
+    return get_meta_store(workspace).get(branch_key)
 
 
 def create_branch_meta(workspace: str, branch_key: str, branch: str):
-    meta = load_branch_meta(workspace)
-    now = datetime.now().isoformat()
-
-    if branch_key not in meta:
-        meta[branch_key] = {
-            "branch": branch,
-            "created_at": now,
-            "author": git_user_name(workspace),
-            "updated_at": now,
-            "last_commit": None,
-            "commits": "",
-            "changed_files": "",
-        }
-        _save_meta(_get_meta_path(workspace), meta)
-
-
-def update_branch_meta(workspace: str, branch_key: str, base_branch: str):
-    meta = load_branch_meta(workspace)
-    if branch_key not in meta:
-        return
-
-    now = datetime.now().isoformat()
-    commits = _get_commits_since_base(workspace, base_branch)
-    changed_files = _get_changed_files(workspace, base_branch)
-    last_commit = _get_last_commit(workspace)
+    author = git_user_name(workspace)
+    with meta_lock(workspace):
+        store = get_meta_store(workspace)
+        if store.get(branch_key) is not None:
+            return
+
+        now = datetime.now().isoformat()
+        store.put(
+            branch_key,
+            {
+                "branch": branch,
+                "created_at": now,
+                "author": author,
+                "updated_at": now,
+                "last_commit": None,
+                "commits": [],
+            },
+        )
 
-    meta[branch_key]["updated_at"] = now
-    meta[branch_key]["last_commit"] = last_commit
-    meta[branch_key]["commits"] = commits
-    meta[branch_key]["changed_files"] = changed_files
 
-    _save_meta(_get_meta_path(workspace), meta)
+def _sort_entries(entries: list[DiffEntry]) -> list[DiffEntry]:
+    return sorted(entries, key=lambda entry: path_sort_key(entry.path))
+
+
+def _store_branch_state(
+    data: dict,
+    commits: list[dict],
+    last_commit: dict | None,
+    entries: list[DiffEntry] | None,
+    head: str | None,
+    base_head: str | None,
+    merge_base: str | None,
+):
+    data["updated_at"] = datetime.now().isoformat()
+    data["last_commit"] = last_commit
+    data["commits"] = commits
+    data.pop("changed_files", None)
+    data["head"] = head
+    data["base_head"] = base_head
+    data["merge_base"] = merge_base
+    data["files"] = None if entries is None else [asdict(entry) for entry in entries]
+
+
+def _has_files(meta: dict) -> bool:
+    return meta.get("files") is not None or meta.get("changed_files") is not None
+
+
+def _compute_branch_state(workspace: str, data: dict, base_branch: str, with_files: bool = True):
+    head = git_resolve_commit(workspace, "HEAD")
+    base_head = git_resolve_commit(workspace, base_branch)
+    merge_base = git_merge_base(workspace, base_head, head) if head and base_head else None
+
+    commits, last_commit = _collect_commits(workspace, base_branch)
+    entries = (git_diff_entries(workspace, f"{base_branch}...HEAD") or []) if with_files else None
+
+    _store_branch_state(data, commits, last_commit, entries, head, base_head, merge_base)
+
+
+def _compute_branch_files(workspace: str, data: dict) -> bool:
+    head = data.get("head")
+    merge_base = data.get("merge_base")
+    entries = git_diff_entries(workspace, merge_base, head) if head and merge_base else None
+    if entries is None:
+        return False
+    data["files"] = [asdict(entry) for entry in entries]
+    return True
+
+
+def _touched_paths(entries: list[DiffEntry]) -> set[str]:
+    paths = {entry.path for entry in entries}
+    paths.update(entry.old_path for entry in entries if entry.old_path)
+    return paths
+
+
+def _advance_branch_state(workspace: str, data: dict, base_branch: str) -> bool:
+    stored_head = data.get("head")
+    merge_base = data.get("merge_base")
+    if not stored_head or not merge_base or not isinstance(data.get("commits"), list):
+        return False
+
+    base_head = git_resolve_commit(workspace, base_branch)
+    if not base_head or base_head != data.get("base_head"):
+        return False
+
+    head = git_resolve_commit(workspace, "HEAD")
+    if head == stored_head:
+        data["updated_at"] = datetime.now().isoformat()
+        return True
+
+    commit = _get_object_service(workspace).read_commit(head) if head else None
+    if commit is None or commit.parents != [stored_head]:
+        return False
+
+    entries = None
+    if data.get("files") is not None:
+        entries = _advance_branch_files(workspace, data, commit, merge_base)
+        if entries is None:
+            return False
+
+    commits = [_commit_record(commit.sha, commit.subject, commit.author_date)] + data["commits"]
+    last_commit = _format_last_commit(commit.sha, commit.subject, commit.author_date)
+
+    _store_branch_state(data, commits, last_commit, entries, head, base_head, merge_base)
+    return True
+
+
+def _advance_branch_files(workspace: str, data: dict, commit: CommitInfo, merge_base: str) -> list[DiffEntry] | None:
+    commit_cache = get_commit_cache(workspace)
+    delta = commit_cache.get_files(commit.sha)
+    if delta is None:
+        delta = git_diff_entries(workspace, data["head"], commit.sha)
+        if delta is None:
+            return None
+        commit_cache.put_files(commit.sha, delta)
+
+    entries = [DiffEntry(**entry) for entry in data["files"]]
+    affected = _touched_paths(delta)
+    if affected:
+        related = [entry for entry in entries if entry.path in affected or entry.old_path in affected]
+        affected |= _touched_paths(related)
+        if any(entry.status != "M" for entry in delta + related):
+            affected |= _touched_paths([entry for entry in entries if entry.status != "M"])
+        if len(affected) > INCREMENTAL_PATH_LIMIT:
+            return None
+
+        recomputed = git_diff_entries(workspace, merge_base, commit.sha, paths=sorted(affected))
+        if recomputed is None:
+            return None
+        kept = [entry for entry in entries if entry.path not in affected and entry.old_path not in affected]
+        entries = _sort_entries(kept + recomputed)
+    return entries
+
+
+def update_branch_meta(workspace: str, branch_key: str, base_branch: str, with_files: bool = True):
+    with meta_lock(workspace):
+        store = get_meta_store(workspace)
+        data = store.get(branch_key)
+        if data is None:
+            return
+
+        _compute_branch_state(workspace, data, base_branch, with_files)
+        _index_branch_files(workspace, store, branch_key, data["files"])
+        _spill_overflow(workspace, branch_key, data, _meta_config(workspace))
+        store.put(branch_key, data)
+        get_commit_cache(workspace).save()
+
+
+def advance_branch_meta(workspace: str, branch_key: str, base_branch: str, with_files: bool = True):
+    with meta_lock(workspace):
+        store = get_meta_store(workspace)
+        data = store.get(branch_key)
+        if data is None:
+            return
+
+        config = _meta_config(workspace)
+        if not with_files:
+            data.pop("files_total", None)
+            data["files"] = None
+        spilled = "commits_total" in data or "files_total" in data
+        files = None
+        if spilled and data.get("files") is not None:
+            files = _advance_overflow(workspace, branch_key, data, base_branch, config)
+        if files is None:
+            _expand_overflow(workspace, branch_key, data)
+            if not _advance_branch_state(workspace, data, base_branch):
+                _compute_branch_state(workspace, data, base_branch, with_files)
+            elif with_files and data.get("files") is None and not _compute_branch_files(workspace, data):
+                _compute_branch_state(workspace, data, base_branch)
+            files = data["files"]
+            _spill_overflow(workspace, branch_key, data, config)
+        _index_branch_files(workspace, store, branch_key, files)
+        store.put(branch_key, data)
+        get_commit_cache(workspace).save()
+
+
+def archive_branch_metas(workspace: str, branch_keys: list[str]) -> list[str]:
+    with meta_lock(workspace):
+        moved = get_meta_store(workspace).move_many(branch_keys, get_meta_store(workspace, archived=True))
+        get_overflow_store(workspace).move_many(moved, get_overflow_store(workspace, archived=True))
+        get_path_index(workspace).remove_many(moved)
+        delete_tag_manifests(workspace, branch_keys)
+    return moved
 
 
 def archive_branch_meta(workspace: str, branch_key: str):
-    meta = load_branch_meta(workspace)
-    if branch_key not in meta:
-        return
-
-    branch_data = meta.pop(branch_key)
-    _save_meta(_get_meta_path(workspace), meta)
-
-    archived = load_archived_meta(workspace)
-    archived[branch_key] = branch_data
-    _save_meta(_get_archived_meta_path(workspace), archived)
+    archive_branch_metas(workspace, [branch_key])
 
 
 def delete_branch_meta(workspace: str, branch_key: str):
-    meta = load_branch_meta(workspace)
-    if branch_key in meta:
-        del meta[branch_key]
-        _save_meta(_get_meta_path(workspace), meta)
+    with meta_lock(workspace):
+        get_meta_store(workspace).delete(branch_key)
+        get_overflow_store(workspace).delete(branch_key)
+        get_path_index(workspace).remove_many([branch_key])
+        delete_tag_manifests(workspace, [branch_key])
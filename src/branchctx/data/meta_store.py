@@ -0,0 +1,812 @@
+from __future__ import annotations
+
+import contextlib
+import fnmatch
+import hashlib
+import json
+import os
+import shutil
+import threading
+from typing import Iterable, Iterator, Protocol
+
+from branchctx.constants import (
+    META_DB_FILE,
+    META_FILE,
+    META_INDEX_FILE,
+    META_OVERFLOW_DIR,
+    META_PATH_BUCKETS_DIR,
+    META_PATHS_DIR,
+    META_PATHS_STALE_FILE,
+    META_SHARDS_DIR,
+    META_STORAGE_JSON,
+    META_STORAGE_SHARDED,
+    META_STORAGE_SQLITE,
+)
+from branchctx.utils.lock import FileLock
+
+SQLITE_TIMEOUT = 10.0
+SQLITE_SCHEMA_VERSION = 1
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS branches (
+    key TEXT PRIMARY KEY,
+    branch TEXT,
+    author TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS branches_updated_at ON branches (updated_at);
+CREATE INDEX IF NOT EXISTS branches_author ON branches (author);
+CREATE TABLE IF NOT EXISTS commits (
+    branch_key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    sha TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    date TEXT NOT NULL,
+    PRIMARY KEY (branch_key, position)
+);
+CREATE TABLE IF NOT EXISTS files (
+    branch_key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    path BLOB NOT NULL,
+    status TEXT NOT NULL,
+    old_path BLOB NOT NULL,
+    added TEXT NOT NULL,
+    removed TEXT NOT NULL,
+    PRIMARY KEY (branch_key, position)
+);
+CREATE INDEX IF NOT EXISTS files_path ON files (path);
+"""
+
+
+_sqlite_connections = threading.local()
+
+
+class MetaStore(Protocol):
+    def exists(self) -> bool: ...
+
+    def load_all(self) -> dict: ...
+
+    def get(self, key: str) -> dict | None: ...
+
+    def select(self, author: str | None = None, newest_first: bool = False) -> list[str]: ...
+
+    def put(self, key: str, record: dict): ...
+
+    def put_many(self, records: dict): ...
+
+    def delete(self, key: str) -> dict | None: ...
+
+    def delete_many(self, keys: list[str]) -> dict: ...
+
+    def move_many(self, keys: list[str], other: MetaStore) -> list[str]: ...
+
+    def clear(self): ...
+
+
+def path_sort_key(path: str) -> bytes:
+    return path.encode("utf-8", errors="surrogateescape")
+
+
+def _signature(stat: os.stat_result) -> tuple[int, int, int]:
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+class DocumentCache:
+    def __init__(self):
+        self._entries: dict[str, tuple[tuple[int, int, int], dict]] = {}
+
+    def read(self, path: str) -> dict | None:
+        try:
+            f = open(path)
+        except OSError:
+            self._entries.pop(path, None)
+            return None
+
+        with f:
+            signature = _signature(os.fstat(f.fileno()))
+            cached = self.cached(path, signature)
+            if cached is not None:
+                return cached
+            try:
+                data = json.load(f)
+            except ValueError:
+                data = None
+
+        if data is None:
+            self._entries.pop(path, None)
+            try:
+                os.replace(path, f"{path}.corrupt")
+            except OSError:
+                pass
+            return None
+
+        if not isinstance(data, dict):
+            return None
+        self._entries[path] = (signature, data)
+        return data
+
+    def cached(self, path: str, signature: tuple[int, int, int]) -> dict | None:
+        cached = self._entries.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        return None
+
+    def write(self, path: str, data: dict, indent: int | None = None) -> tuple[int, int, int]:
+        return self.write_text(path, json.dumps(data, indent=indent), data)
+
+    def write_text(self, path: str, text: str, data: dict) -> tuple[int, int, int]:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", newline="") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+                signature = _signature(os.fstat(f.fileno()))
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._entries[path] = (signature, data)
+        return signature
+
+    def forget(self, path: str):
+        self._entries.pop(path, None)
+
+
+_documents = DocumentCache()
+
+
+def _read_json(path: str) -> dict | None:
+    return _documents.read(path)
+
+
+def _write_json(path: str, data: dict, indent: int | None = None):
+    _documents.write(path, data, indent)
+
+
+def _move_records(store: MetaStore, keys: list[str], other: MetaStore) -> list[str]:
+    records = store.delete_many(keys)
+    if records:
+        other.put_many(records)
+    return list(records)
+
+
+def _select_keys(records: dict, author: str | None, newest_first: bool) -> list[str]:
+    keys = sorted(key for key, record in records.items() if author is None or record.get("author") == author)
+    if newest_first:
+        keys.sort(key=lambda key: records[key].get("updated_at") or "", reverse=True)
+    return keys
+
+
+def _encode_document(records: dict) -> tuple[str, dict]:
+    parts = ["{"]
+    offsets = {}
+    position = 1
+    for n, (key, record) in enumerate(records.items()):
+        prefix = f"{',' if n else ''}\n  {json.dumps(key)}: "
+        value = json.dumps(record, indent=2).replace("\n", "\n  ")
+        position += len(prefix)
+        offsets[key] = [position, position + len(value)]
+        position += len(value)
+        parts += [prefix, value]
+    parts.append("\n}" if records else "}")
+    return "".join(parts), offsets
+
+
+class JsonMetaStore:
+    def __init__(self, root: str):
+        self.path = os.path.join(root, META_FILE)
+        self.index_path = os.path.join(root, META_INDEX_FILE)
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def _document(self) -> dict:
+        return _read_json(self.path) or {}
+
+    def _save(self, data: dict):
+        text, offsets = _encode_document(data)
+        signature = _documents.write_text(self.path, text, data)
+        _write_json(self.index_path, {"signature": list(signature), "offsets": offsets})
+
+    def _lookup(self, key: str) -> tuple[bool, dict | None]:
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return True, None
+
+        with f:
+            signature = _signature(os.fstat(f.fileno()))
+            document = _documents.cached(self.path, signature)
+            if document is not None:
+                return True, document.get(key)
+
+            index = _read_json(self.index_path)
+            if not index or index.get("signature") != list(signature):
+                return False, None
+            span = index.get("offsets", {}).get(key)
+            if span is None:
+                return True, None
+
+            f.seek(span[0])
+            try:
+                record = json.loads(f.read(span[1] - span[0]))
+            except ValueError:
+                return False, None
+        return True, record if isinstance(record, dict) else None
+
+    def load_all(self) -> dict:
+        return {key: dict(record) for key, record in self._document().items()}
+
+    def get(self, key: str) -> dict | None:
+        found, record = self._lookup(key)
+        if not found:
+            record = self._document().get(key)
+        return dict(record) if record is not None else None
+
+    def select(self, author: str | None = None, newest_first: bool = False) -> list[str]:
+        return _select_keys(self._document(), author, newest_first)
+
+    def put(self, key: str, record: dict):
+        self.put_many({key: record})
+
+    def put_many(self, records: dict):
+        data = dict(self._document())
+        data.update((key, dict(record)) for key, record in records.items())
+        self._save(data)
+
+    def delete(self, key: str) -> dict | None:
+        return self.delete_many([key]).get(key)
+
+    def delete_many(self, keys: list[str]) -> dict:
+        data = dict(self._document())
+        removed = {key: dict(data.pop(key)) for key in keys if key in data}
+        if removed:
+            self._save(data)
+        return removed
+
+    def move_many(self, keys: list[str], other: MetaStore) -> list[str]:
+        return _move_records(self, keys, other)
+
+    def clear(self):
+        for path in (self.path, self.index_path):
+            _documents.forget(path)
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class ShardedMetaStore:
+    def __init__(self, root: str):
+        self.directory = os.path.join(root, META_SHARDS_DIR)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def exists(self) -> bool:
+        return os.path.isdir(self.directory)
+
+    def keys(self) -> list[str]:
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        return [name[:-5] for name in names if name.endswith(".json")]
+
+    def load_all(self) -> dict:
+        data = {}
+        for key in sorted(self.keys()):
+            record = _read_json(self._path(key))
+            if record is not None:
+                data[key] = dict(record)
+        return data
+
+    def get(self, key: str) -> dict | None:
+        record = _read_json(self._path(key))
+        return dict(record) if record is not None else None
+
+    def select(self, author: str | None = None, newest_first: bool = False) -> list[str]:
+        records = {}
+        for key in self.keys():
+            record = _read_json(self._path(key))
+            if record is not None:
+                records[key] = record
+        return _select_keys(records, author, newest_first)
+
+    def put(self, key: str, record: dict):
+        _write_json(self._path(key), dict(record))
+
+    def put_many(self, records: dict):
+        for key, record in records.items():
+            self.put(key, record)
+
+    def delete(self, key: str) -> dict | None:
+        record = self.get(key)
+        _documents.forget(self._path(key))
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+        return record
+
+    def delete_many(self, keys: list[str]) -> dict:
+        removed = {}
+        for key in keys:
+            record = self.delete(key)
+            if record is not None:
+                removed[key] = record
+        return removed
+
+    def move_many(self, keys: list[str], other: MetaStore) -> list[str]:
+        if not isinstance(other, ShardedMetaStore):
+            return _move_records(self, keys, other)
+
+        moved = []
+        os.makedirs(other.directory, exist_ok=True)
+        for key in keys:
+            try:
+                os.replace(self._path(key), other._path(key))
+            except OSError:
+                continue
+            _documents.forget(self._path(key))
+            moved.append(key)
+        return moved
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def _encode_path(path: str) -> bytes:
+    return path.encode("utf-8", errors="surrogateescape")
+
+
+def _decode_path(path: bytes) -> str:
+    return bytes(path).decode("utf-8", errors="surrogateescape")
+
+
+class SqliteMetaStore:
+    def __init__(self, root: str):
+        self.path = os.path.join(root, META_DB_FILE)
+
+    def _connect(self):
+        connections = _sqlite_connections.__dict__.setdefault("connections", {})
+        try:
+            inode = os.stat(self.path).st_ino
+        except OSError:
+            inode = None
+
+        cached = connections.get(self.path)
+        if cached is not None:
+            if cached[0] == inode:
+                return cached[1]
+            cached[1].close()
+
+        import sqlite3
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=SQLITE_TIMEOUT)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SQLITE_SCHEMA_VERSION:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SQLITE_SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SQLITE_SCHEMA_VERSION}")
+        connections[self.path] = (os.stat(self.path).st_ino, conn)
+        return conn
+
+    def close(self):
+        cached = _sqlite_connections.__dict__.get("connections", {}).pop(self.path, None)
+        if cached is not None:
+            cached[1].close()
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def _record(self, key: str, data: str) -> dict:
+        conn = self._connect()
+        record = json.loads(data)
+        if "commits" not in record:
+            record["commits"] = [
+                {"sha": sha, "subject": subject, "date": date}
+                for sha, subject, date in conn.execute(
+                    "SELECT sha, subject, date FROM commits WHERE branch_key = ? ORDER BY position", (key,)
+                )
+            ]
+        if record.pop("has_files", False):
+            record["files"] = [
+                {
+                    "status": status,
+                    "path": _decode_path(path),
+                    "old_path": _decode_path(old_path),
+                    "added": added,
+                    "removed": removed,
+                }
+                for status, path, old_path, added, removed in conn.execute(
+                    "SELECT status, path, old_path, added, removed FROM files WHERE branch_key = ? ORDER BY position",
+                    (key,),
+                )
+            ]
+        return record
+
+    def load_all(self) -> dict:
+        if not self.exists():
+            return {}
+        rows = self._connect().execute("SELECT key, data FROM branches ORDER BY key").fetchall()
+        return {key: self._record(key, data) for key, data in rows}
+
+    def get(self, key: str) -> dict | None:
+        if not self.exists():
+            return None
+        row = self._connect().execute("SELECT data FROM branches WHERE key = ?", (key,)).fetchone()
+        return self._record(key, row[0]) if row else None
+
+    def select(self, author: str | None = None, newest_first: bool = False) -> list[str]:
+        if not self.exists():
+            return []
+        query = "SELECT key FROM branches"
+        params: tuple = ()
+        if author is not None:
+            query += " WHERE author = ?"
+            params = (author,)
+        query += " ORDER BY updated_at DESC, key" if newest_first else " ORDER BY key"
+        return [row[0] for row in self._connect().execute(query, params)]
+
+    def _write(self, conn, key: str, record: dict):
+        commits = record.get("commits")
+        structured = isinstance(commits, list)
+        data = {k: v for k, v in record.items() if k != "files" and not (k == "commits" and structured)}
+        files = record.get("files")
+        if files is not None:
+            data["has_files"] = True
+
+        conn.execute(
+            "INSERT OR REPLACE INTO branches (key, branch, author, created_at, updated_at, data) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                key,
+                record.get("branch"),
+                record.get("author"),
+                record.get("created_at"),
+                record.get("updated_at"),
+                json.dumps(data),
+            ),
+        )
+        conn.execute("DELETE FROM commits WHERE branch_key = ?", (key,))
+        conn.execute("DELETE FROM files WHERE branch_key = ?", (key,))
+
+        conn.executemany(
+            "INSERT INTO commits (branch_key, position, sha, subject, date) VALUES (?, ?, ?, ?, ?)",
+            [(key, n, c["sha"], c["subject"], c["date"]) for n, c in enumerate(commits if structured else [])],
+        )
+        conn.executemany(
+            "INSERT INTO files (branch_key, position, path, status, old_path, added, removed) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    key,
+                    n,
+                    _encode_path(entry["path"]),
+                    entry["status"],
+                    _encode_path(entry["old_path"]),
+                    entry["added"],
+                    entry["removed"],
+                )
+                for n, entry in enumerate(files or [])
+            ],
+        )
+
+    def put(self, key: str, record: dict):
+        self.put_many({key: record})
+
+    def put_many(self, records: dict):
+        conn = self._connect()
+        with conn:
+            for key, record in records.items():
+                self._write(conn, key, record)
+
+    def delete(self, key: str) -> dict | None:
+        return self.delete_many([key]).get(key)
+
+    def delete_many(self, keys: list[str]) -> dict:
+        removed = {}
+        for key in keys:
+            record = self.get(key)
+            if record is not None:
+                removed[key] = record
+        if not removed:
+            return removed
+
+        conn = self._connect()
+        params = [(key,) for key in removed]
+        with conn:
+            conn.executemany("DELETE FROM branches WHERE key = ?", params)
+            conn.executemany("DELETE FROM commits WHERE branch_key = ?", params)
+            conn.executemany("DELETE FROM files WHERE branch_key = ?", params)
+        return removed
+
+    def move_many(self, keys: list[str], other: MetaStore) -> list[str]:
+        return _move_records(self, keys, other)
+
+    def clear(self):
+        self.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+
+class OverflowStore:
+    def __init__(self, root: str):
+        self.directory = os.path.join(root, META_OVERFLOW_DIR)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.jsonl")
+
+    def _write_lines(self, path: str, mode: str, commits: list[dict], files: list[dict], dropped: list[str]):
+        with open(path, mode) as f:
+            for commit in reversed(commits):
+                f.write(json.dumps({"commit": commit}) + "\n")
+            for entry in files:
+                f.write(json.dumps({"file": entry}) + "\n")
+            for dropped_path in dropped:
+                f.write(json.dumps({"drop": dropped_path}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def write(self, key: str, commits: list[dict], files: list[dict]):
+        path = self._path(key)
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            self._write_lines(tmp_path, "w", commits, files, [])
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def append(self, key: str, commits: list[dict], files: list[dict], dropped: list[str]):
+        if commits or files or dropped:
+            self._write_lines(self._path(key), "a", commits, files, dropped)
+
+    def _lines(self, key: str) -> Iterator[str]:
+        try:
+            with open(self._path(key)) as f:
+                yield from f
+        except OSError:
+            return
+
+    def stream(self, key: str, kind: str) -> Iterator[dict]:
+        if kind == "commit":
+            commits = [json.loads(line)["commit"] for line in self._lines(key) if line.startswith('{"commit":')]
+            yield from reversed(commits)
+            return
+
+        files: dict[str, dict] = {}
+        ordered = True
+        last = b""
+        for line in self._lines(key):
+            if line.startswith('{"file":'):
+                entry = json.loads(line)["file"]
+                if entry["path"] not in files:
+                    sort_key = path_sort_key(entry["path"])
+                    ordered = ordered and sort_key >= last
+                    last = sort_key
+                files[entry["path"]] = entry
+            elif line.startswith('{"drop":'):
+                files.pop(json.loads(line)["drop"], None)
+        if ordered:
+            yield from files.values()
+        else:
+            yield from sorted(files.values(), key=lambda entry: path_sort_key(entry["path"]))
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def move_many(self, keys: list[str], other: OverflowStore):
+        if not os.path.isdir(self.directory):
+            return
+        os.makedirs(other.directory, exist_ok=True)
+        for key in keys:
+            try:
+                os.replace(self._path(key), other._path(key))
+            except FileNotFoundError:
+                continue
+
+
+def _path_counts(entries: Iterable[dict]) -> dict:
+    counts = {}
+    for entry in entries:
+        counts[entry["path"]] = [entry["added"], entry["removed"]]
+        if entry.get("old_path"):
+            counts.setdefault(entry["old_path"], ["0", "0"])
+    return counts
+
+
+class PathIndex:
+    def __init__(self, root: str):
+        self.directory = os.path.join(root, META_PATHS_DIR)
+        self.buckets = os.path.join(self.directory, META_PATH_BUCKETS_DIR)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _bucket_path(self, path: str) -> str:
+        return os.path.join(self.buckets, f"{hashlib.sha1(path_sort_key(path)).hexdigest()[:2]}.json")
+
+    def _stale_path(self) -> str:
+        return os.path.join(self.directory, META_PATHS_STALE_FILE)
+
+    def exists(self) -> bool:
+        return os.path.isdir(self.buckets)
+
+    def stale(self) -> list[str]:
+        return sorted(_read_json(self._stale_path()) or {})
+
+    def mark_stale(self, key: str):
+        stale = _read_json(self._stale_path()) or {}
+        if key not in stale:
+            _write_json(self._stale_path(), {**stale, key: True})
+
+    def _clear_stale(self, keys: list[str]):
+        stale = _read_json(self._stale_path()) or {}
+        if not any(key in stale for key in keys):
+            return
+        remaining = {key: value for key, value in stale.items() if key not in keys}
+        if remaining:
+            _write_json(self._stale_path(), remaining)
+            return
+        _documents.forget(self._stale_path())
+        try:
+            os.remove(self._stale_path())
+        except OSError:
+            pass
+
+    def keys(self) -> list[str]:
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        return [name[:-5] for name in names if name.endswith(".json")]
+
+    def rebuild(self, records: dict[str, Iterable[dict]], stale: Iterable[str] = ()):
+        tmp_directory = f"{self.directory}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_directory, ignore_errors=True)
+        os.makedirs(os.path.join(tmp_directory, META_PATH_BUCKETS_DIR))
+        try:
+            buckets: dict[str, dict] = {}
+            for key, entries in records.items():
+                counts = _path_counts(entries)
+                if counts:
+                    _write_json(os.path.join(tmp_directory, f"{key}.json"), counts)
+                for path, value in counts.items():
+                    buckets.setdefault(self._bucket_path(path), {}).setdefault(path, {})[key] = value
+            for bucket_path, bucket in buckets.items():
+                _write_json(os.path.join(tmp_directory, os.path.relpath(bucket_path, self.directory)), bucket)
+            stale_keys = {key: True for key in stale}
+            if stale_keys:
+                _write_json(os.path.join(tmp_directory, META_PATHS_STALE_FILE), stale_keys)
+            shutil.rmtree(self.directory, ignore_errors=True)
+            os.replace(tmp_directory, self.directory)
+        finally:
+            shutil.rmtree(tmp_directory, ignore_errors=True)
+
+    def update(self, key: str, entries: Iterable[dict]):
+        self._clear_stale([key])
+        counts = _path_counts(entries)
+        previous = _read_json(self._path(key)) or {}
+        if previous == counts:
+            return
+        self._update_buckets({key: (previous, counts)})
+        if counts:
+            _write_json(self._path(key), counts)
+        else:
+            self._remove_file(key)
+
+    def remove_many(self, keys: list[str]):
+        self._clear_stale(keys)
+        self._update_buckets({key: (_read_json(self._path(key)) or {}, {}) for key in keys})
+        for key in keys:
+            self._remove_file(key)
+
+    def _remove_file(self, key: str):
+        _documents.forget(self._path(key))
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _update_buckets(self, changes: dict[str, tuple[dict, dict]]):
+        changed: dict[str, dict[str, dict]] = {}
+        for key, (previous, counts) in changes.items():
+            for path in previous.keys() | counts.keys():
+                if previous.get(path) != counts.get(path):
+                    changed.setdefault(self._bucket_path(path), {}).setdefault(path, {})[key] = counts.get(path)
+        if not changed or not self.exists():
+            return
+
+        for bucket_path, paths in changed.items():
+            bucket = dict(_read_json(bucket_path) or {})
+            for path, values in paths.items():
+                keys = dict(bucket.get(path, {}))
+                for key, value in values.items():
+                    if value is None:
+                        keys.pop(key, None)
+                    else:
+                        keys[key] = value
+                if keys:
+                    bucket[path] = keys
+                else:
+                    bucket.pop(path, None)
+            if bucket:
+                _write_json(bucket_path, bucket)
+            else:
+                _documents.forget(bucket_path)
+                try:
+                    os.remove(bucket_path)
+                except OSError:
+                    pass
+
+    def _read_buckets(self) -> dict[str, dict]:
+        try:
+            names = sorted(os.listdir(self.buckets))
+        except OSError:
+            return {}
+        paths: dict[str, dict] = {}
+        for name in names:
+            if name.endswith(".json"):
+                paths.update(_read_json(os.path.join(self.buckets, name)) or {})
+        return paths
+
+    def branches(self) -> dict:
+        branches = {}
+        for key in sorted(self.keys()):
+            counts = _read_json(self._path(key))
+            if counts:
+                branches[key] = counts
+        return branches
+
+    def lookup(self, pattern: str) -> list[tuple[str, str, str, str]]:
+        if any(char in pattern for char in "*?["):
+            paths = self._read_buckets()
+            matched = fnmatch.filter(paths, pattern)
+        else:
+            paths = _read_json(self._bucket_path(pattern)) or {}
+            if pattern in paths:
+                matched = [pattern]
+            else:
+                paths = self._read_buckets()
+                prefix = pattern.rstrip("/") + "/"
+                matched = [path for path in paths if path.startswith(prefix)]
+
+        results = []
+        for path in sorted(matched):
+            for key, (added, removed) in sorted(paths[path].items()):
+                results.append((key, path, added, removed))
+        return results
+
+
+STORES = {
+    META_STORAGE_SHARDED: ShardedMetaStore,
+    META_STORAGE_JSON: JsonMetaStore,
+    META_STORAGE_SQLITE: SqliteMetaStore,
+}
+
+
+def open_meta_store(root: str, storage: str, lock: FileLock | None = None) -> MetaStore:
+    store = STORES.get(storage, ShardedMetaStore)(root)
+    others = [other_cls(root) for other_cls in STORES.values() if other_cls is not type(store)]
+    others = [other for other in others if other.exists()]
+    if not others:
+        return store
+
+    with lock or contextlib.nullcontext():
+        for other in others:
+            if not other.exists():
+                continue
+            records = {key: record for key, record in other.load_all().items() if store.get(key) is None}
+            if records:
+                store.put_many(records)
+            other.clear()
+    return store
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import json
+import os
+
+from branchctx.constants import CONTEXT_FILE_EXTENSIONS, TAG_MANIFEST_DIR
+from branchctx.data.config import get_branches_dir
+
+
+def get_tag_manifest_path(workspace: str, branch_key: str) -> str:
+    return os.path.join(get_branches_dir(workspace), TAG_MANIFEST_DIR, f"{branch_key}.json")
+
+
+def delete_tag_manifests(workspace: str, branch_keys: list[str]):
+    for branch_key in branch_keys:
+        try:
+            os.remove(get_tag_manifest_path(workspace, branch_key))
+        except FileNotFoundError:
+            pass
+
+
+def _dir_signature(stat: os.stat_result) -> list[int]:
+    return [stat.st_mtime_ns, stat.st_ino]
+
+
+def _file_signature(stat: os.stat_result) -> list[int]:
+    return [stat.st_mtime_ns, stat.st_size, stat.st_ino]
+
+
+class TagManifest:
+    def __init__(self, workspace: str, branch_key: str):
+        self.path = get_tag_manifest_path(workspace, branch_key)
+        self.digest: str | None = None
+        self.dirs: dict[str, dict] = {}
+        self.files: dict[str, dict] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict):
+            self.digest = data.get("digest")
+            self.dirs = data.get("dirs") or {}
+            self.files = data.get("files") or {}
+
+    def is_current(self, context_dir: str, digest: str) -> bool:
+        if self.digest != digest or "" not in self.dirs:
+            return False
+        try:
+            return self.dirs[""]["signature"] == _dir_signature(os.stat(context_dir))
+        except OSError:
+            return False
+
+    def set_digest(self, digest: str):
+        if self.digest != digest:
+            self.digest = digest
+            self._dirty = True
+
+    def _list_dir(self, path: str, rel: str) -> tuple[list[str], list[str]] | None:
+        try:
+            signature = _dir_signature(os.stat(path))
+        except OSError:
+            return None
+
+        known = self.dirs.get(rel)
+        if known is not None and known["signature"] == signature:
+            return known["dirs"], known["files"]
+
+        dirs = []
+        files = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.name)
+                    elif entry.name.endswith(CONTEXT_FILE_EXTENSIONS):
+                        files.append(entry.name)
+        except OSError:
+            return None
+
+        self.dirs[rel] = {"signature": signature, "dirs": sorted(dirs), "files": sorted(files)}
+        self._dirty = True
+        return self.dirs[rel]["dirs"], self.dirs[rel]["files"]
+
+    def list_files(self, context_dir: str) -> list[str]:
+        seen_dirs = set()
+        files = []
+        pending = [""]
+        while pending:
+            rel = pending.pop()
+            listing = self._list_dir(os.path.join(context_dir, rel) if rel else context_dir, rel)
+            if listing is None:
+                continue
+            seen_dirs.add(rel)
+            subdirs, names = listing
+            pending.extend(os.path.join(rel, name) for name in subdirs)
+            files.extend(os.path.join(rel, name) for name in names)
+
+        for rel in set(self.dirs) - seen_dirs:
+            del self.dirs[rel]
+            self._dirty = True
+        for rel in set(self.files) - set(files):
+            del self.files[rel]
+            self._dirty = True
+        return sorted(files)
+
+    def needs_scan(self, rel: str, stat: os.stat_result) -> bool:
+        known = self.files.get(rel)
+        return known is None or known["tags"] or known["signature"] != _file_signature(stat)
+
+    def used_tags(self) -> set[str] | None:
+        if not self.files:
+            return None
+        return {tag for entry in self.files.values() for tag in entry["tags"]}
+
+    def record(self, rel: str, stat: os.stat_result, tags: list[str]):
+        entry = {"signature": _file_signature(stat), "tags": tags}
+        if self.files.get(rel) != entry:
+            self.files[rel] = entry
+            self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({"digest": self.digest, "dirs": self.dirs, "files": self.files}, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self._dirty = False
@@ -1,7 +1,15 @@
 from __future__ import annotations
 
+import atexit
+import heapq
+import os
 import subprocess
-from typing import Literal
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Literal, Protocol
+
+from branchctx.utils import git_native
+from branchctx.utils.git_native import UnsupportedLayout
 
 
 def git_init(path: str, branch: str | None = None) -> subprocess.CompletedProcess:
@@ -32,6 +40,11 @@ def git_checkout(path: str, branch: str, create: bool = False) -> subprocess.Com
 
 
 def git_current_branch(path: str) -> str | None:
+    try:
+        return git_native.current_branch(path)
+    except UnsupportedLayout:
+        pass
+
     result = subprocess.run(
         ["git", "rev-parse", "--abbrev-ref", "HEAD"],
         cwd=path,
@@ -54,6 +67,11 @@ def git_current_branch(path: str) -> str | None:
 
 
 def git_root(path: str) -> str | None:
+    try:
+        return git_native.toplevel(path)
+    except UnsupportedLayout:
+        pass
+
     try:
         result = subprocess.run(
             ["git", "rev-parse", "--show-toplevel"],
@@ -67,7 +85,41 @@ def git_root(path: str) -> str | None:
         return None
 
 
+def git_dir(path: str) -> str | None:
+    try:
+        return git_native.git_dir(path)
+    except UnsupportedLayout:
+        pass
+
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--absolute-git-dir"],
+            cwd=path,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return result.stdout.strip()
+    except subprocess.CalledProcessError:
+        return None
+
+
+SEQUENCER_STATE_PATHS = ("rebase-merge", "rebase-apply", "sequencer")
+
+
+def git_sequencer_in_progress(path: str) -> bool:
+    directory = git_dir(path)
+    if directory is None:
+        return False
+    return any(os.path.exists(os.path.join(directory, name)) for name in SEQUENCER_STATE_PATHS)
+
+
 def git_config_get(key: str, scope: Literal["global"] | None = None, path: str | None = None) -> str | None:
+    try:
+        return git_native.config_value(key, scope=scope, path=path)
+    except UnsupportedLayout:
+        pass
+
     cmd = ["git", "config"]
     if scope == "global":
         cmd.append("--global")
@@ -96,6 +148,11 @@ def git_config_unset(key: str, scope: Literal["global"] | None = None) -> bool:
 
 
 def git_list_branches(path: str) -> list[str]:
+    try:
+        return git_native.local_branches(path)
+    except UnsupportedLayout:
+        pass
+
     try:
         result = subprocess.run(
             ["git", "branch", "--format=%(refname:short)"],
@@ -110,6 +167,11 @@ def git_list_branches(path: str) -> list[str]:
 
 
 def git_hooks_path(path: str) -> str | None:
+    try:
+        return git_native.config_value("core.hooksPath", path=path)
+    except UnsupportedLayout:
+        pass
+
     try:
         result = subprocess.run(
             ["git", "config", "--get", "core.hooksPath"],
@@ -143,3 +205,480 @@ def git_info_exclude_add(path: str, pattern: str) -> bool:
         return True
     except (OSError, IOError):
         return False
+
+
+@dataclass
+class CommitInfo:
+    sha: str
+    parents: list[str]
+    commit_time: int
+    author: str
+    author_date: str
+    subject: str
+
+
+def _format_git_date(timestamp: str, tz: str) -> str:
+    offset = timedelta(hours=int(tz[1:3]), minutes=int(tz[3:5]))
+    if tz.startswith("-"):
+        offset = -offset
+    return datetime.fromtimestamp(int(timestamp), timezone(offset)).isoformat()
+
+
+def _split_ident(ident: str) -> tuple[str, str, str]:
+    name, _, rest = ident.partition(" <")
+    _, _, date = rest.partition("> ")
+    timestamp, _, tz = date.partition(" ")
+    return name, timestamp, tz
+
+
+def _parse_commit(sha: str, data: bytes) -> CommitInfo:
+    header, _, message = data.partition(b"\n\n")
+    parents: list[str] = []
+    author = ""
+    author_date = ""
+    commit_time = 0
+    encoding = "utf-8"
+
+    for line in header.decode("utf-8", errors="replace").split("\n"):
+        key, _, value = line.partition(" ")
+        if key == "parent":
+            parents.append(value)
+        elif key == "author":
+            author, timestamp, tz = _split_ident(value)
+            author_date = _format_git_date(timestamp, tz)
+        elif key == "committer":
+            commit_time = int(_split_ident(value)[1])
+        elif key == "encoding":
+            encoding = value
+
+    try:
+        text = message.decode(encoding, errors="replace")
+    except LookupError:
+        text = message.decode("utf-8", errors="replace")
+
+    subject_lines: list[str] = []
+    for line in text.lstrip("\n").split("\n"):
+        if not line.strip():
+            break
+        subject_lines.append(line.rstrip())
+
+    return CommitInfo(
+        sha=sha,
+        parents=parents,
+        commit_time=commit_time,
+        author=author,
+        author_date=author_date,
+        subject=" ".join(subject_lines),
+    )
+
+
+class CommitStore(Protocol):
+    def get(self, sha: str) -> CommitInfo | None: ...
+
+    def put(self, commit: CommitInfo): ...
+
+
+class GitObjectService:
+    def __init__(self, path: str, store: CommitStore | None = None):
+        self.path = path
+        self.store = store
+        self._process: subprocess.Popen | None = None
+        self._commits: dict[str, CommitInfo] = {}
+        self._transient: set[str] = set()
+        self._abbrevs: dict[tuple[str, int], str] = {}
+
+    def _ensure_process(self) -> subprocess.Popen:
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                cwd=self.path,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        return self._process
+
+    def read_object(self, name: str) -> tuple[str, str, bytes] | None:
+        process = self._ensure_process()
+        assert process.stdin is not None and process.stdout is not None
+        try:
+            process.stdin.write(name.encode() + b"\n")
+            process.stdin.flush()
+            header = process.stdout.readline().decode().split()
+        except (BrokenPipeError, OSError):
+            self.close()
+            return None
+
+        if len(header) != 3:
+            return None
+
+        sha, obj_type, size = header
+        data = process.stdout.read(int(size) + 1)[:-1]
+        return sha, obj_type, data
+
+    def read_commit(self, sha: str, persist: bool = True) -> CommitInfo | None:
+        if sha in self._commits:
+            return self._commits[sha]
+
+        if self.store is not None:
+            cached = self.store.get(sha)
+            if cached is not None:
+                self._commits[sha] = cached
+                return cached
+
+        obj = self.read_object(sha)
+        while obj is not None and obj[1] == "tag":
+            target = obj[2].split(b"\n", 1)[0]
+            if not target.startswith(b"object "):
+                return None
+            obj = self.read_object(target[7:].decode())
+
+        if obj is None or obj[1] != "commit":
+            return None
+
+        commit = _parse_commit(obj[0], obj[2])
+        self._commits[sha] = commit
+        self._commits[commit.sha] = commit
+        if not persist:
+            self._transient.add(commit.sha)
+        elif self.store is not None and sha == commit.sha:
+            self.store.put(commit)
+        return commit
+
+    def attach_store(self, store: CommitStore):
+        if store is self.store:
+            return
+        self.store = store
+        for sha, commit in self._commits.items():
+            if sha == commit.sha and sha not in self._transient:
+                store.put(commit)
+
+    def abbreviate(self, sha: str, length: int) -> str:
+        key = (sha, length)
+        if key in self._abbrevs:
+            return self._abbrevs[key]
+
+        while length < len(sha):
+            prefix = sha[:length]
+            obj = self.read_object(prefix)
+            if obj is not None:
+                break
+            length += 1
+
+        self._abbrevs[key] = sha[:length]
+        return self._abbrevs[key]
+
+    def clear_abbrevs(self):
+        self._abbrevs.clear()
+
+    def close(self):
+        if self._process is not None:
+            if self._process.stdin:
+                self._process.stdin.close()
+            self._process.wait()
+            self._process = None
+
+
+_object_services: dict[str, GitObjectService] = {}
+
+
+def get_object_service(path: str, store: CommitStore | None = None) -> GitObjectService:
+    if path not in _object_services:
+        _object_services[path] = GitObjectService(path)
+    service = _object_services[path]
+    if store is not None:
+        service.attach_store(store)
+    return service
+
+
+def clear_abbrevs():
+    for service in _object_services.values():
+        service.clear_abbrevs()
+
+
+@atexit.register
+def _close_object_services():
+    for service in _object_services.values():
+        service.close()
+    _object_services.clear()
+
+
+def git_resolve_commit(path: str, name: str) -> str | None:
+    try:
+        sha = git_native.resolve_name(path, name)
+    except UnsupportedLayout:
+        try:
+            result = subprocess.run(
+                ["git", "rev-parse", "--verify", "--quiet", f"{name}^{{commit}}"],
+                cwd=path,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            return result.stdout.strip()
+        except subprocess.CalledProcessError:
+            return None
+
+    if sha is None:
+        return None
+    commit = get_object_service(path).read_commit(sha)
+    return commit.sha if commit else None
+
+
+_SEEN = 1
+_UNINTERESTING = 2
+_WALK_SLOP = 5
+_WALK_UNINTERESTING_LIMIT = 1000
+
+
+def git_walk_range(path: str, exclude: str, include: str) -> list[CommitInfo] | None:
+    service = get_object_service(path)
+    flags: dict[str, int] = {}
+    parsed: dict[str, CommitInfo] = {}
+    queue: list[tuple[int, int, str]] = []
+    counter = 0
+    uninteresting = 0
+
+    def load(sha: str) -> CommitInfo | None:
+        if sha not in parsed:
+            commit = service.read_commit(sha, persist=not flags.get(sha, 0) & _UNINTERESTING)
+            if commit is None:
+                return None
+            parsed[sha] = commit
+        return parsed[sha]
+
+    def push(sha: str) -> bool:
+        nonlocal counter
+        commit = load(sha)
+        if commit is None:
+            return False
+        heapq.heappush(queue, (-commit.commit_time, counter, sha))
+        counter += 1
+        return True
+
+    def mark_parents_uninteresting(commit: CommitInfo):
+        pending = list(commit.parents)
+        while pending:
+            sha = pending.pop()
+            if flags.get(sha, 0) & _UNINTERESTING:
+                continue
+            flags[sha] = flags.get(sha, 0) | _UNINTERESTING
+            if sha in parsed:
+                pending.extend(parsed[sha].parents)
+
+    for sha, initial in ((exclude, _UNINTERESTING), (include, 0)):
+        flags[sha] = flags.get(sha, 0) | initial
+        if not flags[sha] & _SEEN:
+            flags[sha] |= _SEEN
+            if not push(sha):
+                return None
+
+    newlist: list[str] = []
+    date = float("inf")
+    slop = _WALK_SLOP
+
+    while queue:
+        _, _, sha = heapq.heappop(queue)
+        commit = parsed[sha]
+
+        if flags[sha] & _UNINTERESTING:
+            uninteresting += 1
+            if uninteresting > _WALK_UNINTERESTING_LIMIT:
+                return None
+            for parent in commit.parents:
+                flags[parent] = flags.get(parent, 0) | _UNINTERESTING
+                parent_commit = load(parent)
+                if parent_commit is None:
+                    return None
+                mark_parents_uninteresting(parent_commit)
+                if flags[parent] & _SEEN:
+                    continue
+                flags[parent] |= _SEEN
+                push(parent)
+            mark_parents_uninteresting(commit)
+
+            if not queue:
+                slop = 0
+            elif date <= -queue[0][0] or any(not flags[s] & _UNINTERESTING for _, _, s in queue):
+                slop = _WALK_SLOP
+            else:
+                slop -= 1
+            if slop:
+                continue
+            break
+
+        for parent in commit.parents:
+            if flags.get(parent, 0) & _SEEN:
+                continue
+            flags[parent] = flags.get(parent, 0) | _SEEN
+            if not push(parent):
+                return None
+
+        date = commit.commit_time
+        newlist.append(sha)
+
+    return [parsed[sha] for sha in newlist if not flags[sha] & _UNINTERESTING]
+
+
+def git_abbrev_length(path: str) -> int | None:
+    try:
+        return git_native.default_abbrev_length(path)
+    except UnsupportedLayout:
+        return None
+
+
+def git_log_range(path: str, base: str, head: str = "HEAD") -> list[CommitInfo] | None:
+    try:
+        git_native.check_history_layout(path)
+    except UnsupportedLayout:
+        return None
+
+    base_sha = git_resolve_commit(path, base)
+    head_sha = git_resolve_commit(path, head)
+    if not base_sha or not head_sha:
+        return []
+    return git_walk_range(path, base_sha, head_sha)
+
+
+def git_log_authors(path: str, base: str, head: str = "HEAD") -> list[str]:
+    commits = git_log_range(path, base, head)
+    if commits is not None:
+        return [commit.author for commit in commits]
+
+    try:
+        result = subprocess.run(
+            ["git", "log", "--format=%an", f"{base}..{head}"],
+            cwd=path,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except subprocess.CalledProcessError:
+        return []
+    return [line for line in result.stdout.splitlines() if line]
+
+
+def git_ahead_behind(path: str, base: str, head: str = "HEAD") -> tuple[int, int] | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-list", "--left-right", "--count", f"{base}...{head}"],
+            cwd=path,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except subprocess.CalledProcessError:
+        return None
+
+    behind, _, ahead = result.stdout.strip().partition("\t")
+    try:
+        return int(ahead), int(behind)
+    except ValueError:
+        return None
+
+
+@dataclass
+class DiffEntry:
+    status: str
+    path: str
+    old_path: str
+    added: str
+    removed: str
+
+
+_QUOTE_ESCAPES = {
+    7: b"\\a",
+    8: b"\\b",
+    9: b"\\t",
+    10: b"\\n",
+    11: b"\\v",
+    12: b"\\f",
+    13: b"\\r",
+    34: b'\\"',
+    92: b"\\\\",
+}
+
+
+def git_quote_path(path: str, quote_high: bool = True) -> str:
+    raw = path.encode("utf-8", errors="surrogateescape")
+    if not any(b < 0x20 or b in (0x22, 0x5C, 0x7F) or (quote_high and b >= 0x80) for b in raw):
+        return path
+
+    out = bytearray(b'"')
+    for b in raw:
+        if b in _QUOTE_ESCAPES:
+            out += _QUOTE_ESCAPES[b]
+        elif b < 0x20 or b == 0x7F or (quote_high and b >= 0x80):
+            out += f"\\{b:03o}".encode()
+        else:
+            out.append(b)
+    out += b'"'
+    return out.decode("utf-8", errors="replace")
+
+
+def git_quote_path_enabled(path: str) -> bool:
+    value = git_config_get("core.quotePath", path=path)
+    return value is None or value.lower() not in ("false", "no", "off", "0")
+
+
+def _decode_path(raw: bytes) -> str:
+    return raw.decode("utf-8", errors="surrogateescape")
+
+
+def _parse_diff_entries(output: bytes) -> list[DiffEntry]:
+    tokens = output.split(b"\0")
+    raw_entries: list[tuple[str, str, str]] = []
+    stats: dict[str, tuple[str, str]] = {}
+
+    i = 0
+    while i < len(tokens) and tokens[i]:
+        token = tokens[i]
+        if token.startswith(b":"):
+            status = token.split()[-1][:1].decode()
+            if status in ("R", "C"):
+                raw_entries.append((status, _decode_path(tokens[i + 2]), _decode_path(tokens[i + 1])))
+                i += 3
+            else:
+                raw_entries.append((status, _decode_path(tokens[i + 1]), ""))
+                i += 2
+        else:
+            added, removed, filepath = token.split(b"\t", 2)
+            if filepath:
+                stats[_decode_path(filepath)] = (added.decode(), removed.decode())
+                i += 1
+            else:
+                stats[_decode_path(tokens[i + 2])] = (added.decode(), removed.decode())
+                i += 3
+
+    return [
+        DiffEntry(status, filepath, old_path, *stats.get(filepath, ("0", "0")))
+        for status, filepath, old_path in raw_entries
+    ]
+
+
+def git_diff_entries(path: str, *revs: str, paths: list[str] | None = None) -> list[DiffEntry] | None:
+    pathspec = ["--", *paths] if paths is not None else []
+    try:
+        result = subprocess.run(
+            ["git", "--literal-pathspecs", "diff", "--raw", "--numstat", "-z", "-M100", *revs, *pathspec],
+            cwd=path,
+            capture_output=True,
+            check=True,
+        )
+    except subprocess.CalledProcessError:
+        return None
+    return _parse_diff_entries(result.stdout)
+
+
+def git_merge_base(path: str, *revs: str) -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "merge-base", *revs],
+            cwd=path,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except subprocess.CalledProcessError:
+        return None
+    return result.stdout.strip() or None
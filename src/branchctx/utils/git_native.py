@@ -0,0 +1,540 @@
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass
+
+HEX_SHA = re.compile(r"^(?:[0-9a-f]{40}|[0-9a-f]{64})$")
+SUBSECTION_ESCAPE = re.compile(r"\\(.)")
+SYMREF_PREFIX = "ref: "
+HEADS_PREFIX = "refs/heads/"
+TAGS_PREFIX = "refs/tags/"
+SYSTEM_CONFIG_ORIGIN = re.compile(r"^file:(.*?)\t", re.MULTILINE)
+SYSTEM_CONFIG_MISSING = re.compile(r"unable to read config file '(.*)'")
+UNSUPPORTED_ENV = (
+    "GIT_WORK_TREE",
+    "GIT_COMMON_DIR",
+    "GIT_CEILING_DIRECTORIES",
+    "GIT_DISCOVERY_ACROSS_FILESYSTEM",
+    "GIT_CONFIG",
+    "GIT_CONFIG_PARAMETERS",
+    "GIT_CONFIG_COUNT",
+    "GIT_REF_PARANOIA",
+)
+
+_file_cache: dict[str, tuple[tuple[int, int, int], object]] = {}
+_system_config: list[str | None] = []
+
+
+class UnsupportedLayout(Exception):
+    pass
+
+
+@dataclass
+class RepoLayout:
+    root: str
+    git_dir: str
+    common_dir: str
+
+
+def _stamp(path: str) -> tuple[int, int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _cached(path: str, parse):
+    stamp = _stamp(path)
+    if stamp is None:
+        _file_cache.pop(path, None)
+        return None
+    cached = _file_cache.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    value = parse(path)
+    _file_cache[path] = (stamp, value)
+    return value
+
+
+def _read_text(path: str) -> str | None:
+    try:
+        with open(path, encoding="utf-8", errors="surrogateescape") as f:
+            return f.read()
+    except (OSError, IOError):
+        return None
+
+
+def _check_env():
+    if os.name == "nt":
+        raise UnsupportedLayout("windows")
+    for name in UNSUPPORTED_ENV:
+        if os.environ.get(name):
+            raise UnsupportedLayout(name)
+
+
+def _is_git_dir(path: str) -> bool:
+    if not os.path.isfile(os.path.join(path, "HEAD")):
+        return False
+    if os.path.isfile(os.path.join(path, "commondir")):
+        return True
+    return os.path.isdir(os.path.join(path, "objects")) and os.path.isdir(os.path.join(path, "refs"))
+
+
+def _read_gitdir_file(dot_git: str) -> str:
+    content = _read_text(dot_git)
+    if content is None or not content.startswith("gitdir: "):
+        raise UnsupportedLayout(dot_git)
+    target = content[len("gitdir: ") :].strip()
+    return os.path.normpath(os.path.join(os.path.dirname(dot_git), target))
+
+
+def _common_dir(git_dir: str) -> str:
+    commondir = _read_text(os.path.join(git_dir, "commondir"))
+    if commondir is None:
+        return git_dir
+    return os.path.normpath(os.path.join(git_dir, commondir.strip()))
+
+
+def _check_layout(layout: RepoLayout) -> RepoLayout:
+    if hasattr(os, "geteuid") and os.stat(layout.git_dir).st_uid != os.geteuid():
+        raise UnsupportedLayout("ownership")
+
+    config = _parse_config_file(os.path.join(layout.common_dir, "config")) or {}
+    if config.get("core.bare", ["false"])[-1].lower() in ("true", "yes", "on", "1"):
+        raise UnsupportedLayout("bare")
+    for key in ("core.worktree", "extensions.refstorage", "extensions.worktreeconfig"):
+        if key in config:
+            raise UnsupportedLayout(key)
+    return layout
+
+
+def find_repo(path: str) -> RepoLayout | None:
+    _check_env()
+
+    if not os.path.isdir(path):
+        raise UnsupportedLayout(path)
+
+    env_git_dir = os.environ.get("GIT_DIR")
+    if env_git_dir:
+        git_dir = os.path.realpath(os.path.join(path, env_git_dir))
+        if not _is_git_dir(git_dir):
+            raise UnsupportedLayout(git_dir)
+        return _check_layout(RepoLayout(os.path.realpath(path), git_dir, _common_dir(git_dir)))
+
+    current = os.path.realpath(path)
+    while True:
+        dot_git = os.path.join(current, ".git")
+        if os.path.isdir(dot_git):
+            if _is_git_dir(dot_git):
+                return _check_layout(RepoLayout(current, dot_git, _common_dir(dot_git)))
+        elif os.path.isfile(dot_git):
+            git_dir = _read_gitdir_file(dot_git)
+            if not _is_git_dir(git_dir):
+                raise UnsupportedLayout(git_dir)
+            return _check_layout(RepoLayout(current, git_dir, _common_dir(git_dir)))
+
+        if _is_git_dir(current):
+            raise UnsupportedLayout(current)
+
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def _parse_packed_refs(path: str) -> dict[str, str]:
+    refs: dict[str, str] = {}
+    content = _read_text(path) or ""
+    for line in content.splitlines():
+        if not line or line[0] in "#^":
+            continue
+        sha, _, name = line.partition(" ")
+        refs[name] = sha
+    return refs
+
+
+def _packed_refs(layout: RepoLayout) -> dict[str, str]:
+    return _cached(os.path.join(layout.common_dir, "packed-refs"), _parse_packed_refs) or {}
+
+
+def _ref_dir(layout: RepoLayout, refname: str) -> str:
+    if refname.startswith("refs/") and not refname.startswith(("refs/worktree/", "refs/bisect/", "refs/rewritten/")):
+        return layout.common_dir
+    return layout.git_dir
+
+
+def _read_loose_ref(layout: RepoLayout, refname: str) -> str | None:
+    ref_path = os.path.join(_ref_dir(layout, refname), *refname.split("/"))
+    if os.path.islink(ref_path):
+        raise UnsupportedLayout(ref_path)
+    if not os.path.isfile(ref_path):
+        return None
+    content = _read_text(ref_path)
+    if content is None:
+        return None
+    return content.strip()
+
+
+def ref_exists(layout: RepoLayout, refname: str) -> bool:
+    return _read_loose_ref(layout, refname) is not None or refname in _packed_refs(layout)
+
+
+def read_ref(layout: RepoLayout, refname: str, depth: int = 0) -> str | None:
+    if depth > 5:
+        raise UnsupportedLayout(refname)
+
+    value = _read_loose_ref(layout, refname)
+    if value is None:
+        return _packed_refs(layout).get(refname)
+
+    if value.startswith(SYMREF_PREFIX):
+        return read_ref(layout, value[len(SYMREF_PREFIX) :].strip(), depth + 1)
+    if HEX_SHA.match(value):
+        return value
+    raise UnsupportedLayout(refname)
+
+
+def read_head(layout: RepoLayout) -> str:
+    head_path = os.path.join(layout.git_dir, "HEAD")
+    if os.path.islink(head_path):
+        raise UnsupportedLayout(head_path)
+    content = (_read_text(head_path) or "").strip()
+
+    if HEX_SHA.match(content):
+        return content
+    if not content.startswith(SYMREF_PREFIX):
+        raise UnsupportedLayout(head_path)
+
+    target = content[len(SYMREF_PREFIX) :].strip()
+    if target == "refs/heads/.invalid":
+        raise UnsupportedLayout("reftable")
+    return target
+
+
+def shorten_branch(layout: RepoLayout, refname: str) -> str:
+    if not refname.startswith(HEADS_PREFIX):
+        raise UnsupportedLayout(refname)
+    short = refname[len(HEADS_PREFIX) :]
+    if ref_exists(layout, f"refs/{short}") or ref_exists(layout, f"{TAGS_PREFIX}{short}"):
+        raise UnsupportedLayout(f"ambiguous {short}")
+    return short
+
+
+def current_branch(path: str) -> str | None:
+    layout = find_repo(path)
+    if layout is None:
+        return None
+
+    head = read_head(layout)
+    if HEX_SHA.match(head):
+        return "HEAD"
+    return shorten_branch(layout, head)
+
+
+def toplevel(path: str) -> str | None:
+    layout = find_repo(path)
+    if layout is None:
+        return None
+    return layout.root
+
+
+def git_dir(path: str) -> str | None:
+    layout = find_repo(path)
+    if layout is None:
+        return None
+    return layout.git_dir
+
+
+def _loose_ref_names(directory: str, prefix: str) -> set[str]:
+    names: set[str] = set()
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return names
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            names |= _loose_ref_names(entry.path, f"{prefix}{entry.name}/")
+        elif not entry.name.endswith(".lock"):
+            names.add(prefix + entry.name)
+    return names
+
+
+def _ref_names(layout: RepoLayout, prefix: str) -> set[str]:
+    loose_dir = os.path.join(layout.common_dir, *prefix.rstrip("/").split("/"))
+    names = {name for name in _packed_refs(layout) if name.startswith(prefix)}
+    return names | _loose_ref_names(loose_dir, prefix)
+
+
+def local_branches(path: str) -> list[str]:
+    layout = find_repo(path)
+    if layout is None:
+        return []
+
+    tags = _ref_names(layout, TAGS_PREFIX)
+    packed = _packed_refs(layout)
+    try:
+        top_level = set(os.listdir(os.path.join(layout.common_dir, "refs")))
+    except OSError:
+        top_level = set()
+
+    branches = []
+    for refname in sorted(_ref_names(layout, HEADS_PREFIX)):
+        short = refname[len(HEADS_PREFIX) :]
+        if f"{TAGS_PREFIX}{short}" in tags or f"refs/{short}" in packed:
+            raise UnsupportedLayout(f"ambiguous {short}")
+        if short.split("/")[0] in top_level and _read_loose_ref(layout, f"refs/{short}") is not None:
+            raise UnsupportedLayout(f"ambiguous {short}")
+        branches.append(short)
+    return branches
+
+
+def _parse_value(raw: str, path: str) -> tuple[str, bool]:
+    out: list[str] = []
+    pending_space = ""
+    in_quotes = False
+    i = 0
+    while i < len(raw):
+        ch = raw[i]
+        if ch == "\\":
+            i += 1
+            if i >= len(raw):
+                return "".join(out), True
+            esc = raw[i]
+            mapped = {"n": "\n", "t": "\t", "b": "\b", "\\": "\\", '"': '"'}.get(esc)
+            if mapped is None:
+                raise UnsupportedLayout(path)
+            out.append(pending_space + mapped)
+            pending_space = ""
+        elif ch == '"':
+            in_quotes = not in_quotes
+            out.append(pending_space)
+            pending_space = ""
+        elif ch in " \t" and not in_quotes:
+            if out:
+                pending_space += ch
+        elif ch in "#;" and not in_quotes:
+            break
+        else:
+            out.append(pending_space + ch)
+            pending_space = ""
+        i += 1
+
+    if in_quotes:
+        raise UnsupportedLayout(path)
+    return "".join(out), False
+
+
+def _unescape(match: re.Match) -> str:
+    return match.group(1)
+
+
+def _parse_config_file(path: str) -> dict[str, list[str]] | None:
+    return _cached(path, _parse_config)
+
+
+def _parse_config(path: str) -> dict[str, list[str]]:
+    values: dict[str, list[str]] = {}
+    content = _read_text(path) or ""
+    section = ""
+    lines = content.splitlines()
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+        i += 1
+        if line.startswith("["):
+            end = line.find("]")
+            if end < 0:
+                raise UnsupportedLayout(path)
+            header = line[1:end].strip()
+            match = re.match(r'^([A-Za-z0-9.-]+)(?:\s+"((?:[^"\\]|\\.)*)")?$', header)
+            if not match:
+                raise UnsupportedLayout(path)
+            name, subsection = match.group(1), match.group(2)
+            if subsection is not None:
+                section = f"{name.lower()}.{SUBSECTION_ESCAPE.sub(_unescape, subsection)}"
+            elif "." in name:
+                head, _, tail = name.partition(".")
+                section = f"{head.lower()}.{tail.lower()}"
+            else:
+                section = name.lower()
+            if section.split(".")[0] in ("include", "includeif"):
+                raise UnsupportedLayout(path)
+            line = line[end + 1 :].strip()
+
+        if not line or line[0] in "#;":
+            continue
+        if not section:
+            raise UnsupportedLayout(path)
+
+        match = re.match(r"^([A-Za-z][A-Za-z0-9-]*)\s*(=?)(.*)$", line)
+        if not match:
+            raise UnsupportedLayout(path)
+        key = f"{section}.{match.group(1).lower()}"
+        if not match.group(2):
+            if match.group(3).strip() and match.group(3).strip()[0] not in "#;":
+                raise UnsupportedLayout(path)
+            values.setdefault(key, []).append("true")
+            continue
+
+        raw = match.group(3)
+        value, continued = _parse_value(raw, path)
+        while continued:
+            if i >= len(lines):
+                raise UnsupportedLayout(path)
+            raw = raw[:-1] + lines[i]
+            i += 1
+            value, continued = _parse_value(raw, path)
+        values.setdefault(key, []).append(value)
+
+    return values
+
+
+def _normalize_key(key: str) -> str:
+    section, _, rest = key.partition(".")
+    subsection, _, name = rest.rpartition(".")
+    if subsection:
+        return f"{section.lower()}.{subsection}.{name.lower()}"
+    return f"{section.lower()}.{name.lower()}"
+
+
+def _global_config_paths() -> list[str]:
+    if os.environ.get("GIT_CONFIG_GLOBAL"):
+        return [os.environ["GIT_CONFIG_GLOBAL"]]
+
+    home = os.environ.get("HOME", "")
+    xdg = os.environ.get("XDG_CONFIG_HOME") or os.path.join(home, ".config")
+    return [os.path.join(xdg, "git", "config"), os.path.join(home, ".gitconfig")]
+
+
+def _discover_system_config() -> str | None:
+    import subprocess
+
+    try:
+        result = subprocess.run(
+            ["git", "config", "--system", "--show-origin", "--list"],
+            capture_output=True,
+            text=True,
+        )
+    except OSError:
+        return None
+    match = SYSTEM_CONFIG_ORIGIN.search(result.stdout) or SYSTEM_CONFIG_MISSING.search(result.stderr)
+    return match.group(1) if match else None
+
+
+def _system_config_paths() -> list[str]:
+    if os.environ.get("GIT_CONFIG_NOSYSTEM"):
+        return []
+    if os.environ.get("GIT_CONFIG_SYSTEM"):
+        return [os.environ["GIT_CONFIG_SYSTEM"]]
+    if not _system_config:
+        _system_config.append(_discover_system_config())
+    if _system_config[0] is None:
+        raise UnsupportedLayout("system config location unknown")
+    return [_system_config[0]]
+
+
+def config_value(key: str, scope: str | None = None, path: str | None = None) -> str | None:
+    _check_env()
+
+    if scope == "global":
+        paths = _global_config_paths()
+    else:
+        paths = _system_config_paths() + _global_config_paths()
+        layout = find_repo(path or os.getcwd())
+        if layout is not None:
+            paths.append(os.path.join(layout.common_dir, "config"))
+
+    normalized = _normalize_key(key)
+    value = None
+    for config_path in paths:
+        parsed = _parse_config_file(config_path)
+        if parsed and normalized in parsed:
+            value = parsed[normalized][-1]
+    return value
+
+
+def _pack_object_count(idx_path: str) -> int:
+    try:
+        with open(idx_path, "rb") as f:
+            header = f.read(8)
+            offset = 8 + 255 * 4 if header[:4] == b"\xfftOc" else 255 * 4
+            f.seek(offset)
+            return int.from_bytes(f.read(4), "big")
+    except (OSError, IOError):
+        return 0
+
+
+def default_abbrev_length(path: str) -> int:
+    layout = find_repo(path)
+    if layout is None:
+        raise UnsupportedLayout(path)
+
+    configured = (config_value("core.abbrev", path=path) or "auto").lower()
+    if configured in ("no", "false", "off"):
+        return 40
+    if configured != "auto":
+        if not configured.isdigit():
+            raise UnsupportedLayout("core.abbrev")
+        return max(4, int(configured))
+
+    objects_dir = os.path.join(layout.common_dir, "objects")
+    pack_dir = os.path.join(objects_dir, "pack")
+    if os.path.exists(os.path.join(objects_dir, "info", "alternates")):
+        raise UnsupportedLayout("alternates")
+    if os.path.exists(os.path.join(pack_dir, "multi-pack-index")):
+        raise UnsupportedLayout("multi-pack-index")
+
+    try:
+        idx_files = [name for name in os.listdir(pack_dir) if name.endswith(".idx")]
+    except OSError:
+        idx_files = []
+    count = sum(_pack_object_count(os.path.join(pack_dir, name)) for name in idx_files)
+
+    length = (count.bit_length() - 1 if count else 0) + 1
+    return max(7, (length + 1) // 2)
+
+
+def check_history_layout(path: str) -> RepoLayout:
+    layout = find_repo(path)
+    if layout is None:
+        raise UnsupportedLayout(path)
+    for marker in ("shallow", os.path.join("info", "grafts")):
+        if os.path.exists(os.path.join(layout.common_dir, marker)):
+            raise UnsupportedLayout(marker)
+    if os.path.isdir(os.path.join(layout.common_dir, "refs", "replace")) or any(
+        name.startswith("refs/replace/") for name in _packed_refs(layout)
+    ):
+        raise UnsupportedLayout("replace refs")
+    return layout
+
+
+def resolve_name(path: str, name: str) -> str | None:
+    layout = check_history_layout(path)
+
+    if not name or not re.match(r"^[A-Za-z0-9._/-]+$", name) or ".." in name or name.endswith((".", "/", ".lock")):
+        raise UnsupportedLayout(name)
+    if re.match(r"^[0-9a-f]{4,64}$", name):
+        raise UnsupportedLayout(name)
+
+    if name == "HEAD":
+        head = read_head(layout)
+        return head if HEX_SHA.match(head) else read_ref(layout, head)
+
+    if not name.startswith("refs/") and os.path.exists(os.path.join(layout.git_dir, name)):
+        raise UnsupportedLayout(name)
+
+    for candidate in (
+        name,
+        f"refs/{name}",
+        f"{TAGS_PREFIX}{name}",
+        f"{HEADS_PREFIX}{name}",
+        f"refs/remotes/{name}",
+        f"refs/remotes/{name}/HEAD",
+    ):
+        if candidate.startswith("refs/"):
+            sha = read_ref(layout, candidate)
+            if sha:
+                return sha
+    return None
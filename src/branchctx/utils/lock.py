@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+_held: dict[tuple[str, int], list[int]] = {}
+
+
+def is_locking_supported() -> bool:
+    return fcntl is not None
+
+
+class FileLock:
+    def __init__(self, path: str, reentrant: bool = False):
+        self.path = path
+        self.reentrant = reentrant
+        self._key: tuple[str, int] | None = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        if fcntl is None:
+            return True
+
+        key = (self.path, threading.get_ident() if self.reentrant else id(self))
+        if self.reentrant and key in _held:
+            _held[key][1] += 1
+            self._key = key
+            return True
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+
+        _held[key] = [fd, 1]
+        self._key = key
+        return True
+
+    def release(self):
+        if self._key is None:
+            return
+        assert fcntl is not None
+        entry = _held[self._key]
+        entry[1] -= 1
+        if entry[1] == 0:
+            del _held[self._key]
+            fcntl.flock(entry[0], fcntl.LOCK_UN)
+            os.close(entry[0])
+        self._key = None
+
+    def __enter__(self) -> FileLock:
+        self.acquire()
+        return self
+
+    def __exit__(self, *_exc):
+        self.release()
@@ -1,15 +1,19 @@
 import os
 import tempfile
+from unittest.mock import patch
 
 import pytest
 
+from branchctx.commands.on_commit import cmd_on_commit
 from branchctx.constants import DEFAULT_SYMLINK, HOOK_POST_CHECKOUT, HOOK_POST_COMMIT
 from branchctx.core.context_tags import update_context_tags
 from branchctx.core.hooks import install_hook
 from branchctx.core.sync import sanitize_branch_name, sync_branch
+from branchctx.core.tag_providers import needs_changed_files
+from branchctx.data.branch_base import save_base_branch
 from branchctx.data.config import Config, get_branches_dir, get_template_dir
-from branchctx.data.meta import create_branch_meta, update_branch_meta
-from branchctx.utils.git import git_add, git_checkout, git_commit, git_config, git_init
+from branchctx.data.meta import create_branch_meta, find_branches_touching, get_branch_meta, update_branch_meta
+from branchctx.utils.git import git_add, git_checkout, git_commit, git_config, git_diff_entries, git_init
 
 
 @pytest.fixture
@@ -198,3 +202,83 @@ def test_no_tags_in_file_skips_silently(git_repo):
     )
 
     assert len(updates) == 0
+
+
+def test_extra_tag_providers(git_repo):
+    sync_branch(git_repo, "main")
+    git_checkout(git_repo, "feature/providers", create=True)
+    sync_branch(git_repo, "feature/providers")
+
+    branch_key = sanitize_branch_name("feature/providers")
+    create_branch_meta(git_repo, branch_key, "feature/providers")
+
+    for name, lines in (("a.py", 3), ("b.py", 2)):
+        with open(os.path.join(git_repo, name), "w") as f:
+            f.write("x\n" * lines)
+        git_add(git_repo, name)
+        git_commit(git_repo, f"feat: add {name}")
+    update_branch_meta(git_repo, branch_key, "main")
+
+    context_dir = os.path.join(git_repo, DEFAULT_SYMLINK)
+    context_file = os.path.join(context_dir, "context.md")
+    with open(context_file, "w") as f:
+        f.write(
+            "<bctx:diffstat></bctx:diffstat>\n"
+            "<bctx:authors></bctx:authors>\n"
+            "<bctx:ahead-behind></bctx:ahead-behind>\n"
+            "<bctx:unknown>keep</bctx:unknown>\n"
+        )
+
+    updates = update_context_tags(git_repo, context_dir, branch_key, "main")
+    assert {update.tag: update.new_content for update in updates} == {
+        "bctx:diffstat": "2 files changed, +5 -0",
+        "bctx:authors": "Test (2)",
+        "bctx:ahead-behind": "ahead 2, behind 0",
+    }
+    with open(context_file) as f:
+        assert "<bctx:unknown>keep</bctx:unknown>" in f.read()
+
+
+def test_changed_files_computed_on_demand_when_only_commits_tag_used(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo)
+    sync_branch(git_repo, "main")
+    git_checkout(git_repo, "feature/commits-only", create=True)
+    sync_branch(git_repo, "feature/commits-only")
+
+    branch_key = sanitize_branch_name("feature/commits-only")
+    context_dir = os.path.join(git_repo, DEFAULT_SYMLINK)
+    context_file = os.path.join(context_dir, "context.md")
+    save_base_branch(context_dir, "main")
+    with open(context_file, "w") as f:
+        f.write("<bctx:commits></bctx:commits>\n")
+    update_context_tags(git_repo, context_dir, branch_key, "main")
+    assert not needs_changed_files(git_repo, branch_key)
+
+    for name in ("only.py", "second.py"):
+        with open(os.path.join(git_repo, name), "w") as f:
+            f.write("x = 1\n")
+        git_add(git_repo, name)
+        git_commit(git_repo, f"feat: {name}")
+        with patch("branchctx.data.meta.git_diff_entries", wraps=git_diff_entries) as diff:
+            with patch("branchctx.core.tag_providers.git_log_authors") as authors:
+                with patch("branchctx.core.tag_providers.git_ahead_behind") as ahead_behind:
+                    assert cmd_on_commit([]) == 0
+        diff.assert_not_called()
+        authors.assert_not_called()
+        ahead_behind.assert_not_called()
+
+    meta = get_branch_meta(git_repo, branch_key)
+    assert [c["subject"] for c in meta["commits"]] == ["feat: second.py", "feat: only.py"]
+    assert meta["files"] is None
+    with open(context_file) as f:
+        assert "feat: second.py" in f.read()
+
+    assert find_branches_touching(git_repo, "only.py") == [(branch_key, "only.py", "1", "0")]
+    assert [entry["path"] for entry in get_branch_meta(git_repo, branch_key)["files"]] == ["only.py", "second.py"]
+
+    with open(context_file, "a") as f:
+        f.write("<bctx:files></bctx:files>\n")
+    update_context_tags(git_repo, context_dir, branch_key, "main", force=True)
+    with open(context_file) as f:
+        assert "second.py" in f.read()
+    assert needs_changed_files(git_repo, branch_key)
@@ -1,5 +1,7 @@
 import json
 import os
+import subprocess
+import sys
 import tempfile
 
 import pytest
@@ -7,11 +9,12 @@ import pytest
 from branchctx.commands.on_checkout import cmd_on_checkout
 from branchctx.commands.on_commit import cmd_on_commit
 from branchctx.commands.template import cmd_template
-from branchctx.constants import DEFAULT_SYMLINK, HOOK_POST_CHECKOUT, HOOK_POST_COMMIT
+from branchctx.constants import DEFAULT_SYMLINK, HOOK_POST_CHECKOUT, HOOK_POST_COMMIT, HOOK_POST_REWRITE
 from branchctx.core.hooks import install_hook
+from branchctx.core.refresh import get_refresh_dirty_path
 from branchctx.core.sync import archive_branch, sanitize_branch_name, sync_branch
 from branchctx.data.config import get_branches_dir, get_config_dir, get_template_dir
-from branchctx.data.meta import get_branch_meta, load_archived_meta
+from branchctx.data.meta import get_branch_meta, load_archived_meta, load_branch_meta
 from branchctx.utils.git import git_add, git_checkout, git_commit, git_config, git_init
 
 
@@ -84,7 +87,7 @@ def test_on_commit_updates_meta(git_repo):
     meta = get_branch_meta(git_repo, branch_key)
 
     assert meta["last_commit"]["message"] == "feat: add file"
-    assert "feat: add file" in meta["commits"]
+    assert "feat: add file" in [c["subject"] for c in meta["commits"]]
 
 
 def test_on_commit_updates_context_tags(git_repo):
@@ -131,7 +134,7 @@ def test_template_preserves_meta_data(git_repo):
 
     meta_after = get_branch_meta(git_repo, branch_key)
     assert meta_after["commits"] == meta_before["commits"]
-    assert meta_after["changed_files"] == meta_before["changed_files"]
+    assert meta_after["files"] == meta_before["files"]
 
     context_file = os.path.join(git_repo, DEFAULT_SYMLINK, "context.md")
     with open(context_file) as f:
@@ -156,3 +159,87 @@ def test_prune_moves_meta_to_archived(git_repo):
     archived = load_archived_meta(git_repo)
     assert branch_key in archived
     assert archived[branch_key]["branch"] == "feature/to-prune"
+
+
+def test_rebase_defers_refresh_to_post_rewrite(git_repo):
+    install_hook(git_repo, HOOK_POST_REWRITE)
+    sync_branch(git_repo, "main")
+    git_checkout(git_repo, "feature/rebase", create=True)
+    cmd_on_checkout(["main", "feature/rebase"])
+
+    for i in range(3):
+        with open(os.path.join(git_repo, f"rebased{i}.py"), "w") as f:
+            f.write(f"x = {i}")
+        git_add(git_repo, f"rebased{i}.py")
+        git_commit(git_repo, f"feat: rebased {i}")
+
+    git_checkout(git_repo, "main")
+    with open(os.path.join(git_repo, "upstream.py"), "w") as f:
+        f.write("y = 1")
+    git_add(git_repo, "upstream.py")
+    git_commit(git_repo, "chore: upstream")
+    git_checkout(git_repo, "feature/rebase")
+
+    subprocess.run(["git", "rebase", "-q", "main"], cwd=git_repo, check=True, capture_output=True)
+
+    head = subprocess.run(["git", "rev-parse", "HEAD"], cwd=git_repo, capture_output=True, text=True).stdout.strip()
+    meta = get_branch_meta(git_repo, sanitize_branch_name("feature/rebase"))
+    assert meta["head"] == head
+    assert len(meta["commits"]) == 3
+    assert "upstream.py" not in [f["path"] for f in meta["files"]]
+    assert not os.path.exists(get_refresh_dirty_path(git_repo))
+    assert os.readlink(os.path.join(git_repo, DEFAULT_SYMLINK)).endswith("feature-rebase")
+
+
+def test_on_commit_during_rebase_only_marks_dirty(git_repo):
+    sync_branch(git_repo, "main")
+    git_checkout(git_repo, "feature/dirty", create=True)
+    cmd_on_checkout(["main", "feature/dirty"])
+
+    os.makedirs(os.path.join(git_repo, ".git", "rebase-merge"))
+    with open(os.path.join(git_repo, "dirty.py"), "w") as f:
+        f.write("x = 1")
+    git_add(git_repo, "dirty.py")
+    git_commit(git_repo, "feat: during rebase")
+
+    cmd_on_commit([])
+
+    meta = get_branch_meta(git_repo, sanitize_branch_name("feature/dirty"))
+    assert "feat: during rebase" not in [c["subject"] for c in meta["commits"]]
+    assert os.path.exists(get_refresh_dirty_path(git_repo))
+
+    os.rmdir(os.path.join(git_repo, ".git", "rebase-merge"))
+    cmd_on_commit([])
+
+    meta = get_branch_meta(git_repo, sanitize_branch_name("feature/dirty"))
+    assert "feat: during rebase" in [c["subject"] for c in meta["commits"]]
+    assert not os.path.exists(get_refresh_dirty_path(git_repo))
+
+
+@pytest.mark.parametrize("storage", ["sharded", "json", "sqlite"])
+def test_parallel_hooks_do_not_lose_meta_updates(git_repo, storage):
+    with open(os.path.join(get_config_dir(git_repo), "config.json")) as f:
+        config_data = json.load(f)
+    config_data["meta_storage"] = storage
+    with open(os.path.join(get_config_dir(git_repo), "config.json"), "w") as f:
+        json.dump(config_data, f)
+
+    sync_branch(git_repo, "main")
+    git_checkout(git_repo, "feature/stress", create=True)
+    sync_branch(git_repo, "feature/stress")
+    with open(os.path.join(git_repo, "stress.py"), "w") as f:
+        f.write("x = 1")
+    git_add(git_repo, "stress.py")
+    git_commit(git_repo, "feat: stress")
+
+    workers = 8
+    cli = [sys.executable, "-m", "branchctx.cli"]
+    procs = [subprocess.Popen([*cli, "on-commit"], cwd=git_repo) for _ in range(workers)]
+    procs += [
+        subprocess.Popen([*cli, "on-checkout", "main", f"feature/parallel-{n}"], cwd=git_repo) for n in range(workers)
+    ]
+    assert all(proc.wait() == 0 for proc in procs)
+
+    meta = load_branch_meta(git_repo)
+    assert {f"feature-parallel-{n}" for n in range(workers)} <= set(meta)
+    assert meta["feature-stress"]["last_commit"]["message"] == "feat: stress"
@@ -0,0 +1,55 @@
+import subprocess
+import tempfile
+
+from benchmarks.fixtures import BASE_BRANCH, HOT_BRANCH, RepoSpec, fixture_branches, generate_repo
+from benchmarks.runner import OPERATIONS, _bctx, build_report, compare_reports, run_scale, setup_workspace
+from branchctx.core.sync import sanitize_branch_name
+from branchctx.data.meta import get_branch_meta
+
+
+def _git(repo, *args):
+    return subprocess.run(["git", *args], cwd=repo, capture_output=True, text=True, check=True).stdout
+
+
+def test_generate_repo_matches_spec():
+    spec = RepoSpec(branches=4, changed_files=10, depth=3, rename_rate=0.3)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        generate_repo(tmpdir, spec)
+
+        branches = _git(tmpdir, "for-each-ref", "--format=%(refname:short)", "refs/heads").split()
+        assert sorted(branches) == sorted([BASE_BRANCH] + fixture_branches(spec))
+
+        assert _git(tmpdir, "rev-list", "--count", f"{BASE_BRANCH}..{HOT_BRANCH}").strip() == "3"
+
+        statuses = [
+            line.split("\t")[0][0]
+            for line in _git(tmpdir, "diff", "--name-status", "-M", BASE_BRANCH, HOT_BRANCH).splitlines()
+        ]
+        assert len(statuses) == 10
+        assert statuses.count("R") == 3
+
+
+def test_setup_workspace_hot_branch_has_meta():
+    spec = RepoSpec(branches=3, changed_files=4, depth=2)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        setup_workspace(tmpdir, spec)
+        _bctx(tmpdir, "on-checkout", BASE_BRANCH, HOT_BRANCH)
+
+        meta = get_branch_meta(tmpdir, sanitize_branch_name(HOT_BRANCH))
+        assert meta["base_head"] is not None
+        assert len(meta["commits"]) == spec.depth
+        assert len(meta["files"]) == spec.changed_files
+
+
+def test_run_scale_reports_every_operation():
+    spec = RepoSpec(branches=3, changed_files=4, depth=2)
+    scale = run_scale("tiny", spec, repeat=1)
+
+    assert scale["spec"]["branches"] == 3
+    assert set(scale["operations"]) == set(OPERATIONS)
+    assert all(summary["median"] > 0 for summary in scale["operations"].values())
+
+    report = build_report([scale])
+    rows = compare_reports(report, report)
+    assert len(rows) == len(OPERATIONS)
+    assert all(row["ratio"] == 1.0 for row in rows)
@@ -1,11 +1,18 @@
 import os
+import shutil
+import subprocess
 import tempfile
+from unittest.mock import patch
 
 import pytest
 
 from branchctx.commands.branches import cmd_branches
-from branchctx.core.sync import sync_branch
+from branchctx.constants import META_PATH_BUCKETS_DIR, META_PATHS_DIR
+from branchctx.core.overlap import compute_overlaps
+from branchctx.core.sync import sanitize_branch_name, sync_branch
 from branchctx.data.config import Config, get_branches_dir, get_template_dir
+from branchctx.data.meta import get_meta_store, load_archived_meta, load_branch_meta, update_branch_meta
+from branchctx.data.meta_store import DocumentCache, JsonMetaStore, PathIndex
 from branchctx.utils.git import git_add, git_checkout, git_commit, git_config, git_init
 
 
@@ -78,6 +85,173 @@ def test_branches_list_shows_current_marker(git_repo, capsys):
     assert "* main" in captured.out
 
 
+def test_branches_list_recent_and_author(git_repo, capsys):
+    for branch in ("feature/a", "feature/b", "feature/c"):
+        git_checkout(git_repo, branch, create=True)
+        sync_branch(git_repo, branch)
+
+    store = get_meta_store(git_repo)
+    for key, updated_at, author in (
+        ("feature-a", "2024-01-02T00:00:00", "Alice"),
+        ("feature-b", "2024-01-03T00:00:00", "Bob"),
+        ("feature-c", "2024-01-01T00:00:00", "Alice"),
+    ):
+        record = store.get(key)
+        record.update(updated_at=updated_at, author=author)
+        store.put(key, record)
+
+    assert cmd_branches(["list", "--recent"]) == 0
+    out = capsys.readouterr().out
+    assert out.index("feature-b") < out.index("feature-a") < out.index("feature-c")
+
+    assert cmd_branches(["list", "--author", "Alice"]) == 0
+    out = capsys.readouterr().out
+    assert "Branch contexts (2)" in out
+    assert "feature-b" not in out
+
+    assert cmd_branches(["list", "--bogus"]) == 1
+
+
+def _commit_files(repo: str, message: str, files: dict):
+    for path, content in files.items():
+        full_path = os.path.join(repo, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "w") as f:
+            f.write(content)
+        git_add(repo, path)
+    git_commit(repo, message)
+
+
+def test_branches_touching(git_repo, capsys):
+    sync_branch(git_repo, "main")
+    git_checkout(git_repo, "feature/a", create=True)
+    _commit_files(git_repo, "feat: a", {"src/pay/ledger.py": "a\nb\n", "src/pay/api.py": "x\n"})
+    sync_branch(git_repo, "feature/a")
+    update_branch_meta(git_repo, "feature-a", "main")
+
+    git_checkout(git_repo, "main")
+    git_checkout(git_repo, "feature/b", create=True)
+    _commit_files(git_repo, "feat: b", {"src/pay/ledger.py": "c\n", "docs/pay.md": "d\n"})
+    sync_branch(git_repo, "feature/b")
+    paths_dir = os.path.join(get_branches_dir(git_repo), META_PATHS_DIR)
+    shard_a = os.stat(os.path.join(paths_dir, "feature-a.json"))
+    update_branch_meta(git_repo, "feature-b", "main")
+    assert sorted(os.listdir(paths_dir)) == [META_PATH_BUCKETS_DIR, "feature-a.json", "feature-b.json"]
+    assert os.stat(os.path.join(paths_dir, "feature-a.json")).st_mtime_ns == shard_a.st_mtime_ns
+
+    read = []
+    original_read = DocumentCache.read
+
+    def record_read(self, path):
+        read.append(path)
+        return original_read(self, path)
+
+    with patch("subprocess.run", side_effect=AssertionError("git called")):
+        with patch.object(DocumentCache, "read", record_read):
+            assert cmd_branches(["touching", "src/pay/ledger.py"]) == 0
+    assert [os.path.dirname(path) for path in read if path.startswith(paths_dir) and path.endswith(".json")] == [
+        os.path.join(paths_dir, META_PATH_BUCKETS_DIR)
+    ]
+    out = capsys.readouterr().out
+    assert "touching 'src/pay/ledger.py' (2)" in out
+    assert "feature-a  src/pay/ledger.py  (+2 -0)" in out
+    assert "feature-b  src/pay/ledger.py  (+1 -0)" in out
+
+    assert cmd_branches(["touching", "src/pay/*.py"]) == 0
+    out = capsys.readouterr().out
+    assert "feature-a  src/pay/api.py" in out
+
+    assert cmd_branches(["touching", "src/pay"]) == 0
+    assert "(2)" in capsys.readouterr().out
+
+    assert cmd_branches(["touching", "docs/missing.md"]) == 0
+    assert "No branch contexts touch" in capsys.readouterr().out
+
+    git_checkout(git_repo, "main")
+    subprocess.run(["git", "branch", "-D", "feature/b"], cwd=git_repo, capture_output=True, check=True)
+    assert cmd_branches(["prune"]) == 0
+    capsys.readouterr()
+
+    assert cmd_branches(["touching", "src/pay/ledger.py"]) == 0
+    out = capsys.readouterr().out
+    assert "feature-a" in out
+    assert "feature-b" not in out
+
+    assert sorted(os.listdir(paths_dir)) == [META_PATH_BUCKETS_DIR, "feature-a.json"]
+    assert cmd_branches(["touching", "docs/pay.md"]) == 0
+    assert "No branch contexts touch" in capsys.readouterr().out
+    shutil.rmtree(paths_dir)
+    assert cmd_branches(["touching", "src/pay/api.py"]) == 0
+    assert "feature-a  src/pay/api.py  (+1 -0)" in capsys.readouterr().out
+
+    assert cmd_branches(["touching"]) == 1
+
+
+def _entry(path, added="1", removed="0", old_path=None):
+    return {"status": "R" if old_path else "M", "path": path, "old_path": old_path, "added": added, "removed": removed}
+
+
+def test_path_index_updates_only_changed_paths():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        index = PathIndex(tmpdir)
+        index.rebuild({"a": [_entry("x.py"), _entry("y.py")], "b": [_entry("x.py", "3", "1")]})
+        assert index.lookup("x.py") == [("a", "x.py", "1", "0"), ("b", "x.py", "3", "1")]
+
+        index.update("a", [_entry("y.py", "2", "2"), _entry("z/new.py", old_path="x.py")])
+        assert index.lookup("x.py") == [("a", "x.py", "0", "0"), ("b", "x.py", "3", "1")]
+        assert index.lookup("y.py") == [("a", "y.py", "2", "2")]
+        assert index.lookup("z") == [("a", "z/new.py", "1", "0")]
+
+        index.remove_many(["a"])
+        assert index.lookup("*.py") == [("b", "x.py", "3", "1")]
+        index.update("b", [])
+        assert index.lookup("*") == []
+        assert os.listdir(index.buckets) == []
+
+
+def test_compute_overlaps_ranks_by_lines_changed():
+    overlaps = compute_overlaps(
+        {
+            "a": {"x.py": ["10", "2"], "y.py": ["1", "0"], "only-a.py": ["5", "5"]},
+            "b": {"x.py": ["3", "0"]},
+            "c": {"y.py": ["1", "1"], "img.png": ["-", "-"]},
+            "d": {"img.png": ["-", "-"], "x.py": ["1", "0"], "y.py": ["0", "1"]},
+            "e": {},
+        }
+    )
+
+    assert [(o.first, o.second, o.shared, o.weight) for o in overlaps] == [
+        ("a", "d", 2, 15),
+        ("a", "b", 1, 15),
+        ("b", "d", 1, 4),
+        ("c", "d", 2, 3),
+        ("a", "c", 1, 3),
+    ]
+
+
+def test_branches_overlap(git_repo, capsys):
+    assert cmd_branches(["overlap"]) == 0
+    assert "No overlapping branch contexts" in capsys.readouterr().out
+
+    for branch, files in (
+        ("feature/a", {"src/shared.py": "a\nb\nc\n", "src/a.py": "a\n"}),
+        ("feature/b", {"src/shared.py": "b\n"}),
+        ("feature/c", {"src/c.py": "c\n"}),
+    ):
+        git_checkout(git_repo, "main")
+        git_checkout(git_repo, branch, create=True)
+        _commit_files(git_repo, f"feat: {branch}", files)
+        sync_branch(git_repo, branch)
+        update_branch_meta(git_repo, sanitize_branch_name(branch), "main")
+
+    assert cmd_branches(["overlap"]) == 0
+    out = capsys.readouterr().out
+    assert "Overlapping branch contexts (1 pairs)" in out
+    assert "feature-a  feature-b  1 file  (4 lines)" in out
+
+    assert cmd_branches(["overlap", "--limit", "x"]) == 1
+
+
 def test_branches_prune_no_orphans(git_repo, capsys):
     sync_branch(git_repo, "main")
 
@@ -104,6 +278,32 @@ def test_branches_prune_with_orphans(git_repo, capsys):
     assert "feature-old" in captured.out
 
 
+@pytest.mark.parametrize("storage", ["sharded", "json", "sqlite"])
+def test_branches_prune_archives_in_one_batch(git_repo, capsys, storage):
+    Config(meta_storage=storage).save(git_repo)
+    sync_branch(git_repo, "main")
+    orphans = [f"feature/old-{n}" for n in range(5)]
+    for branch in orphans:
+        git_checkout(git_repo, branch, create=True)
+        sync_branch(git_repo, branch)
+    git_checkout(git_repo, "main")
+    sync_branch(git_repo, "main")
+    subprocess.run(["git", "branch", "-D", *orphans], cwd=git_repo, capture_output=True, check=True)
+
+    with patch.object(JsonMetaStore, "_save", autospec=True, side_effect=JsonMetaStore._save) as save:
+        assert cmd_branches(["prune"]) == 0
+    if storage == "json":
+        assert save.call_count == 2
+
+    keys = {f"feature-old-{n}" for n in range(5)}
+    assert set(load_branch_meta(git_repo)) == {"main"}
+    assert set(load_archived_meta(git_repo)) == keys
+
+    capsys.readouterr()
+    assert cmd_branches(["list"]) == 0
+    assert "Archived: 5" in capsys.readouterr().out
+
+
 def test_branches_unknown_subcommand(git_repo, capsys):
     result = cmd_branches(["unknown"])
     assert result == 1
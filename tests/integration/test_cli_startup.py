@@ -0,0 +1,63 @@
+import subprocess
+import sys
+
+import pytest
+
+IMPORT_BUDGET_US = 200_000
+
+HOOK_ENTRY_POINTS = ["on-checkout", "on-commit", "on-rewrite"]
+
+
+def _import_times(code: str) -> dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not name.startswith("  "):
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def _entry_point_code(command: str) -> str:
+    return (
+        "from branchctx.cli import main\n"
+        "from branchctx.cmd_registry import get_command_handler\n"
+        f"get_command_handler({command!r})\n"
+    )
+
+
+@pytest.mark.parametrize("command", HOOK_ENTRY_POINTS)
+def test_hook_entry_point_imports_only_its_command(command):
+    code = _entry_point_code(command) + "import sys; print('\\n'.join(sys.modules))"
+    loaded = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.split()
+
+    assert "importlib.metadata" not in loaded
+    commands = {name for name in loaded if name.startswith("branchctx.commands.")}
+    assert commands == {f"branchctx.commands.{command.replace('-', '_')}"}
+
+
+@pytest.mark.parametrize("command", HOOK_ENTRY_POINTS)
+def test_hook_entry_point_import_budget(command):
+    baseline = sum(_import_times("pass").values())
+    total = min(sum(_import_times(_entry_point_code(command)).values()) for _ in range(3))
+    assert total - baseline < IMPORT_BUDGET_US
+
+
+def test_cli_import_does_not_load_daemon():
+    code = "import sys, branchctx.cli; print('branchctx.core.daemon' in sys.modules, 'socketserver' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.split() == ["False", "False"]
+
+
+def test_version_is_baked_in():
+    code = "import sys, branchctx; print('importlib.metadata' in sys.modules, branchctx.__version__)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    loaded, version = result.stdout.split()
+    assert loaded == "False"
+    assert version.count(".") == 2
@@ -1,9 +1,18 @@
+import json
 import os
 import tempfile
 
 import pytest
 
-from branchctx.constants import BRANCHES_DIR, CONFIG_DIR, DEFAULT_TEMPLATE, TEMPLATES_DIR
+from branchctx.constants import (
+    BRANCHES_DIR,
+    CONFIG_DIR,
+    CONFIG_FILE,
+    DEFAULT_TEMPLATE,
+    META_INLINE_COMMITS,
+    META_INLINE_FILES,
+    TEMPLATES_DIR,
+)
 from branchctx.data.config import (
     Config,
     TemplateRule,
@@ -70,6 +79,20 @@ def test_config_load_missing_file(workspace):
     assert config.sound is False
 
 
+def test_config_rejects_invalid_inline_limits(workspace):
+    with open(os.path.join(workspace, CONFIG_DIR, CONFIG_FILE), "w") as f:
+        json.dump({"meta_inline_commits": -1, "meta_inline_files": "50"}, f)
+    loaded = Config.load(workspace)
+    assert loaded.meta_inline_commits == META_INLINE_COMMITS
+    assert loaded.meta_inline_files == META_INLINE_FILES
+
+    with open(os.path.join(workspace, CONFIG_DIR, CONFIG_FILE), "w") as f:
+        json.dump({"meta_inline_commits": True, "meta_inline_files": 0}, f)
+    loaded = Config.load(workspace)
+    assert loaded.meta_inline_commits == META_INLINE_COMMITS
+    assert loaded.meta_inline_files == 0
+
+
 def test_config_template_rules(workspace):
     config = Config(
         template_rules=[
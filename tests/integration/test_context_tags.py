@@ -1,16 +1,23 @@
 import os
 import tempfile
+from unittest.mock import patch
 
 import pytest
 
 from branchctx.core.context_tags import (
     SYNC_MESSAGE_TEMPLATE,
-    TAG_COMMITS,
-    TAG_FILES,
+    TAG_PATTERN,
     find_context_files,
     find_tags_in_file,
+    render_tags,
+    update_context_tags,
+    update_file_tags,
+    update_large_file_tags,
     update_tag_content,
 )
+from branchctx.core.tag_providers import TAG_COMMITS, TAG_FILES
+from branchctx.data.meta import archive_branch_metas, delete_branch_meta
+from branchctx.data.tag_manifest import get_tag_manifest_path
 
 
 @pytest.fixture
@@ -149,7 +156,186 @@ def test_update_tag_content_only_affects_specified_tag():
     assert "<bctx:files>files</bctx:files>" in result
 
 
+def test_update_tag_content_keeps_backslashes_literal():
+    content = "<bctx:files>old</bctx:files>"
+    result = update_tag_content(content, TAG_FILES, r"M  dir\\file\1.txt")
+    assert result == r"<bctx:files>M  dir\\file\1.txt</bctx:files>"
+
+
+def test_render_tags_replaces_every_tag_in_one_pass():
+    content = "".join(
+        f"## Note {n}\n<bctx:commits>old {n}</bctx:commits>\n<bctx:files>f{n}</bctx:files>\n" for n in range(50)
+    )
+    content += "<bctx:unknown>keep</bctx:unknown>\n"
+
+    with patch("branchctx.core.context_tags.TAG_PATTERN", wraps=TAG_PATTERN) as pattern:
+        result, replaced = render_tags(content, {TAG_COMMITS: "C", TAG_FILES: "F"})
+
+    assert pattern.finditer.call_count == 1
+    assert len(replaced) == 100
+    assert replaced[0] == (TAG_COMMITS, "old 0")
+    assert result.count("<bctx:commits>C</bctx:commits>") == 50
+    assert result.count("<bctx:files>F</bctx:files>") == 50
+    assert result.endswith("<bctx:unknown>keep</bctx:unknown>\n")
+    assert render_tags("no tags here", {TAG_COMMITS: "C"}) == ("no tags here", [])
+
+
 def test_sync_message_template():
     message = SYNC_MESSAGE_TEMPLATE.format(base_branch="origin/main")
     assert "origin/main" in message
     assert "N/A" in message
+
+
+def test_update_context_tags_reads_only_tagged_or_changed_files(temp_dir):
+    context_dir = os.path.join(temp_dir, "_branch")
+    os.makedirs(os.path.join(context_dir, "notes"))
+    context_file = os.path.join(context_dir, "context.md")
+    log_file = os.path.join(context_dir, "notes", "log.md")
+    with open(context_file, "w") as f:
+        f.write("<bctx:commits></bctx:commits>\n")
+    with open(log_file, "w") as f:
+        f.write("long transcript\n" * 1000)
+
+    updates = update_context_tags(temp_dir, context_dir, "feature-a", "main")
+    assert [update.file for update in updates] == [context_file]
+
+    opened = []
+    builtin_open = open
+
+    def tracking_open(path, *args, **kwargs):
+        opened.append(path)
+        return builtin_open(path, *args, **kwargs)
+
+    with patch("builtins.open", tracking_open):
+        assert update_context_tags(temp_dir, context_dir, "feature-a", "main", force=True) == []
+    assert context_file in opened
+    assert log_file not in opened
+
+    with open(log_file, "a") as f:
+        f.write("<bctx:files></bctx:files>\n")
+    new_file = os.path.join(context_dir, "notes", "new.md")
+    with open(new_file, "w") as f:
+        f.write("<bctx:commits>stale</bctx:commits>\n")
+
+    updates = update_context_tags(temp_dir, context_dir, "feature-a", "main", force=True)
+    assert sorted(update.file for update in updates) == [log_file, new_file]
+    with open(log_file) as f:
+        assert f.read().endswith(f"<bctx:files>\n{SYNC_MESSAGE_TEMPLATE.format(base_branch='main')}\n</bctx:files>\n")
+
+
+def test_update_context_tags_skips_pass_when_meta_unchanged(temp_dir):
+    context_dir = os.path.join(temp_dir, "_branch")
+    os.makedirs(context_dir)
+    context_file = os.path.join(context_dir, "context.md")
+    with open(context_file, "w") as f:
+        f.write("<bctx:commits></bctx:commits>\n")
+
+    assert len(update_context_tags(temp_dir, context_dir, "feature-a", "main")) == 1
+
+    with patch("branchctx.data.tag_manifest.os.scandir") as scandir:
+        with open(context_file, "w") as f:
+            f.write("<bctx:commits>edited</bctx:commits>\n")
+        assert update_context_tags(temp_dir, context_dir, "feature-a", "main") == []
+    scandir.assert_not_called()
+
+    assert len(update_context_tags(temp_dir, context_dir, "feature-a", "origin/main")) == 1
+
+    with open(context_file, "w") as f:
+        f.write("<bctx:commits>edited</bctx:commits>\n")
+    with open(os.path.join(context_dir, "notes.md"), "w") as f:
+        f.write("<bctx:files></bctx:files>\n")
+    assert len(update_context_tags(temp_dir, context_dir, "feature-a", "origin/main")) == 2
+
+
+def test_tag_manifest_removed_with_branch_meta(temp_dir):
+    context_dir = os.path.join(temp_dir, "_branch")
+    os.makedirs(context_dir)
+    with open(os.path.join(context_dir, "context.md"), "w") as f:
+        f.write("<bctx:commits></bctx:commits>\n")
+
+    for key in ("feature-a", "feature-b"):
+        update_context_tags(temp_dir, context_dir, key, "main")
+        assert os.path.exists(get_tag_manifest_path(temp_dir, key))
+
+    archive_branch_metas(temp_dir, ["feature-a"])
+    delete_branch_meta(temp_dir, "feature-b")
+
+    assert not os.path.exists(get_tag_manifest_path(temp_dir, "feature-a"))
+    assert not os.path.exists(get_tag_manifest_path(temp_dir, "feature-b"))
+
+
+def test_small_and_large_paths_render_identically(temp_dir):
+    content = (
+        "# Caf\xc3\xa9 notes\r\n\xff raw byte\r\n<bctx:commits>\r\nold \xe2\x9c\x93\r\n</bctx:commits>\r\n"
+        "<bctx:files>same</bctx:files>\r\ntail\r\n"
+    ).encode("latin-1")
+    values = {TAG_COMMITS: "\nabc1234 r\u00e9sum\u00e9 \u2713\n", TAG_FILES: "same"}
+    small = os.path.join(temp_dir, "small.md")
+    large = os.path.join(temp_dir, "large.md")
+    for path in (small, large):
+        with open(path, "wb") as f:
+            f.write(content)
+
+    small_result = update_file_tags(small, len(content), values)
+    large_result = update_large_file_tags(large, values)
+
+    assert small_result == large_result
+    with open(small, "rb") as f, open(large, "rb") as g:
+        rendered = f.read()
+        assert rendered == g.read()
+    assert rendered.startswith(content[: content.index(b"<bctx:commits>")])
+    assert rendered.endswith(content[content.index(b"</bctx:commits>") :])
+
+
+def test_update_large_file_tags_writes_same_length_regions_in_place(temp_dir):
+    path = os.path.join(temp_dir, "log.md")
+    filler = "transcript line\n" * 200
+    with open(path, "w") as f:
+        f.write(f"{filler}<bctx:commits>\nOLD\n</bctx:commits>\n{filler}<bctx:files>\nsame\n</bctx:files>\n")
+    inode = os.stat(path).st_ino
+
+    replaced, changed = update_large_file_tags(path, {TAG_COMMITS: "\nNEW\n", TAG_FILES: "\nsame\n"})
+
+    assert changed
+    assert replaced == [(TAG_COMMITS, "\nOLD\n"), (TAG_FILES, "\nsame\n")]
+    assert os.stat(path).st_ino == inode
+    with open(path) as f:
+        assert f.read() == f"{filler}<bctx:commits>\nNEW\n</bctx:commits>\n{filler}<bctx:files>\nsame\n</bctx:files>\n"
+
+    mtime = os.stat(path).st_mtime_ns
+    assert update_large_file_tags(path, {TAG_COMMITS: "\nNEW\n"}) == ([(TAG_COMMITS, "\nNEW\n")], False)
+    assert os.stat(path).st_mtime_ns == mtime
+
+
+def test_update_large_file_tags_streams_resized_regions(temp_dir):
+    path = os.path.join(temp_dir, "log.md")
+    head = "".join(f"line {n}\n" for n in range(300))
+    tail = "".join(f"tail {n}\n" for n in range(300))
+    with open(path, "w") as f:
+        f.write(f"{head}<bctx:commits></bctx:commits>\n{tail}<bctx:files>long old value</bctx:files>")
+
+    with patch("branchctx.core.context_tags.COPY_CHUNK_SIZE", 7):
+        replaced, changed = update_large_file_tags(path, {TAG_COMMITS: "\nabc123 feat: x\n", TAG_FILES: "\n"})
+
+    assert changed
+    assert [tag for tag, _ in replaced] == [TAG_COMMITS, TAG_FILES]
+    with open(path) as f:
+        assert f.read() == f"{head}<bctx:commits>\nabc123 feat: x\n</bctx:commits>\n{tail}<bctx:files>\n</bctx:files>"
+    assert not [name for name in os.listdir(temp_dir) if name.endswith(".tmp")]
+
+
+def test_update_context_tags_uses_mmap_path_for_large_files(temp_dir):
+    context_dir = os.path.join(temp_dir, "_branch")
+    os.makedirs(context_dir)
+    path = os.path.join(context_dir, "context.md")
+    with open(path, "w") as f:
+        f.write("x" * 64 + "\n<bctx:commits></bctx:commits>\n")
+
+    with patch("branchctx.core.context_tags.CONTEXT_MMAP_THRESHOLD", 32):
+        with patch("branchctx.core.context_tags.render_tags") as render:
+            updates = update_context_tags(temp_dir, context_dir, "feature-a", "main")
+
+    render.assert_not_called()
+    assert [update.tag for update in updates] == [TAG_COMMITS]
+    with open(path) as f:
+        assert SYNC_MESSAGE_TEMPLATE.format(base_branch="main") in f.read()
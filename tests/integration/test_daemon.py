@@ -0,0 +1,178 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import pytest
+
+from branchctx.core.daemon import (
+    DaemonServer,
+    _RequestHandler,
+    forward_hook_event,
+    get_socket_path,
+    is_daemon_running,
+    is_daemon_supported,
+    stop_daemon,
+)
+from branchctx.core.hooks import get_daemon_client
+from branchctx.core.sync import sanitize_branch_name, sync_branch
+from branchctx.data.config import get_branches_dir, get_config_dir, get_template_dir
+from branchctx.data.meta import get_branch_meta
+from branchctx.utils.git import git_add, git_checkout, git_commit, git_config, git_init
+
+pytestmark = pytest.mark.skipif(not is_daemon_supported(), reason="unix sockets not available")
+
+
+@pytest.fixture
+def git_repo():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        git_init(tmpdir, "main")
+        git_config(tmpdir, "user.email", "test@test.com")
+        git_config(tmpdir, "user.name", "Test User")
+
+        with open(os.path.join(tmpdir, "README.md"), "w") as f:
+            f.write("# Test")
+
+        git_add(tmpdir)
+        git_commit(tmpdir, "init")
+
+        template_dir = get_template_dir(tmpdir)
+        os.makedirs(template_dir)
+        os.makedirs(get_branches_dir(tmpdir))
+
+        config_data = {"default_base_branch": "main", "sound": False, "template_rules": []}
+        with open(os.path.join(get_config_dir(tmpdir), "config.json"), "w") as f:
+            json.dump(config_data, f)
+
+        with open(os.path.join(template_dir, "context.md"), "w") as f:
+            f.write("# Context\n<bctx:commits></bctx:commits>")
+
+        original_cwd = os.getcwd()
+        os.chdir(tmpdir)
+        yield tmpdir
+        os.chdir(original_cwd)
+
+
+@pytest.fixture
+def daemon(git_repo):
+    server = DaemonServer(git_repo)
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+    yield server
+    stop_daemon(git_repo)
+    thread.join(timeout=5)
+
+
+def test_forward_without_daemon_returns_none(git_repo):
+    assert forward_hook_event("on-commit", [], cwd=git_repo) is None
+
+
+def test_forward_with_stale_socket_returns_none(git_repo):
+    with open(get_socket_path(git_repo), "w") as f:
+        f.write("")
+
+    assert forward_hook_event("on-commit", [], cwd=git_repo) is None
+
+
+def test_forward_ignores_non_hook_commands(git_repo, daemon):
+    assert forward_hook_event("status", [], cwd=git_repo) is None
+
+
+def test_daemon_running(git_repo, daemon):
+    assert is_daemon_running(git_repo)
+
+
+def test_daemon_handles_checkout_and_commit(git_repo, daemon, capsys):
+    sync_branch(git_repo, "main")
+    git_checkout(git_repo, "feature/daemon", create=True)
+
+    code = forward_hook_event("on-checkout", ["main", "feature/daemon"], cwd=git_repo)
+    assert code == 0
+    assert "Branch: main -> feature/daemon" in capsys.readouterr().out
+
+    with open(os.path.join(git_repo, "daemon.py"), "w") as f:
+        f.write("x = 1")
+    git_add(git_repo)
+    git_commit(git_repo, "feat: via daemon")
+
+    code = forward_hook_event("on-commit", [], cwd=git_repo)
+    assert code == 0
+
+    meta = get_branch_meta(git_repo, sanitize_branch_name("feature/daemon"))
+    assert meta["last_commit"]["message"] == "feat: via daemon"
+
+
+SOCAT_STUB = """#!{python}
+import socket
+import sys
+
+with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+    sock.connect(sys.argv[-1].split(":", 1)[1])
+    sock.sendall(sys.stdin.buffer.read())
+    sock.shutdown(socket.SHUT_WR)
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        sys.stdout.buffer.write(chunk)
+"""
+
+
+def _run_hook_client(git_repo, tmp_path, call):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir(exist_ok=True)
+    stub = bin_dir / "socat"
+    stub.write_text(SOCAT_STUB.format(python=sys.executable))
+    stub.chmod(0o755)
+    env = {**os.environ, "PATH": f"{bin_dir}{os.pathsep}{os.environ['PATH']}"}
+    return subprocess.run(
+        ["bash", "-c", f"{get_daemon_client()}\n{call}"], cwd=git_repo, env=env, capture_output=True, text=True
+    )
+
+
+def test_hook_client_forwards_to_daemon(git_repo, daemon, tmp_path):
+    sync_branch(git_repo, "main")
+    git_checkout(git_repo, "feature/client", create=True)
+
+    result = _run_hook_client(git_repo, tmp_path, "bctx_hook false on-checkout main feature/client")
+    assert result.returncode == 0
+    assert "Branch: main -> feature/client" in result.stdout
+
+    with open(os.path.join(git_repo, "client.py"), "w") as f:
+        f.write("x = 1")
+    git_add(git_repo)
+    git_commit(git_repo, "feat: via hook client")
+
+    assert _run_hook_client(git_repo, tmp_path, "bctx_hook false on-commit").returncode == 0
+    meta = get_branch_meta(git_repo, sanitize_branch_name("feature/client"))
+    assert meta["last_commit"]["message"] == "feat: via hook client"
+
+
+def test_hook_client_falls_back_without_daemon(git_repo, tmp_path):
+    result = _run_hook_client(git_repo, tmp_path, "bctx_hook echo on-checkout main feature/x")
+    assert result.stdout == "on-checkout main feature/x\n"
+
+
+def test_daemon_drops_silent_client(git_repo, daemon, monkeypatch):
+    monkeypatch.setattr(_RequestHandler, "timeout", 0.2)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as silent:
+        silent.connect(get_socket_path(git_repo))
+        start = time.monotonic()
+        assert is_daemon_running(git_repo)
+        assert time.monotonic() - start < 2
+
+
+def test_daemon_stop_removes_socket(git_repo):
+    server = DaemonServer(git_repo)
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+
+    assert stop_daemon(git_repo)
+    thread.join(timeout=5)
+
+    assert not os.path.exists(get_socket_path(git_repo))
+    assert not is_daemon_running(git_repo)
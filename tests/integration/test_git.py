@@ -1,6 +1,26 @@
+import os
+import subprocess
 import tempfile
 
-from branchctx.utils.git import git_current_branch, git_init
+import pytest
+
+from branchctx.utils import git, git_native
+from branchctx.utils.git import (
+    clear_abbrevs,
+    get_object_service,
+    git_abbrev_length,
+    git_add,
+    git_commit,
+    git_config,
+    git_current_branch,
+    git_hooks_path,
+    git_init,
+    git_list_branches,
+    git_log_authors,
+    git_log_range,
+    git_root,
+    git_walk_range,
+)
 
 
 def test_git_current_branch_empty_repo():
@@ -21,3 +41,166 @@ def test_git_current_branch_not_git_repo():
     with tempfile.TemporaryDirectory() as tmpdir:
         branch = git_current_branch(tmpdir)
         assert branch is None
+
+
+@pytest.fixture
+def git_repo():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        git_init(tmpdir, "main")
+        git_config(tmpdir, "user.email", "test@test.com")
+        git_config(tmpdir, "user.name", "Test")
+        with open(os.path.join(tmpdir, "README.md"), "w") as f:
+            f.write("# Test")
+        git_add(tmpdir)
+        git_commit(tmpdir, "init")
+        yield os.path.realpath(tmpdir)
+
+
+def _git(path: str, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=path, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def test_git_root_from_subdir(git_repo):
+    subdir = os.path.join(git_repo, "a", "b")
+    os.makedirs(subdir)
+    assert git_root(subdir) == _git(subdir, "rev-parse", "--show-toplevel")
+    assert git_native.toplevel(subdir) == git_repo
+
+
+def test_git_root_not_git_repo():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        assert git_root(tmpdir) is None
+
+
+def test_git_current_branch_detached(git_repo):
+    sha = _git(git_repo, "rev-parse", "HEAD")
+    _git(git_repo, "checkout", "--detach", sha)
+    assert git_native.current_branch(git_repo) == "HEAD"
+    assert git_current_branch(git_repo) == "HEAD"
+
+
+def test_git_list_branches_loose_and_packed(git_repo):
+    for name in ("feature/a", "feature/b/c", "zeta", "alpha"):
+        _git(git_repo, "branch", name)
+    _git(git_repo, "pack-refs", "--all")
+    _git(git_repo, "branch", "feature/loose")
+    _git(git_repo, "branch", "-D", "zeta")
+
+    expected = _git(git_repo, "branch", "--format=%(refname:short)").splitlines()
+    assert git_native.local_branches(git_repo) == expected
+    assert git_list_branches(git_repo) == expected
+
+
+def test_git_list_branches_ambiguous_with_tag_falls_back(git_repo):
+    _git(git_repo, "branch", "dup")
+    _git(git_repo, "tag", "dup")
+
+    with pytest.raises(git_native.UnsupportedLayout):
+        git_native.local_branches(git_repo)
+    assert git_list_branches(git_repo) == _git(git_repo, "branch", "--format=%(refname:short)").splitlines()
+
+
+def test_git_linked_worktree(git_repo):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        worktree = os.path.join(os.path.realpath(tmpdir), "wt")
+        _git(git_repo, "worktree", "add", "-b", "wt-branch", worktree)
+
+        assert git_native.toplevel(worktree) == worktree
+        assert git_native.current_branch(worktree) == "wt-branch"
+        assert "wt-branch" in git_native.local_branches(worktree)
+
+
+def test_git_hooks_path_native(git_repo):
+    with open(os.path.join(git_repo, ".git", "config"), "a") as f:
+        f.write('[core]\n\thooksPath = "my hooks" ; comment\n[remote "Origin"]\n\turl = x\n')
+
+    assert git_native.config_value("core.hooksPath", path=git_repo) == "my hooks"
+    assert git_hooks_path(git_repo) == _git(git_repo, "config", "--get", "core.hooksPath")
+    assert git_native.config_value("remote.Origin.url", path=git_repo) == "x"
+    assert git_native.config_value("remote.origin.url", path=git_repo) is None
+
+
+def test_git_config_include_falls_back(git_repo):
+    with open(os.path.join(git_repo, ".git", "config"), "a") as f:
+        f.write("[include]\n\tpath = extra\n")
+    with open(os.path.join(git_repo, ".git", "extra"), "w") as f:
+        f.write("[core]\n\thooksPath = included\n")
+
+    with pytest.raises(git_native.UnsupportedLayout):
+        git_native.config_value("core.hooksPath", path=git_repo)
+    assert git_hooks_path(git_repo) == "included"
+
+
+def test_git_system_config_location(git_repo, monkeypatch, tmp_path):
+    system = tmp_path / "gitconfig"
+    system.write_text("[core]\n\thooksPath = system-hooks\n")
+    monkeypatch.setattr(git_native, "_system_config", [])
+
+    monkeypatch.setenv("GIT_CONFIG_SYSTEM", str(system))
+    assert git_native.config_value("core.hooksPath", path=git_repo) == "system-hooks"
+
+    monkeypatch.setenv("GIT_CONFIG_NOSYSTEM", "1")
+    assert git_native.config_value("core.hooksPath", path=git_repo) is None
+
+    monkeypatch.delenv("GIT_CONFIG_NOSYSTEM")
+    monkeypatch.delenv("GIT_CONFIG_SYSTEM")
+    discovered = git_native._discover_system_config()
+    assert discovered and os.path.isabs(discovered)
+    assert git_native._system_config_paths() == [discovered]
+
+
+def test_git_log_range_matches_git_log(git_repo):
+    _git(git_repo, "checkout", "-b", "feature")
+    for i in range(3):
+        _git(git_repo, "commit", "--allow-empty", "-m", f"feature {i}")
+    _git(git_repo, "checkout", "main")
+    _git(git_repo, "commit", "--allow-empty", "-m", "main work")
+    _git(git_repo, "checkout", "feature")
+    _git(git_repo, "merge", "--no-ff", "-m", "merge main", "main")
+    _git(git_repo, "commit", "--allow-empty", "-m", "subject line\ncontinued\n\nbody")
+
+    commits = git_log_range(git_repo, "main")
+    expected = _git(git_repo, "log", "main..HEAD", "--format=%H|%s|%aI").splitlines()
+
+    assert [f"{c.sha}|{c.subject}|{c.author_date}" for c in commits] == expected
+
+
+def test_git_walk_range_gives_up_on_distant_base(git_repo, monkeypatch):
+    _git(git_repo, "checkout", "-b", "feature")
+    _git(git_repo, "commit", "--allow-empty", "-m", "feature work")
+    _git(git_repo, "checkout", "main")
+    for i in range(10):
+        _git(git_repo, "commit", "--allow-empty", "-m", f"main {i}")
+    _git(git_repo, "checkout", "feature")
+    monkeypatch.setattr(git, "_WALK_UNINTERESTING_LIMIT", 3)
+
+    base = _git(git_repo, "rev-parse", "main")
+    head = _git(git_repo, "rev-parse", "HEAD")
+
+    assert git_walk_range(git_repo, base, head) is None
+    assert git_log_range(git_repo, "main") is None
+    assert git_log_authors(git_repo, "main") == ["Test"]
+
+
+def test_git_log_range_unknown_base(git_repo):
+    assert git_log_range(git_repo, "origin/missing") == []
+
+
+def test_object_service_abbreviate(git_repo):
+    sha = _git(git_repo, "rev-parse", "HEAD")
+    service = get_object_service(git_repo)
+
+    assert service.abbreviate(sha, git_abbrev_length(git_repo)) == _git(git_repo, "rev-parse", "--short", "HEAD")
+    assert service.read_commit(sha).subject == "init"
+
+
+def test_object_service_abbreviate_cache_keyed_by_length(git_repo):
+    sha = _git(git_repo, "rev-parse", "HEAD")
+    service = get_object_service(git_repo)
+
+    assert service.abbreviate(sha, 7) == sha[:7]
+    assert service.abbreviate(sha, 12) == sha[:12]
+
+    service._abbrevs[(sha, 7)] = "stale"
+    clear_abbrevs()
+    assert service.abbreviate(sha, 7) == sha[:7]
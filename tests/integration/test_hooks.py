@@ -4,7 +4,7 @@ from unittest.mock import patch
 
 import pytest
 
-from branchctx.constants import GIT_DIR, HOOK_MARKER, HOOK_POST_CHECKOUT, HOOK_POST_COMMIT
+from branchctx.constants import GIT_DIR, HOOK_MARKER, HOOK_POST_CHECKOUT, HOOK_POST_COMMIT, HOOK_POST_REWRITE
 from branchctx.core.hooks import (
     _reset_confirmation_state,
     get_hook_path,
@@ -108,6 +108,22 @@ class TestPostCheckoutHook:
         assert HOOK_MARKER not in content
 
 
+class TestPostRewriteHook:
+    def test_install_hook(self, git_repo):
+        result = install_hook(git_repo, HOOK_POST_REWRITE)
+        assert result == "installed"
+
+        with open(get_hook_path(git_repo, HOOK_POST_REWRITE)) as f:
+            content = f.read()
+        assert HOOK_MARKER in content
+        assert 'on-rewrite "$1"' in content
+
+    def test_uninstall_hook(self, git_repo):
+        install_hook(git_repo, HOOK_POST_REWRITE)
+        assert uninstall_hook(git_repo, HOOK_POST_REWRITE) == "uninstalled"
+        assert not is_hook_installed(git_repo, HOOK_POST_REWRITE)
+
+
 class TestPostCommitHook:
     def test_install_hook(self, git_repo):
         result = install_hook(git_repo, HOOK_POST_COMMIT)
@@ -1,21 +1,44 @@
+import json
 import os
+import subprocess
 import tempfile
+import threading
+from unittest.mock import patch
 
 import pytest
 
+from branchctx.constants import (
+    ARCHIVED_DIR,
+    META_DB_FILE,
+    META_FILE,
+    META_OVERFLOW_DIR,
+    META_SHARDS_DIR,
+    META_STORAGE_JSON,
+    META_STORAGE_SQLITE,
+)
 from branchctx.core.sync import sanitize_branch_name, sync_branch
+from branchctx.data.commit_cache import CommitCache, get_commit_cache, get_commit_cache_path
 from branchctx.data.config import Config, get_branches_dir, get_template_dir
 from branchctx.data.meta import (
-    _get_changed_files,
+    _collect_commits,
+    _collect_commits_from_log,
+    advance_branch_meta,
     archive_branch_meta,
     create_branch_meta,
     delete_branch_meta,
     get_branch_meta,
+    get_meta_store,
+    get_path_index,
+    iter_branch_files,
     load_archived_meta,
     load_branch_meta,
+    meta_lock,
+    render_changed_files,
+    render_commits,
     update_branch_meta,
 )
-from branchctx.utils.git import git_add, git_checkout, git_commit, git_config, git_init
+from branchctx.data.meta_store import SQLITE_SCHEMA_VERSION, DocumentCache, OverflowStore, SqliteMetaStore
+from branchctx.utils.git import CommitInfo, DiffEntry, git_add, git_checkout, git_commit, git_config, git_init
 
 
 @pytest.fixture
@@ -90,8 +113,11 @@ def test_update_branch_meta(git_repo):
     meta = get_branch_meta(git_repo, branch_key)
     assert meta["last_commit"] is not None
     assert meta["last_commit"]["message"] == "feat: add new file"
-    assert "feat: add new file" in meta["commits"]
-    assert "new_file.py" in meta["changed_files"]
+    assert [c["subject"] for c in meta["commits"]] == ["feat: add new file"]
+    assert "changed_files" not in meta
+    assert "new_file.py" in [f["path"] for f in meta["files"]]
+    assert render_commits(git_repo, branch_key, meta).endswith(" feat: add new file")
+    assert "A  new_file.py" in render_changed_files(git_repo, branch_key, meta)
 
 
 def test_archive_branch_meta(git_repo):
@@ -118,6 +144,233 @@ def test_delete_branch_meta(git_repo):
     assert get_branch_meta(git_repo, branch_key) is None
 
 
+def _shard_path(git_repo, branch_key, archived=False):
+    root = get_branches_dir(git_repo)
+    if archived:
+        root = os.path.join(root, ARCHIVED_DIR)
+    return os.path.join(root, META_SHARDS_DIR, f"{branch_key}.json")
+
+
+def test_meta_is_sharded_per_branch(git_repo):
+    create_branch_meta(git_repo, "feature-a", "feature/a")
+    create_branch_meta(git_repo, "feature-b", "feature/b")
+
+    assert os.path.exists(_shard_path(git_repo, "feature-a"))
+    assert os.path.exists(_shard_path(git_repo, "feature-b"))
+    assert not os.path.exists(os.path.join(get_branches_dir(git_repo), META_FILE))
+
+    other_before = os.stat(_shard_path(git_repo, "feature-b")).st_mtime_ns
+    update_branch_meta(git_repo, "feature-a", "main")
+    assert os.stat(_shard_path(git_repo, "feature-b")).st_mtime_ns == other_before
+
+    archive_branch_meta(git_repo, "feature-a")
+    assert not os.path.exists(_shard_path(git_repo, "feature-a"))
+    assert os.path.exists(_shard_path(git_repo, "feature-a", archived=True))
+
+
+def test_legacy_meta_json_is_migrated(git_repo):
+    branches_dir = get_branches_dir(git_repo)
+    legacy = {"feature-old": {"branch": "feature/old", "commits": "abc1234 old"}}
+    with open(os.path.join(branches_dir, META_FILE), "w") as f:
+        json.dump(legacy, f)
+    os.makedirs(os.path.join(branches_dir, ARCHIVED_DIR))
+    with open(os.path.join(branches_dir, ARCHIVED_DIR, META_FILE), "w") as f:
+        json.dump({"feature-gone": {"branch": "feature/gone"}}, f)
+
+    assert get_branch_meta(git_repo, "feature-old") == legacy["feature-old"]
+    assert not os.path.exists(os.path.join(branches_dir, META_FILE))
+    assert os.path.exists(_shard_path(git_repo, "feature-old"))
+
+    assert load_archived_meta(git_repo) == {"feature-gone": {"branch": "feature/gone"}}
+    assert not os.path.exists(os.path.join(branches_dir, ARCHIVED_DIR, META_FILE))
+
+
+def test_legacy_text_meta_still_renders(git_repo):
+    legacy = {"branch": "feature/old", "commits": "abc1234 old commit", "changed_files": "M  a.py  (+1 -0)"}
+
+    assert render_commits(git_repo, "feature-old", legacy) == "abc1234 old commit"
+    assert render_changed_files(git_repo, "feature-old", legacy) == "M  a.py  (+1 -0)"
+
+
+def test_json_meta_storage(git_repo):
+    create_branch_meta(git_repo, "feature-a", "feature/a")
+
+    Config(meta_storage=META_STORAGE_JSON).save(git_repo)
+    create_branch_meta(git_repo, "feature-b", "feature/b")
+
+    with open(os.path.join(get_branches_dir(git_repo), META_FILE)) as f:
+        data = json.load(f)
+    assert set(data) == {"feature-a", "feature-b"}
+    assert not os.path.exists(os.path.join(get_branches_dir(git_repo), META_SHARDS_DIR))
+
+
+def test_json_meta_storage_reads_one_record_through_index(git_repo):
+    Config(meta_storage=META_STORAGE_JSON).save(git_repo)
+    for n in range(5):
+        create_branch_meta(git_repo, f"feature-{n}", f"feature/{n}")
+
+    meta_path = os.path.join(get_branches_dir(git_repo), META_FILE)
+    parsed = []
+    json_load = json.load
+
+    def tracking_load(f, *args, **kwargs):
+        parsed.append(f.name)
+        return json_load(f, *args, **kwargs)
+
+    with patch("branchctx.data.meta_store._documents", DocumentCache()), patch("json.load", tracking_load):
+        assert get_branch_meta(git_repo, "feature-3")["branch"] == "feature/3"
+        assert get_branch_meta(git_repo, "feature-9") is None
+        assert meta_path not in parsed
+
+    with open(meta_path) as f:
+        data = json_load(f)
+    data["feature-3"]["author"] = "someone-else"
+    with open(meta_path, "w") as f:
+        json.dump(data, f)
+
+    with patch("branchctx.data.meta_store._documents", DocumentCache()):
+        assert get_branch_meta(git_repo, "feature-3")["author"] == "someone-else"
+
+
+def test_sqlite_meta_storage(git_repo):
+    create_branch_meta(git_repo, "feature-a", "feature/a")
+    Config(meta_storage=META_STORAGE_SQLITE).save(git_repo)
+
+    git_checkout(git_repo, "feature/b", create=True)
+    create_branch_meta(git_repo, "feature-b", "feature/b")
+    with open(os.path.join(git_repo, "b.py"), "w") as f:
+        f.write("b = 1\n")
+    git_add(git_repo, "b.py")
+    git_commit(git_repo, "feat: add b")
+    update_branch_meta(git_repo, "feature-b", "main")
+
+    branches_dir = get_branches_dir(git_repo)
+    assert os.path.exists(os.path.join(branches_dir, META_DB_FILE))
+    assert not os.path.exists(os.path.join(branches_dir, META_SHARDS_DIR))
+
+    meta = get_branch_meta(git_repo, "feature-b")
+    assert [c["subject"] for c in meta["commits"]] == ["feat: add b"]
+    assert meta["files"] == [{"status": "A", "path": "b.py", "old_path": "", "added": "1", "removed": "0"}]
+    assert "changed_files" not in meta
+    assert set(load_branch_meta(git_repo)) == {"feature-a", "feature-b"}
+
+    assert get_meta_store(git_repo).select(newest_first=True)[0] == "feature-b"
+
+    archive_branch_meta(git_repo, "feature-b")
+    assert get_branch_meta(git_repo, "feature-b") is None
+    assert load_archived_meta(git_repo)["feature-b"]["files"] == meta["files"]
+
+
+def test_sqlite_meta_storage_concurrent_writers(git_repo):
+    Config(meta_storage=META_STORAGE_SQLITE).save(git_repo)
+    get_meta_store(git_repo)
+
+    def writer(n):
+        store = get_meta_store(git_repo)
+        for i in range(20):
+            store.put(f"branch-{n}-{i}", {"branch": f"branch/{n}/{i}", "commits": "abc1234 x", "updated_at": str(i)})
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(load_branch_meta(git_repo)) == 80
+
+
+def test_sqlite_connection_reused_and_schema_created_once(git_repo):
+    root = get_branches_dir(git_repo)
+    store = SqliteMetaStore(root)
+    store.put("feature-a", {"branch": "feature/a", "commits": []})
+    conn = store._connect()
+    assert SqliteMetaStore(root)._connect() is conn
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == SQLITE_SCHEMA_VERSION
+
+    conn.execute("DROP INDEX branches_author")
+    store.close()
+    reopened = SqliteMetaStore(root)._connect()
+    assert reopened is not conn
+    assert reopened.execute("SELECT name FROM sqlite_master WHERE name = 'branches_author'").fetchone() is None
+
+    reopened.execute("PRAGMA user_version = 0")
+    store.close()
+    upgraded = SqliteMetaStore(root)._connect()
+    assert upgraded.execute("SELECT name FROM sqlite_master WHERE name = 'branches_author'").fetchone() is not None
+    assert SqliteMetaStore(root).get("feature-a")["branch"] == "feature/a"
+    store.close()
+
+
+def test_meta_lock_is_reentrant(git_repo):
+    with meta_lock(git_repo):
+        with meta_lock(git_repo):
+            create_branch_meta(git_repo, "feature-a", "feature/a")
+        archive_branch_meta(git_repo, "feature-a")
+
+    assert "feature-a" in load_archived_meta(git_repo)
+
+
+def test_corrupt_meta_is_set_aside(git_repo):
+    create_branch_meta(git_repo, "feature-a", "feature/a")
+    shard = _shard_path(git_repo, "feature-a")
+    with open(shard, "w") as f:
+        f.write('{"branch": "feature/a", "comm')
+
+    assert get_branch_meta(git_repo, "feature-a") is None
+    assert os.path.exists(f"{shard}.corrupt")
+
+    create_branch_meta(git_repo, "feature-a", "feature/a")
+    assert get_branch_meta(git_repo, "feature-a")["branch"] == "feature/a"
+
+
+def test_meta_documents_are_cached_until_changed(git_repo):
+    create_branch_meta(git_repo, "feature-a", "feature/a")
+    assert get_branch_meta(git_repo, "feature-a")["branch"] == "feature/a"
+    shard = _shard_path(git_repo, "feature-a")
+    parsed = []
+    json_load = json.load
+
+    def tracking_load(f, *args, **kwargs):
+        parsed.append(f.name)
+        return json_load(f, *args, **kwargs)
+
+    with patch("json.load", tracking_load):
+        get_branch_meta(git_repo, "feature-a")["branch"] = "mutated"
+        assert get_branch_meta(git_repo, "feature-a")["branch"] == "feature/a"
+        assert shard not in parsed
+
+        update_branch_meta(git_repo, "feature-a", "feature/a")
+        assert get_branch_meta(git_repo, "feature-a")["branch"] == "feature/a"
+        assert shard not in parsed
+
+        with open(shard) as f:
+            record = json_load(f)
+        record["author"] = "someone-else"
+        with open(shard, "w") as f:
+            json.dump(record, f)
+
+        assert get_branch_meta(git_repo, "feature-a")["author"] == "someone-else"
+        assert parsed.count(shard) == 1
+
+
+def test_meta_store_resolved_once_until_config_changes(git_repo):
+    create_branch_meta(git_repo, "feature-a", "feature/a")
+    get_meta_store(git_repo)
+
+    with patch("branchctx.data.meta.Config.load", wraps=Config.load) as load:
+        with patch("branchctx.data.meta.open_meta_store") as open_store:
+            store = get_meta_store(git_repo)
+            update_branch_meta(git_repo, "feature-a", "main")
+            assert get_meta_store(git_repo) is store
+        load.assert_not_called()
+        open_store.assert_not_called()
+
+        Config(meta_storage=META_STORAGE_JSON).save(git_repo)
+        assert get_branch_meta(git_repo, "feature-a")["branch"] == "feature/a"
+        assert load.call_count == 1
+    assert os.path.exists(os.path.join(get_branches_dir(git_repo), META_FILE))
+
+
 def test_load_branch_meta_empty(git_repo):
     meta = load_branch_meta(git_repo)
     assert meta == {}
@@ -135,6 +388,12 @@ def test_multiple_branches_in_meta(git_repo):
     assert "feature-b" in meta
 
 
+def _changed_files(workspace: str) -> str:
+    create_branch_meta(workspace, "feature", "feature")
+    update_branch_meta(workspace, "feature", "main")
+    return render_changed_files(workspace, "feature", get_branch_meta(workspace, "feature"))
+
+
 def test_get_changed_files_alignment(git_repo):
     git_checkout(git_repo, "feature/test", create=True)
 
@@ -146,7 +405,7 @@ def test_get_changed_files_alignment(git_repo):
     git_add(git_repo)
     git_commit(git_repo, "add files")
 
-    result = _get_changed_files(git_repo, "main")
+    result = _changed_files(git_repo)
     lines = result.strip().split("\n")
 
     paren_positions = [line.index("(") for line in lines]
@@ -168,7 +427,7 @@ def test_get_changed_files_pure_rename(git_repo):
     git_add(git_repo)
     git_commit(git_repo, "rename file")
 
-    result = _get_changed_files(git_repo, "main")
+    result = _changed_files(git_repo)
 
     assert "R  renamed.py  <-  original.py" in result
 
@@ -190,7 +449,7 @@ def test_get_changed_files_modified_rename_shows_delete_and_add(git_repo):
     git_add(git_repo)
     git_commit(git_repo, "rename and modify")
 
-    result = _get_changed_files(git_repo, "main")
+    result = _changed_files(git_repo)
 
     assert "D  original.py" in result
     assert "A  renamed.py" in result
@@ -214,8 +473,328 @@ def test_get_changed_files_rename_alignment(git_repo):
     git_add(git_repo)
     git_commit(git_repo, "rename")
 
-    result = _get_changed_files(git_repo, "main")
+    result = _changed_files(git_repo)
     lines = result.strip().split("\n")
 
     paren_positions = [line.index("(") for line in lines]
     assert len(set(paren_positions)) == 1
+
+
+def test_get_changed_files_quotes_special_paths(git_repo):
+    git_checkout(git_repo, "feature/quoted", create=True)
+
+    with open(os.path.join(git_repo, "café.py"), "w") as f:
+        f.write("x = 1\ny = 2\n")
+    with open(os.path.join(git_repo, "with space.py"), "w") as f:
+        f.write("z = 3\n")
+
+    git_add(git_repo)
+    git_commit(git_repo, "add special paths")
+
+    lines = [" ".join(line.split()) for line in _changed_files(git_repo).split("\n")]
+
+    assert 'A "caf\\303\\251.py" (+2 -0)' in lines
+    assert "A with space.py (+1 -0)" in lines
+
+    git_config(git_repo, "core.quotePath", "false")
+    assert "A  café.py" in _changed_files(git_repo)
+
+
+def test_collect_commits_matches_log_fallback(git_repo):
+    git_checkout(git_repo, "feature/collect", create=True)
+
+    for i in range(3):
+        with open(os.path.join(git_repo, f"file{i}.py"), "w") as f:
+            f.write(f"x = {i}")
+        git_add(git_repo)
+        git_commit(git_repo, f"feat: commit {i}")
+
+    assert _collect_commits(git_repo, "main") == _collect_commits_from_log(git_repo, "main")
+
+    commits, last_commit = _collect_commits(git_repo, "main")
+    assert [c["subject"] for c in commits] == ["feat: commit 2", "feat: commit 1", "feat: commit 0"]
+    assert len(commits[0]["sha"]) == 40
+    assert last_commit["message"] == "feat: commit 2"
+
+
+def _commit_file(git_repo, filename, content, message):
+    with open(os.path.join(git_repo, filename), "w") as f:
+        f.write(content)
+    git_add(git_repo, filename)
+    git_commit(git_repo, message)
+
+
+def _snapshot(meta):
+    return {key: meta[key] for key in ("commits", "files", "head", "merge_base", "last_commit")}
+
+
+def test_advance_branch_meta_matches_full_update(git_repo):
+    git_checkout(git_repo, "feature/incremental", create=True)
+    branch_key = sanitize_branch_name("feature/incremental")
+    create_branch_meta(git_repo, branch_key, "feature/incremental")
+
+    _commit_file(git_repo, "a.py", "x = 1\n", "feat: add a")
+    update_branch_meta(git_repo, branch_key, "main")
+    head = get_branch_meta(git_repo, branch_key)["head"]
+
+    _commit_file(git_repo, "a.py", "x = 1\ny = 2\n", "feat: extend a")
+    with patch("branchctx.data.meta._compute_branch_state") as compute:
+        advance_branch_meta(git_repo, branch_key, "main")
+        assert not compute.called
+
+    subprocess.run(["git", "mv", "a.py", "b.py"], cwd=git_repo, check=True)
+    git_commit(git_repo, "refactor: rename a")
+    with patch("branchctx.data.meta._compute_branch_state") as compute:
+        advance_branch_meta(git_repo, branch_key, "main")
+        assert not compute.called
+
+    meta = get_branch_meta(git_repo, branch_key)
+    assert meta["head"] != head
+    assert meta["commits"][0]["subject"] == "refactor: rename a"
+
+    incremental = _snapshot(meta)
+    update_branch_meta(git_repo, branch_key, "main")
+    assert incremental == _snapshot(get_branch_meta(git_repo, branch_key))
+
+
+def test_advance_branch_meta_recomputes_after_rewrite(git_repo):
+    git_checkout(git_repo, "feature/amend", create=True)
+    branch_key = sanitize_branch_name("feature/amend")
+    create_branch_meta(git_repo, branch_key, "feature/amend")
+
+    _commit_file(git_repo, "a.py", "x = 1\n", "feat: add a")
+    update_branch_meta(git_repo, branch_key, "main")
+
+    with open(os.path.join(git_repo, "a.py"), "w") as f:
+        f.write("x = 2\n")
+    git_add(git_repo, "a.py")
+    subprocess.run(["git", "commit", "--amend", "-m", "feat: add a (amended)"], cwd=git_repo, check=True)
+
+    advance_branch_meta(git_repo, branch_key, "main")
+
+    meta = get_branch_meta(git_repo, branch_key)
+    assert [c["subject"] for c in meta["commits"]] == ["feat: add a (amended)"]
+
+
+def test_advance_branch_meta_recomputes_when_base_moves(git_repo):
+    git_checkout(git_repo, "feature/base-moved", create=True)
+    branch_key = sanitize_branch_name("feature/base-moved")
+    create_branch_meta(git_repo, branch_key, "feature/base-moved")
+
+    _commit_file(git_repo, "a.py", "x = 1\n", "feat: add a")
+    update_branch_meta(git_repo, branch_key, "main")
+
+    git_checkout(git_repo, "main")
+    _commit_file(git_repo, "main.py", "m = 1\n", "chore: main moves")
+    git_checkout(git_repo, "feature/base-moved")
+    subprocess.run(["git", "merge", "-q", "--no-edit", "main"], cwd=git_repo, check=True)
+
+    advance_branch_meta(git_repo, branch_key, "main")
+
+    meta = get_branch_meta(git_repo, branch_key)
+    assert "main.py" not in render_changed_files(git_repo, branch_key, meta)
+    assert meta["merge_base"] == meta["base_head"]
+
+
+def test_meta_spills_long_lists_to_overflow(git_repo):
+    Config(meta_inline_commits=2, meta_inline_files=2).save(git_repo)
+    git_checkout(git_repo, "feature/long", create=True)
+    branch_key = sanitize_branch_name("feature/long")
+    create_branch_meta(git_repo, branch_key, "feature/long")
+
+    for i in range(4):
+        _commit_file(git_repo, f"f{i}.py", f"x = {i}\n", f"feat: add f{i}")
+    update_branch_meta(git_repo, branch_key, "main")
+
+    meta = get_branch_meta(git_repo, branch_key)
+    assert [c["subject"] for c in meta["commits"]] == ["feat: add f3", "feat: add f2"]
+    assert meta["commits_total"] == 4
+    assert len(meta["files"]) == 2
+    assert meta["files_total"] == 4
+    assert len(render_commits(git_repo, branch_key, meta).split("\n")) == 4
+    assert len(render_changed_files(git_repo, branch_key, meta).split("\n")) == 4
+
+    overflow = os.path.join(get_branches_dir(git_repo), META_OVERFLOW_DIR, f"{branch_key}.jsonl")
+    with open(overflow, "rb") as f:
+        spilled = f.read()
+    inode = os.stat(overflow).st_ino
+
+    with patch("branchctx.data.meta._compute_branch_state") as compute:
+        _commit_file(git_repo, "f4.py", "x = 4\n", "feat: add f4")
+        advance_branch_meta(git_repo, branch_key, "main")
+        _commit_file(git_repo, "f1.py", "x = 1\ny = 1\n", "fix: grow f1")
+        advance_branch_meta(git_repo, branch_key, "main")
+        assert not compute.called
+
+    assert os.stat(overflow).st_ino == inode
+    with open(overflow, "rb") as f:
+        assert f.read().startswith(spilled)
+
+    meta = get_branch_meta(git_repo, branch_key)
+    assert meta["commits_total"] == 6
+    assert [f["path"] for f in iter_branch_files(git_repo, branch_key, meta)] == [f"f{i}.py" for i in range(5)]
+    advanced_commits = render_commits(git_repo, branch_key, meta)
+    advanced_files = render_changed_files(git_repo, branch_key, meta)
+    assert advanced_commits.split("\n")[0].endswith("fix: grow f1")
+
+    update_branch_meta(git_repo, branch_key, "main")
+    meta = get_branch_meta(git_repo, branch_key)
+    assert render_commits(git_repo, branch_key, meta) == advanced_commits
+    assert render_changed_files(git_repo, branch_key, meta) == advanced_files
+
+    Config().save(git_repo)
+    update_branch_meta(git_repo, branch_key, "main")
+    meta = get_branch_meta(git_repo, branch_key)
+    assert "commits_total" not in meta
+    assert len(meta["commits"]) == 6
+    assert not os.path.exists(overflow)
+
+
+def test_advance_computes_skipped_files_on_demand(git_repo):
+    Config(meta_inline_commits=2, meta_inline_files=2).save(git_repo)
+    git_checkout(git_repo, "feature/skip", create=True)
+    branch_key = sanitize_branch_name("feature/skip")
+    create_branch_meta(git_repo, branch_key, "feature/skip")
+
+    for i in range(3):
+        _commit_file(git_repo, f"f{i}.py", f"x = {i}\n", f"feat: add f{i}")
+    update_branch_meta(git_repo, branch_key, "main", with_files=False)
+    meta = get_branch_meta(git_repo, branch_key)
+    assert meta["files"] is None
+    assert meta["commits_total"] == 3
+    assert get_path_index(git_repo).stale() == [branch_key]
+
+    with patch("branchctx.data.meta._compute_branch_state") as compute:
+        _commit_file(git_repo, "f3.py", "x = 3\n", "feat: add f3")
+        advance_branch_meta(git_repo, branch_key, "main", with_files=False)
+        assert get_branch_meta(git_repo, branch_key)["files"] is None
+        _commit_file(git_repo, "f4.py", "x = 4\n", "feat: add f4")
+        advance_branch_meta(git_repo, branch_key, "main")
+        assert not compute.called
+
+    meta = get_branch_meta(git_repo, branch_key)
+    assert meta["commits_total"] == 5
+    assert [f["path"] for f in iter_branch_files(git_repo, branch_key, meta)] == [f"f{i}.py" for i in range(5)]
+    assert get_path_index(git_repo).stale() == []
+    advanced_files = render_changed_files(git_repo, branch_key, meta)
+
+    update_branch_meta(git_repo, branch_key, "main")
+    assert render_changed_files(git_repo, branch_key, get_branch_meta(git_repo, branch_key)) == advanced_files
+
+
+def test_overflow_appends_merge_on_read(git_repo):
+    overflow = OverflowStore(get_branches_dir(git_repo))
+
+    def entry(path, added):
+        return {"status": "A", "path": path, "old_path": "", "added": added, "removed": "0"}
+
+    overflow.write("feature", [{"sha": "b"}, {"sha": "a"}], [entry("b.py", "1"), entry("d.py", "1")])
+    overflow.append("feature", [{"sha": "c"}], [entry("d.py", "2"), entry("a.py", "1")], ["b.py"])
+
+    assert [c["sha"] for c in overflow.stream("feature", "commit")] == ["c", "b", "a"]
+    assert list(overflow.stream("feature", "file")) == [entry("a.py", "1"), entry("d.py", "2")]
+
+
+def test_archive_moves_overflow(git_repo):
+    Config(meta_inline_commits=1).save(git_repo)
+    git_checkout(git_repo, "feature/spilled", create=True)
+    branch_key = sanitize_branch_name("feature/spilled")
+    create_branch_meta(git_repo, branch_key, "feature/spilled")
+    _commit_file(git_repo, "a.py", "a = 1\n", "feat: a")
+    _commit_file(git_repo, "b.py", "b = 1\n", "feat: b")
+    update_branch_meta(git_repo, branch_key, "main")
+
+    archive_branch_meta(git_repo, branch_key)
+
+    branches_dir = get_branches_dir(git_repo)
+    assert not os.path.exists(os.path.join(branches_dir, META_OVERFLOW_DIR, f"{branch_key}.jsonl"))
+    assert os.path.exists(os.path.join(branches_dir, ARCHIVED_DIR, META_OVERFLOW_DIR, f"{branch_key}.jsonl"))
+
+
+def test_update_branch_meta_fills_commit_cache(git_repo):
+    git_checkout(git_repo, "feature/cache", create=True)
+    branch_key = sanitize_branch_name("feature/cache")
+    create_branch_meta(git_repo, branch_key, "feature/cache")
+
+    _commit_file(git_repo, "a.py", "x = 1\n", "feat: add a")
+    update_branch_meta(git_repo, branch_key, "main")
+    head = get_branch_meta(git_repo, branch_key)["head"]
+
+    cache = CommitCache(git_repo)
+    commit = cache.get(head)
+    assert commit is not None
+    assert commit.subject == "feat: add a"
+    assert commit.author == "Test User"
+
+    _commit_file(git_repo, "a.py", "x = 2\n", "feat: change a")
+    advance_branch_meta(git_repo, branch_key, "main")
+    new_head = get_branch_meta(git_repo, branch_key)["head"]
+
+    files = CommitCache(git_repo).get_files(new_head)
+    assert [(f.status, f.path, f.added, f.removed) for f in files] == [("M", "a.py", "1", "1")]
+
+
+def _cache_commit(cache, sha):
+    cache.put(CommitInfo(sha, [], 0, "Test User", "2024-01-01T00:00:00+00:00", sha[:1]))
+
+
+def test_commit_cache_evicts_least_recently_used(git_repo):
+    cache = CommitCache(git_repo, max_entries=4)
+    for sha in ("a" * 40, "b" * 40, "c" * 40, "d" * 40):
+        _cache_commit(cache, sha)
+    cache.save()
+
+    cache = CommitCache(git_repo, max_entries=4)
+    cache.get("a" * 40)
+    _cache_commit(cache, "e" * 40)
+    cache.save()
+
+    reloaded = CommitCache(git_repo)
+    assert [sha[0] for sha in "abcde" if reloaded.get(sha * 40)] == ["a", "e"]
+
+
+def test_commit_cache_appends_new_entries(git_repo):
+    cache = CommitCache(git_repo)
+    _cache_commit(cache, "a" * 40)
+    cache.save()
+    _cache_commit(cache, "b" * 40)
+    cache.save()
+    cache.save()
+
+    with open(get_commit_cache_path(git_repo)) as f:
+        assert [json.loads(line)[0] for line in f] == ["a" * 40, "b" * 40]
+
+
+def test_commit_cache_caps_file_size(git_repo):
+    cache = CommitCache(git_repo, max_bytes=4096)
+    _cache_commit(cache, "a" * 40)
+    _cache_commit(cache, "b" * 40)
+    cache.put_files("b" * 40, [DiffEntry("A", f"file{i}.py", None, "1", "0") for i in range(200)])
+    cache.save()
+
+    assert os.path.getsize(get_commit_cache_path(git_repo)) <= 2048
+    reloaded = CommitCache(git_repo)
+    assert reloaded.get("a" * 40) is not None
+    assert reloaded.get("b" * 40) is None
+
+
+def test_commit_cache_skips_base_side_commits(git_repo):
+    git_checkout(git_repo, "feature/base-side", create=True)
+    branch_key = sanitize_branch_name("feature/base-side")
+    create_branch_meta(git_repo, branch_key, "feature/base-side")
+    _commit_file(git_repo, "a.py", "x = 1\n", "feat: add a")
+
+    git_checkout(git_repo, "main")
+    _commit_file(git_repo, "b.py", "y = 1\n", "main: add b")
+    base_side = subprocess.run(
+        ["git", "rev-parse", "HEAD"], cwd=git_repo, capture_output=True, text=True, check=True
+    ).stdout.strip()
+    _commit_file(git_repo, "b.py", "y = 2\n", "main: change b")
+    git_checkout(git_repo, "feature/base-side")
+
+    update_branch_meta(git_repo, branch_key, "main")
+    get_commit_cache(git_repo).save()
+
+    cache = CommitCache(git_repo)
+    assert cache.get(get_branch_meta(git_repo, branch_key)["head"]) is not None
+    assert cache.get(base_side) is None
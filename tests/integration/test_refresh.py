@@ -0,0 +1,124 @@
+import json
+import os
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+from branchctx.commands.on_checkout import cmd_on_checkout
+from branchctx.commands.on_commit import cmd_on_commit
+from branchctx.constants import DEFAULT_SYMLINK
+from branchctx.core.refresh import (
+    get_refresh_lock_path,
+    get_refresh_pending_path,
+    run_refresh_worker,
+    schedule_refresh,
+)
+from branchctx.core.sync import sanitize_branch_name, sync_branch
+from branchctx.data.config import get_branches_dir, get_config_dir, get_template_dir
+from branchctx.data.meta import get_branch_meta
+from branchctx.utils.git import git_add, git_checkout, git_commit, git_config, git_init
+from branchctx.utils.lock import FileLock, is_locking_supported
+
+pytestmark = pytest.mark.skipif(not is_locking_supported(), reason="fcntl not available")
+
+
+@pytest.fixture
+def git_repo():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        git_init(tmpdir, "main")
+        git_config(tmpdir, "user.email", "test@test.com")
+        git_config(tmpdir, "user.name", "Test User")
+
+        with open(os.path.join(tmpdir, "README.md"), "w") as f:
+            f.write("# Test")
+
+        git_add(tmpdir)
+        git_commit(tmpdir, "init")
+
+        template_dir = get_template_dir(tmpdir)
+        os.makedirs(template_dir)
+        os.makedirs(get_branches_dir(tmpdir))
+
+        config_data = {
+            "default_base_branch": "main",
+            "sound": False,
+            "background_refresh": True,
+            "template_rules": [],
+        }
+        with open(os.path.join(get_config_dir(tmpdir), "config.json"), "w") as f:
+            json.dump(config_data, f)
+
+        with open(os.path.join(template_dir, "context.md"), "w") as f:
+            f.write("# Context\n<bctx:commits></bctx:commits>")
+
+        original_cwd = os.getcwd()
+        os.chdir(tmpdir)
+        yield tmpdir
+        os.chdir(original_cwd)
+
+
+def _commit(git_repo, filename, message):
+    with open(os.path.join(git_repo, filename), "w") as f:
+        f.write(message)
+    git_add(git_repo, filename)
+    git_commit(git_repo, message)
+
+
+@patch("branchctx.core.refresh._spawn_worker")
+def test_on_checkout_swaps_symlink_and_defers_refresh(spawn, git_repo):
+    sync_branch(git_repo, "main")
+    git_checkout(git_repo, "feature/deferred", create=True)
+    _commit(git_repo, "a.py", "feat: before checkout hook")
+
+    assert cmd_on_checkout(["main", "feature/deferred"]) == 0
+
+    assert os.readlink(os.path.join(git_repo, DEFAULT_SYMLINK)).endswith("feature-deferred")
+    assert spawn.call_count == 1
+    assert os.path.exists(get_refresh_pending_path(git_repo))
+    assert get_branch_meta(git_repo, sanitize_branch_name("feature/deferred"))["commits"] == []
+
+    assert run_refresh_worker(git_repo) == 1
+
+    meta = get_branch_meta(git_repo, sanitize_branch_name("feature/deferred"))
+    assert "feat: before checkout hook" in [c["subject"] for c in meta["commits"]]
+    assert not os.path.exists(get_refresh_pending_path(git_repo))
+
+    with open(os.path.join(git_repo, DEFAULT_SYMLINK, "context.md")) as f:
+        assert "feat: before checkout hook" in f.read()
+
+
+@patch("branchctx.core.refresh._spawn_worker")
+def test_on_commit_coalesces_while_worker_holds_lock(spawn, git_repo):
+    sync_branch(git_repo, "main")
+    git_checkout(git_repo, "feature/coalesce", create=True)
+    sync_branch(git_repo, "feature/coalesce")
+
+    lock = FileLock(get_refresh_lock_path(git_repo))
+    assert lock.acquire(blocking=False)
+    try:
+        for i in range(3):
+            _commit(git_repo, f"file{i}.py", f"feat: commit {i}")
+            assert cmd_on_commit([]) == 0
+        assert run_refresh_worker(git_repo) == 0
+    finally:
+        lock.release()
+
+    assert spawn.call_count == 0
+    assert run_refresh_worker(git_repo) == 1
+
+    commits = get_branch_meta(git_repo, sanitize_branch_name("feature/coalesce"))["commits"]
+    assert [c["subject"] for c in commits] == [
+        "feat: commit 2",
+        "feat: commit 1",
+        "feat: commit 0",
+    ]
+
+
+def test_schedule_refresh_spawns_worker_when_idle(git_repo):
+    with patch("branchctx.core.refresh._spawn_worker") as spawn:
+        assert schedule_refresh(git_repo)
+        assert schedule_refresh(git_repo)
+
+    assert spawn.call_count == 2
+    assert os.path.exists(get_refresh_pending_path(git_repo))